@@ -0,0 +1,190 @@
+"""Store benchmark results as a baseline, and compare later results against it."""
+
+from __future__ import annotations
+
+import os
+import platform
+from typing import TYPE_CHECKING
+
+import msgspec
+import numpy as np
+from rich.table import Table
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .suite import BenchmarkResult
+
+DEFAULT_THRESHOLD = 0.2
+"""Default fraction by which median time may increase before it's a regression."""
+
+
+class Fingerprint(msgspec.Struct, kw_only=True, frozen=True):
+    """Machine and environment that results were measured on."""
+
+    machine: str
+    processor: str
+    cpu_count: int | None
+    system: str
+    python: str
+    numpy: str
+
+    @classmethod
+    def current(cls) -> Fingerprint:
+        """Return fingerprint of this machine and environment."""
+        return cls(
+            machine=platform.machine(),
+            processor=platform.processor(),
+            cpu_count=os.cpu_count(),
+            system=platform.platform(),
+            python=platform.python_version(),
+            numpy=np.__version__,
+        )
+
+
+class CorpusParameters(msgspec.Struct, kw_only=True, frozen=True):
+    """Scale of corpus that results were measured against."""
+
+    missions: int
+    markers_per_layer: int
+    layer_depth: int
+    towns: int
+    dem_size_px: int
+
+
+class BaselineEntry(msgspec.Struct, kw_only=True, frozen=True):
+    """Summary of a benchmark's times, in s."""
+
+    median: float
+    iqr: float
+    runs: int
+
+
+class Baseline(msgspec.Struct, kw_only=True, frozen=True):
+    """Benchmark results to compare later runs against."""
+
+    fingerprint: Fingerprint
+    corpus: CorpusParameters
+    repeat: int
+    results: dict[str, BaselineEntry]
+    """By benchmark name."""
+
+    @classmethod
+    def from_results(
+        cls, results: list[BenchmarkResult], *, corpus: CorpusParameters, repeat: int
+    ) -> Baseline:
+        """Construct from results measured on this machine."""
+        return cls(
+            fingerprint=Fingerprint.current(),
+            corpus=corpus,
+            repeat=repeat,
+            results={
+                r.name: BaselineEntry(median=r.median, iqr=r.iqr, runs=len(r.seconds))
+                for r in results
+            },
+        )
+
+    @classmethod
+    def load(cls, filepath: Path) -> Baseline:
+        """
+        Load from JSON file.
+
+        Raises:
+            ValueError: if file isn't a valid baseline.
+
+        """
+        try:
+            return msgspec.json.decode(filepath.read_bytes(), type=cls)
+        except msgspec.DecodeError as err:
+            err_msg = f"Error decoding baseline `{filepath}`: {err}"
+            raise ValueError(err_msg) from err
+
+    def save(self, filepath: Path) -> None:
+        """Save as indented JSON file."""
+        filepath.write_bytes(msgspec.json.format(msgspec.json.encode(self), indent=4))
+
+
+class Comparison(msgspec.Struct, kw_only=True, frozen=True):
+    """Result of a benchmark compared with its baseline."""
+
+    name: str
+    baseline: BaselineEntry
+    median: float
+    threshold: float
+
+    @property
+    def change(self) -> float:
+        """Fractional change of median time; positive is slower."""
+        return self.median / self.baseline.median - 1
+
+    @property
+    def is_regression(self) -> bool:
+        """
+        Check if median time increased by more than `threshold`.
+
+        The increase must also exceed the baseline's interquartile range, i.e. be
+        beyond noise.
+        """
+        return (
+            self.change > self.threshold
+            and self.median - self.baseline.median > self.baseline.iqr
+        )
+
+
+def compare(
+    baseline: Baseline, results: list[BenchmarkResult], *, threshold: float
+) -> list[Comparison]:
+    """Compare `results` of benchmarks in `baseline` with it."""
+    return [
+        Comparison(
+            name=r.name,
+            baseline=baseline.results[r.name],
+            median=r.median,
+            threshold=threshold,
+        )
+        for r in results
+        if r.name in baseline.results
+    ]
+
+
+def comparison_table(comparisons: list[Comparison], *, title: str) -> Table:
+    """Return comparisons as table, in ms, with regressions highlighted."""
+    table = Table(title=title)
+    for column in (
+        "benchmark",
+        "baseline (ms)",
+        "baseline IQR (ms)",
+        "now (ms)",
+        "change",
+        "status",
+    ):
+        table.add_column(column, justify="left" if column == "benchmark" else "right")
+
+    for c in comparisons:
+        if c.is_regression:
+            status = "[bold red]REGRESSION[/]"
+        elif c.change < -c.threshold:
+            status = "[green]faster[/]"
+        else:
+            status = "ok"
+
+        table.add_row(
+            c.name,
+            f"{1000 * c.baseline.median:.2f}",
+            f"{1000 * c.baseline.iqr:.2f}",
+            f"{1000 * c.median:.2f}",
+            f"{c.change:+.1%}",
+            status,
+        )
+
+    return table
+
+
+def fingerprint_differences(baseline: Baseline) -> dict[str, tuple[object, object]]:
+    """Return fingerprint fields that differ from this machine's, as `(then, now)`."""
+    current = Fingerprint.current()
+    return {
+        field: (getattr(baseline.fingerprint, field), getattr(current, field))
+        for field in Fingerprint.__struct_fields__
+        if getattr(baseline.fingerprint, field) != getattr(current, field)
+    }
@@ -0,0 +1,286 @@
+"""
+Generate a synthetic AU mission corpus, with matching grad_meh data.
+
+Missions are written as `<root>/au/A3A/addons/maps/Antistasi_SynthN.synthN/`, laid
+out as in AU source, so `Mission.from_data()` can read them; grad_meh data as
+`<root>/grad_meh/synthN/`.
+
+Usage: `python -m benchmarks.corpus ROOT [--missions N] [--markers N] [--depth N]
+[--towns N] [--dem-size N] [--map-index-names]`
+
+With `--map-index-names`, missions are named after maps in `MAP_INDEX`, so
+`scripts.analyse_missions` can be run against the corpus (set `AU_SOURCE_DIR_RELATIVE`
+and `GRAD_MEH_DATA_DIR_RELATIVE` in `scripts/config.toml` to the corpus folders).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from attrs import define
+from rich.console import Console
+
+from modules.mission.mission_sqm_parser import RELEVANT_MARKER_PREFIXES
+from static_data.map_index import MAP_INDEX
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    import numpy.typing as npt
+
+WORLD_SIZE = 10240
+"""Map width and height, in m."""
+_MARKER_PREFIXES = [*sorted(RELEVANT_MARKER_PREFIXES), "control"]
+"""Military zone marker name prefixes, then an irrelevant one."""
+_TOWN_FILENAME_STEMS = ("namecitycapital", "namecity", "namevillage")
+
+
+@define(kw_only=True, frozen=True)
+class Corpus:
+    """Paths and map index of a generated corpus."""
+
+    au_maps_dir: Path
+    """Equivalent of `AU_MAPS_DIRPATH`."""
+    grad_meh_dir: Path
+    """Equivalent of `GRAD_MEH_DIRPATH`."""
+    map_index: dict[str, dict[str, str]]
+    """Equivalent of `MAP_INDEX`."""
+
+    @property
+    def mission_dirs(self) -> list[Path]:
+        """Mission directories, in name order."""
+        return sorted(p for p in self.au_maps_dir.iterdir() if p.is_dir())
+
+
+def generate_corpus(  # noqa: PLR0913
+    root: Path,
+    *,
+    missions: int = 10,
+    markers_per_layer: int = 20,
+    layer_depth: int = 3,
+    towns: int = 50,
+    dem_size_px: int = 512,
+    seed: int = 0,
+    map_names: Sequence[str] | None = None,
+) -> Corpus:
+    """
+    Generate corpus in `root`.
+
+    Arguments:
+        root: Directory to write to; created if it doesn't exist.
+        missions: Number of missions.
+        markers_per_layer: Number of markers at top level of each `mission.sqm`,
+            and in each nested layer. Markers are military zones of each type in turn,
+            then an irrelevant (`control_`) marker.
+        layer_depth: Depth of nested layers in each `mission.sqm`.
+        towns: Number of towns in each `mapInfo.hpp` population array, and in
+            matching grad_meh locations.
+        dem_size_px: Width and height of each DEM.
+        seed: Random seed; the same arguments and seed give identical files.
+        map_names: Names of missions' maps, at least `missions` of them. If `None`,
+            `synth0`, `synth1`, ...
+
+    """
+    rng = np.random.default_rng(seed)
+    corpus = Corpus(
+        au_maps_dir=root / "au/A3A/addons/maps",
+        grad_meh_dir=root / "grad_meh",
+        map_index={},
+    )
+    if map_names is None:
+        map_names = [f"synth{i}" for i in range(missions)]
+
+    for i, map_name in enumerate(map_names[:missions]):
+        mission_dir = corpus.au_maps_dir / f"Antistasi_{map_name.title()}.{map_name}"
+        mission_dir.mkdir(parents=True, exist_ok=True)
+        town_names = [f"Town {i}-{j}" for j in range(towns)]
+        town_positions = rng.uniform(0, WORLD_SIZE, size=(towns, 2))
+        (mission_dir / "mapInfo.hpp").write_text(
+            _map_info_hpp(map_name, town_names, rng), encoding="utf-8"
+        )
+        (mission_dir / "mission.sqm").write_text(
+            _mission_sqm(
+                markers_per_layer=markers_per_layer, layer_depth=layer_depth, rng=rng
+            ),
+            encoding="utf-8",
+        )
+
+        gm_dir = corpus.grad_meh_dir / map_name
+        _write_locations(gm_dir / "geojson/locations", town_names, town_positions)
+        _write_dem(gm_dir / "dem.asc.gz", dem_size_px=dem_size_px, rng=rng)
+        corpus.map_index[map_name] = {
+            "display_name": f"Synthetic {i}",
+            "url": f"https://example.com/{map_name}",
+        }
+
+    return corpus
+
+
+def _map_info_hpp(
+    map_name: str, town_names: list[str], rng: np.random.Generator
+) -> str:
+    populations = ",".join(
+        f'{{"{name}",{population}}}'
+        for name, population in zip(
+            town_names, rng.integers(10, 1000, len(town_names)).tolist(), strict=True
+        )
+    )
+    return (
+        '#include "..\\BuildObjectsList.hpp"\n'
+        f"class {map_name} {{\n"
+        f"\tpopulation[] = {{\n\t\t{populations}\n\t}};\n"
+        "\tdisabledTowns[] = {};\n"
+        '\tclimate = "temperate";\n'
+        "};\n"
+    )
+
+
+def _mission_sqm(
+    *, markers_per_layer: int, layer_depth: int, rng: np.random.Generator
+) -> str:
+    entities = _entities(
+        markers_per_layer=markers_per_layer,
+        layer_depth=layer_depth,
+        rng=rng,
+        indent=1,
+        next_id=iter(range(1, 2**31)),
+    )
+    return (
+        "version=54;\n"
+        "class EditorData\n{\n\tmoveGridStep=1;\n};\n"
+        "binarizationWanted=0;\n"
+        'addons[]=\n{\n\t"A3_Modules_F"\n};\n'
+        "class Mission\n{\n"
+        '\tclass Intel\n\t{\n\t\tbriefingName="Synthetic";\n\t};\n'
+        f"{entities}"
+        "};\n"
+    )
+
+
+def _entities(
+    *,
+    markers_per_layer: int,
+    layer_depth: int,
+    rng: np.random.Generator,
+    indent: int,
+    next_id: Iterator[int],
+) -> str:
+    """Return `class Entities` of markers, and a nested layer if `layer_depth`."""
+    tabs = "\t" * indent
+    items = []
+    for j, (x, z, y) in enumerate(
+        rng.uniform(0, WORLD_SIZE, size=(markers_per_layer, 3)).tolist()
+    ):
+        id_ = next(next_id)
+        prefix = _MARKER_PREFIXES[j % len(_MARKER_PREFIXES)]
+        items.append(
+            f'{tabs}\t\tdataType="Marker";\n'
+            f"{tabs}\t\tposition[]={{{x:.3f},{z / 100:.3f},{y:.3f}}};\n"
+            f'{tabs}\t\tname="{prefix}_{id_}";\n'
+            f'{tabs}\t\ttype="Empty";\n'
+            f"{tabs}\t\tid={id_};\n"
+        )
+
+    if layer_depth:
+        nested = _entities(
+            markers_per_layer=markers_per_layer,
+            layer_depth=layer_depth - 1,
+            rng=rng,
+            indent=indent + 2,
+            next_id=next_id,
+        )
+        items.append(
+            f'{tabs}\t\tdataType="Layer";\n'
+            f'{tabs}\t\tname="Layer {layer_depth}";\n'
+            f"{nested}"
+            f"{tabs}\t\tid={next(next_id)};\n"
+        )
+
+    body = "".join(
+        f"{tabs}\tclass Item{k}\n{tabs}\t{{\n{item}{tabs}\t}};\n"
+        for k, item in enumerate(items)
+    )
+    return (
+        f"{tabs}class Entities\n{tabs}{{\n"
+        f"{tabs}\titems={len(items)};\n"
+        f"{body}"
+        f"{tabs}}};\n"
+    )
+
+
+def _write_locations(
+    dir_: Path, town_names: list[str], town_positions: npt.NDArray[np.float64]
+) -> None:
+    """Write towns as grad_meh GeoJSON `Point` features, split over town files."""
+    dir_.mkdir(parents=True, exist_ok=True)
+    for k, stem in enumerate(_TOWN_FILENAME_STEMS):
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [x, y]},
+                "properties": {"name": name},
+            }
+            for name, (x, y) in list(
+                zip(town_names, town_positions.tolist(), strict=True)
+            )[k :: len(_TOWN_FILENAME_STEMS)]
+        ]
+        with gzip.open(dir_ / f"{stem}.geojson.gz", "wt", encoding="utf-8") as fp:
+            json.dump(features, fp)
+
+
+def _write_dem(filepath: Path, *, dem_size_px: int, rng: np.random.Generator) -> None:
+    """Write an island-shaped DEM as gzipped ESRI ASCII grid."""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    coords = np.linspace(-1, 1, dem_size_px)
+    radius = np.hypot(*np.meshgrid(coords, coords))
+    noise = rng.uniform(-0.1, 0.1, size=radius.shape)
+    elevation = np.round(300 * (0.7 - radius + noise))
+    header = (
+        f"ncols {dem_size_px}\n"
+        f"nrows {dem_size_px}\n"
+        "xllcorner 0\n"
+        "yllcorner 0\n"
+        f"cellsize {WORLD_SIZE / dem_size_px:g}\n"
+        "NODATA_value -9999\n"
+    )
+    with gzip.open(filepath, "wt", encoding="utf-8") as fp:
+        fp.write(header)
+        np.savetxt(fp, elevation, fmt="%g")
+
+
+def main() -> None:
+    """Generate corpus from command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--missions", type=int, default=10)
+    parser.add_argument("--markers", type=int, default=20, help="per layer")
+    parser.add_argument("--depth", type=int, default=3, help="nested layer depth")
+    parser.add_argument("--towns", type=int, default=50)
+    parser.add_argument("--dem-size", type=int, default=512, help="in px")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--map-index-names",
+        action="store_true",
+        help="name missions after maps in the map index",
+    )
+    args = parser.parse_args()
+    corpus = generate_corpus(
+        args.root,
+        missions=args.missions,
+        markers_per_layer=args.markers,
+        layer_depth=args.depth,
+        towns=args.towns,
+        dem_size_px=args.dem_size,
+        seed=args.seed,
+        map_names=list(MAP_INDEX) if args.map_index_names else None,
+    )
+    Console().print(f"Generated {len(corpus.map_index)} missions in {args.root}.")
+
+
+if __name__ == "__main__":
+    main()
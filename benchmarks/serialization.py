@@ -0,0 +1,113 @@
+"""
+Benchmark `Mission` serialization: msgspec vs. the generic `json`/`cattrs` path.
+
+Usage: `python -m benchmarks.serialization [--markers N] [--repeat N]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import TYPE_CHECKING
+
+import msgspec
+from cattrs import Converter
+from rich.console import Console
+from rich.table import Table
+
+from modules.mission.marker import Marker
+from modules.mission.marker_table import MARKER_CATEGORIES, MarkerTable
+from modules.mission.mission import Mission
+from modules.mission.position_2d import Position2D
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_CONVERTER = Converter()
+"""Generic path: `Mission` isn't all attrs classes, so needs `MarkerTable` hooks."""
+_CONVERTER.register_unstructure_hook(MarkerTable, msgspec.to_builtins)
+_CONVERTER.register_structure_hook(MarkerTable, msgspec.convert)
+
+
+def synthetic_mission(*, markers_per_series: int, towns: int) -> Mission:
+    """Return a mission with `markers_per_series` markers of each type."""
+    markers = {
+        category: [
+            Marker(
+                name=f"{category}_{i}",
+                position=Position2D(x=i * 12.345, y=20480 - i * 6.789),
+            )
+            for i in range(markers_per_series)
+        ]
+        for category in MARKER_CATEGORIES
+    }
+    return Mission(
+        map_name="synthetic",
+        map_display_name="Synthetic",
+        map_url="https://example.com/synthetic",
+        climate="temperate",
+        towns={f"town_{i}": 100 + i for i in range(towns)},
+        disabled_towns=[f"disabled_{i}" for i in range(10)],
+        markers=MarkerTable.from_markers(markers),
+    )
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    """Return best time per call, in ms."""
+    return 1000 * min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Run benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--markers", type=int, default=500, help="per marker type")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    mission = synthetic_mission(markers_per_series=args.markers, towns=args.markers)
+    legacy_json = json.dumps(
+        _CONVERTER.unstructure(mission), ensure_ascii=False, indent=4
+    )
+    msgspec_json = mission.to_json()
+    msgpack = mission.to_msgpack()
+    results = {
+        "json + cattrs": (
+            _time(
+                lambda: json.dumps(
+                    _CONVERTER.unstructure(mission), ensure_ascii=False, indent=4
+                ),
+                args.repeat,
+            ),
+            _time(
+                lambda: _CONVERTER.structure(json.loads(legacy_json), Mission),
+                args.repeat,
+            ),
+            len(legacy_json.encode()),
+        ),
+        "msgspec JSON": (
+            _time(mission.to_json, args.repeat),
+            _time(lambda: Mission.from_json_bytes(msgspec_json), args.repeat),
+            len(msgspec_json),
+        ),
+        "msgspec MessagePack": (
+            _time(mission.to_msgpack, args.repeat),
+            _time(lambda: Mission.from_msgpack(msgpack), args.repeat),
+            len(msgpack),
+        ),
+    }
+
+    table = Table(title=f"Mission with {6 * args.markers} markers")
+    for column in ("path", "encode (ms)", "decode (ms)", "size (KiB)"):
+        table.add_column(column, justify="left" if column == "path" else "right")
+
+    for path, (encode_ms, decode_ms, size) in results.items():
+        table.add_row(
+            path, f"{encode_ms:.3f}", f"{decode_ms:.3f}", f"{size / 1024:.1f}"
+        )
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
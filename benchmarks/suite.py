@@ -0,0 +1,345 @@
+"""
+Benchmark mission analysis stages against a synthetic corpus.
+
+The corpus is generated in a temporary directory; see `benchmarks.corpus`. The
+`build_docs` benchmark needs `scripts/config.toml` to exist (see README), as scripts
+load it on import; its paths aren't used.
+
+Usage: `python -m benchmarks.suite [-k NAME ...] [--repeat N] [--missions N]
+[--markers N] [--depth N] [--towns N] [--dem-size N] [--save-baseline [PATH]]
+[--compare [PATH] [--threshold FRACTION]]`
+
+`--save-baseline` stores results, with a fingerprint of this machine, as a baseline
+(by default `benchmarks/baseline.json`). `--compare` reruns the baseline's
+benchmarks at its corpus scale and repeat count, and exits with status 1 if any
+median time has increased by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from attrs import define
+from rich.console import Console
+from rich.table import Table
+
+from modules.dem_cache import load_dem_derivatives
+from modules.diagnostics import Diagnostics
+from modules.map_render import Renderer, export_map_render
+from modules.mission.mapinfo_hpp_parser import MapInfoHppData
+from modules.mission.mission import Mission
+from modules.mission.mission_sqm_parser import MissionSqmData
+from modules.mission.store import MissionStore
+
+from .baseline import (
+    DEFAULT_THRESHOLD,
+    Baseline,
+    CorpusParameters,
+    compare,
+    comparison_table,
+    fingerprint_differences,
+)
+from .corpus import Corpus, generate_corpus
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    Setup = Callable[[Corpus, Path], Callable[[], object]]
+    """Prepare a benchmark in a work directory; return the function to time."""
+
+BASELINE_FILEPATH = Path(__file__).parent / "baseline.json"
+
+
+@define(kw_only=True, frozen=True)
+class BenchmarkResult:
+    """Times of repeated runs of a benchmark."""
+
+    name: str
+    seconds: list[float]
+
+    @property
+    def median(self) -> float:
+        """Median time, in s."""
+        return statistics.median(self.seconds)
+
+    @property
+    def iqr(self) -> float:
+        """Interquartile range of times, in s; 0 if fewer than 2 runs."""
+        if len(self.seconds) < 2:  # noqa: PLR2004
+            return 0
+
+        quartiles = statistics.quantiles(self.seconds, n=4)
+        return quartiles[2] - quartiles[0]
+
+
+def _missions(corpus: Corpus) -> list[Mission]:
+    missions = [
+        Mission.from_data(mission_dir=mission_dir, map_index=corpus.map_index)
+        for mission_dir in corpus.mission_dirs
+    ]
+    return [m for m in missions if m]
+
+
+def _setup_mission_sqm_parse(corpus: Corpus, _: Path) -> Callable[[], object]:
+    return lambda: [
+        MissionSqmData.from_file(d / "mission.sqm") for d in corpus.mission_dirs
+    ]
+
+
+def _setup_map_info_parse(corpus: Corpus, _: Path) -> Callable[[], object]:
+    return lambda: [
+        MapInfoHppData.from_file(d / "mapInfo.hpp") for d in corpus.mission_dirs
+    ]
+
+
+def _setup_mission_from_data(corpus: Corpus, _: Path) -> Callable[[], object]:
+    return lambda: _missions(corpus)
+
+
+def _setup_validate_towns(corpus: Corpus, _: Path) -> Callable[[], object]:
+    missions = _missions(corpus)
+
+    def validate_towns() -> None:
+        for mission in missions:
+            mission.validate_and_correct_towns(
+                corpus.grad_meh_dir / mission.map_name / "geojson/locations",
+                diagnostics=Diagnostics(log=False),
+            )
+
+    return validate_towns
+
+
+def _setup_dem_load(corpus: Corpus, _: Path) -> Callable[[], object]:
+    """Decode first mission's DEM, uncached."""
+    dem_filepath = corpus.grad_meh_dir / _missions(corpus)[0].map_name / "dem.asc.gz"
+    return lambda: load_dem_derivatives(dem_filepath)
+
+
+def _setup_render(
+    corpus: Corpus, work_dir: Path, renderer: Renderer = Renderer.MATPLOTLIB
+) -> Callable[[], object]:
+    """Render first mission, with its DEM already cached."""
+    mission = _missions(corpus)[0]
+
+    def render() -> None:
+        export_map_render(
+            mission=mission,
+            grad_meh_dem_filepath=corpus.grad_meh_dir / mission.map_name / "dem.asc.gz",
+            export_filepath=work_dir / f"{mission.map_name}_map.png",
+            dem_cache_dir=work_dir / "dem",
+            renderer=renderer,
+        )
+
+    render()
+    return render
+
+
+def _setup_render_numpy(corpus: Corpus, work_dir: Path) -> Callable[[], object]:
+    """Render first mission with NumPy renderer, with its DEM already cached."""
+    return _setup_render(corpus, work_dir, renderer=Renderer.NUMPY)
+
+
+def _setup_build_docs(corpus: Corpus, work_dir: Path) -> Callable[[], object]:
+    # Imported here, as scripts need `scripts/config.toml`
+    from scripts.build_docs import build_docs  # noqa: PLC0415
+
+    data_dir, doc_dir = work_dir / "data", work_dir / "docs"
+    doc_dir.mkdir(parents=True)
+    MissionStore(data_dir).add(_missions(corpus))
+    return lambda: build_docs(data_dir=data_dir, doc_dir=doc_dir)
+
+
+BENCHMARKS: dict[str, Setup] = {
+    "mission_sqm_parse": _setup_mission_sqm_parse,
+    "map_info_parse": _setup_map_info_parse,
+    "mission_from_data": _setup_mission_from_data,
+    "validate_towns": _setup_validate_towns,
+    "dem_load": _setup_dem_load,
+    "render": _setup_render,
+    "render_numpy": _setup_render_numpy,
+    "build_docs": _setup_build_docs,
+}
+"""Benchmark setups, by name. Parsing benchmarks cover all corpus missions; DEM
+and render benchmarks the first."""
+
+
+def run_benchmarks(
+    corpus: Corpus, *, names: list[str], repeat: int
+) -> list[BenchmarkResult]:
+    """
+    Run benchmarks `names` against `corpus`.
+
+    Each is run once to warm up, then timed `repeat` times.
+    """
+    results = []
+    for name in names:
+        with tempfile.TemporaryDirectory() as work_dir:
+            func = BENCHMARKS[name](corpus, Path(work_dir))
+            func()
+            results.append(
+                BenchmarkResult(
+                    name=name, seconds=timeit.repeat(func, number=1, repeat=repeat)
+                )
+            )
+
+    return results
+
+
+def results_table(results: list[BenchmarkResult], *, title: str) -> Table:
+    """Return results as table, in ms."""
+    table = Table(title=title)
+    for column in ("benchmark", "median (ms)", "IQR (ms)", "min (ms)", "runs"):
+        table.add_column(column, justify="left" if column == "benchmark" else "right")
+
+    for result in results:
+        table.add_row(
+            result.name,
+            f"{1000 * result.median:.2f}",
+            f"{1000 * result.iqr:.2f}",
+            f"{1000 * min(result.seconds):.2f}",
+            str(len(result.seconds)),
+        )
+
+    return table
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    """Return parser of benchmark selection, corpus scale and baseline options."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-k",
+        dest="names",
+        action="append",
+        choices=BENCHMARKS,
+        help="benchmark to run; may be repeated (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--missions", type=int, default=10)
+    parser.add_argument("--markers", type=int, default=20, help="per layer")
+    parser.add_argument("--depth", type=int, default=3, help="nested layer depth")
+    parser.add_argument("--towns", type=int, default=50)
+    parser.add_argument("--dem-size", type=int, default=512, help="in px")
+    baseline_group = parser.add_mutually_exclusive_group()
+    baseline_group.add_argument(
+        "--save-baseline",
+        type=Path,
+        nargs="?",
+        const=BASELINE_FILEPATH,
+        help="save results as baseline file",
+    )
+    baseline_group.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=BASELINE_FILEPATH,
+        help="compare with baseline file, ignoring corpus scale and --repeat",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=(
+            "with --compare, fractional increase of median time that's a regression "
+            f"(default: {DEFAULT_THRESHOLD})"
+        ),
+    )
+    return parser
+
+
+def run_suite(
+    corpus_parameters: CorpusParameters, *, names: list[str], repeat: int
+) -> list[BenchmarkResult]:
+    """Generate corpus in a temporary directory and run benchmarks `names`."""
+    with tempfile.TemporaryDirectory() as root:
+        corpus = generate_corpus(
+            Path(root),
+            missions=corpus_parameters.missions,
+            markers_per_layer=corpus_parameters.markers_per_layer,
+            layer_depth=corpus_parameters.layer_depth,
+            towns=corpus_parameters.towns,
+            dem_size_px=corpus_parameters.dem_size_px,
+        )
+        return run_benchmarks(corpus, names=names, repeat=repeat)
+
+
+def main() -> None:
+    """Run benchmarks and print results, or comparison with baseline."""
+    args = argument_parser().parse_args()
+    logging.basicConfig(level="WARNING")
+    console = Console()
+    if args.compare:
+        _compare_with_baseline(
+            Baseline.load(args.compare),
+            names=args.names,
+            threshold=args.threshold,
+            console=console,
+        )
+        return
+
+    corpus_parameters = CorpusParameters(
+        missions=args.missions,
+        markers_per_layer=args.markers,
+        layer_depth=args.depth,
+        towns=args.towns,
+        dem_size_px=args.dem_size,
+    )
+    results = run_suite(
+        corpus_parameters, names=args.names or list(BENCHMARKS), repeat=args.repeat
+    )
+    console.print(results_table(results, title=_title(corpus_parameters)))
+    if args.save_baseline:
+        Baseline.from_results(
+            results, corpus=corpus_parameters, repeat=args.repeat
+        ).save(args.save_baseline)
+        console.print(f"Saved baseline to {args.save_baseline}.")
+
+
+def _compare_with_baseline(
+    baseline: Baseline, *, names: list[str] | None, threshold: float, console: Console
+) -> None:
+    """
+    Rerun baseline's benchmarks (or `names`) and print comparison.
+
+    Exits with status 1 if any has regressed.
+    """
+    for field, (then, now) in fingerprint_differences(baseline).items():
+        console.print(
+            f"[yellow]Warning: baseline {field} was {then!r}, now {now!r}; "
+            "times may not be comparable.[/]"
+        )
+
+    results = run_suite(
+        baseline.corpus,
+        names=names or [n for n in baseline.results if n in BENCHMARKS],
+        repeat=baseline.repeat,
+    )
+    comparisons = compare(baseline, results, threshold=threshold)
+    console.print(
+        comparison_table(comparisons, title=f"{_title(baseline.corpus)}, vs. baseline")
+    )
+    regressions = [c.name for c in comparisons if c.is_regression]
+    if regressions:
+        console.print(
+            f"[bold red]{len(regressions)} benchmark(s) regressed by more than "
+            f"{threshold:.0%}: {', '.join(regressions)}.[/]"
+        )
+        sys.exit(1)
+
+
+def _title(corpus_parameters: CorpusParameters) -> str:
+    return (
+        f"{corpus_parameters.missions} missions, "
+        f"{corpus_parameters.markers_per_layer} markers per layer, "
+        f"{corpus_parameters.dem_size_px} px DEM"
+    )
+
+
+if __name__ == "__main__":
+    main()
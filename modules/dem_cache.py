@@ -0,0 +1,275 @@
+"""
+Cache data derived from grad_meh DEMs (`dem.asc.gz`).
+
+Entries are keyed by content hash of the DEM file, so maps with identical terrain
+(e.g. season variants) share one entry, and by format version. Arrays are stored as
+`.npy` files and loaded memory-mapped, so only the parts used are read from disk.
+
+Content hashes are memoized in the cache directory by DEM path, and only recomputed
+if the DEM's modification time or size has changed.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+
+import msgspec
+import numpy as np
+import numpy.typing as npt
+from attrs import define
+
+from modules.esri_ascii_grid import EsriAsciiGridReader
+from modules.raster import block_mean, reduction_factor
+
+LOGGER = logging.getLogger(__name__)
+_LAND_FILENAME = "land.npy"
+_EXTENTS_FILENAME = "extents.npy"
+_ELEVATION_FILENAME = "elevation.npy"
+_BLOCK_ROWS = 256
+"""Approximate rows of DEM decoded at a time."""
+_HASHES_DIRNAME = "hashes"
+_FORMAT_VERSION = 2
+"""Version of entries' content; increment when derivation changes. 2: land excludes
+'no data' cells."""
+
+
+@define(kw_only=True, frozen=True, eq=False)
+class DemDerivatives:
+    """Data derived from a DEM."""
+
+    land: npt.NDArray[np.bool_]
+    """Full resolution land mask; row 0 is north."""
+    extents: tuple[float, float]
+    """`x, y` extents of the DEM, in metres."""
+    elevation: npt.NDArray[np.float32] | None = None
+    """Mean elevation, reduced to no more than `elevation_size_px` square."""
+
+
+class _ContentHash(msgspec.Struct, frozen=True):
+    """Memoized content hash of a DEM file, and its stat when hashed."""
+
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+def dem_content_hash(filepath: Path, *, cache_dir: Path | None = None) -> str:
+    """
+    Return content hash of a DEM file.
+
+    Arguments:
+        filepath: DEM file.
+        cache_dir: If given, the hash is memoized here, and only recomputed if the
+            file's modification time or size has changed.
+
+    """
+    stat = filepath.stat()
+    memo_filepath = (
+        None
+        if cache_dir is None
+        else cache_dir
+        / _HASHES_DIRNAME
+        / f"{hashlib.sha256(str(filepath.resolve()).encode()).hexdigest()}.json"
+    )
+    if memo_filepath is not None and memo_filepath.is_file():
+        try:
+            memo = msgspec.json.decode(memo_filepath.read_bytes(), type=_ContentHash)
+        except msgspec.DecodeError:
+            log_msg = f"Ignored invalid DEM hash memo `{memo_filepath}`."
+            LOGGER.warning(log_msg)
+        else:
+            if (memo.mtime_ns, memo.size) == (stat.st_mtime_ns, stat.st_size):
+                return memo.digest
+
+    with filepath.open("rb") as fp:
+        digest = hashlib.file_digest(fp, "sha256").hexdigest()
+
+    if memo_filepath is not None:
+        memo_filepath.parent.mkdir(parents=True, exist_ok=True)
+        # Written atomically, as render worker processes may hash concurrently
+        with tempfile.NamedTemporaryFile(
+            dir=memo_filepath.parent, suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_file.write(
+                msgspec.json.encode(
+                    _ContentHash(
+                        mtime_ns=stat.st_mtime_ns, size=stat.st_size, digest=digest
+                    )
+                )
+            )
+
+        Path(temp_file.name).replace(memo_filepath)
+
+    return digest
+
+
+def load_dem_derivatives(
+    dem_filepath: Path,
+    *,
+    cache_dir: Path | None = None,
+    elevation_size_px: int | None = None,
+) -> DemDerivatives:
+    """
+    Load data derived from a gzipped DEM (must be `*.asc.gz`).
+
+    The DEM is streamed in blocks of rows, so the full elevation grid is never held
+    in memory.
+
+    Arguments:
+        dem_filepath: DEM file.
+        cache_dir: If given, derivatives are loaded from a cache entry here if one
+            exists for the DEM's content, otherwise they're derived and an entry is
+            created.
+        elevation_size_px: If given, also derive elevation reduced to no more than
+            this size square.
+
+    Raises:
+        EsriAsciiGridError: if the DEM can't be read.
+
+    """
+    if cache_dir is None:
+        return _derive(dem_filepath, elevation_size_px=elevation_size_px)
+
+    digest = dem_content_hash(dem_filepath, cache_dir=cache_dir)
+    entry_dir = cache_dir / f"{digest}-v{_FORMAT_VERSION}"
+    with_elevation = elevation_size_px is not None
+    if _entry_is_complete(entry_dir, with_elevation=with_elevation):
+        log_msg = f"Loading DEM derivatives from cache `{entry_dir}`."
+        LOGGER.debug(log_msg)
+    else:
+        log_msg = f"Caching DEM derivatives in `{entry_dir}`."
+        LOGGER.debug(log_msg)
+        _create_entry(
+            dem_filepath, entry_dir=entry_dir, elevation_size_px=elevation_size_px
+        )
+        if not _entry_is_complete(entry_dir, with_elevation=with_elevation):
+            log_msg = (
+                f"Couldn't replace incomplete DEM cache entry `{entry_dir}`; "
+                "deriving without cache."
+            )
+            LOGGER.warning(log_msg)
+            return _derive(dem_filepath, elevation_size_px=elevation_size_px)
+
+    return _load_entry(entry_dir)
+
+
+def _derive(
+    dem_filepath: Path,
+    *,
+    elevation_size_px: int | None,
+    land_filepath: Path | None = None,
+) -> DemDerivatives:
+    """
+    Derive data from DEM, one block of rows at a time.
+
+    Land is where elevation is above 0 (and not 'no data'). Reduced elevation is the
+    mean of each block, with 'no data' cells as NaN.
+
+    Arguments:
+        dem_filepath: DEM file.
+        elevation_size_px: If given, also derive elevation reduced to no more than
+            this size square.
+        land_filepath: If given, land mask is written to this `.npy` file as it's
+            derived, rather than held in memory.
+
+    """
+    with gzip.open(dem_filepath, "rt") as fp:
+        grid = EsriAsciiGridReader(fp)
+        header = grid.header
+        land = (
+            np.empty(header.shape, dtype=np.bool_)
+            if land_filepath is None
+            else np.lib.format.open_memmap(
+                land_filepath, mode="w+", dtype=np.bool_, shape=header.shape
+            )
+        )
+        factor = (
+            1
+            if elevation_size_px is None
+            else reduction_factor(header.shape, elevation_size_px)
+        )
+        elevation_blocks = []
+        row = 0
+        # Blocks of whole reduction blocks, so each can be reduced independently
+        for block in grid.row_blocks(factor * max(1, _BLOCK_ROWS // factor)):
+            if header.nodata_value is not None:
+                block[block == header.nodata_value] = np.nan
+
+            land[row : row + len(block)] = block > 0
+            row += len(block)
+            if elevation_size_px is not None:
+                elevation_blocks.append(block_mean(block, factor))
+
+    if isinstance(land, np.memmap):
+        land.flush()
+
+    return DemDerivatives(
+        land=land,
+        extents=header.extents,
+        elevation=np.concatenate(elevation_blocks) if elevation_blocks else None,
+    )
+
+
+def _entry_is_complete(entry_dir: Path, *, with_elevation: bool) -> bool:
+    """Check if cache entry has all required files."""
+    filenames = [_LAND_FILENAME, _EXTENTS_FILENAME]
+    if with_elevation:
+        filenames.append(_ELEVATION_FILENAME)
+
+    return all((entry_dir / f).is_file() for f in filenames)
+
+
+def _create_entry(
+    dem_filepath: Path, *, entry_dir: Path, elevation_size_px: int | None
+) -> None:
+    """
+    Derive data from DEM and save as cache entry.
+
+    Written to a temporary directory and then moved into place, so concurrent
+    processes never see a partial entry. The entry may still be incomplete after,
+    e.g. if an incomplete entry couldn't be removed.
+    """
+    entry_dir.parent.mkdir(parents=True, exist_ok=True)
+    temp_dir = Path(tempfile.mkdtemp(dir=entry_dir.parent))
+    try:
+        derivatives = _derive(
+            dem_filepath,
+            elevation_size_px=elevation_size_px,
+            land_filepath=temp_dir / _LAND_FILENAME,
+        )
+        np.save(temp_dir / _EXTENTS_FILENAME, np.array(derivatives.extents))
+        if derivatives.elevation is not None:
+            np.save(temp_dir / _ELEVATION_FILENAME, derivatives.elevation)
+
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+    if entry_dir.is_dir():
+        shutil.rmtree(entry_dir, ignore_errors=True)  # incomplete entry
+
+    try:
+        temp_dir.rename(entry_dir)
+    except OSError:
+        # Another process created the entry first, or incomplete entry remains
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _load_entry(entry_dir: Path) -> DemDerivatives:
+    """Load cache entry; arrays are memory-mapped."""
+    x, y = np.load(entry_dir / _EXTENTS_FILENAME)
+    elevation_filepath = entry_dir / _ELEVATION_FILENAME
+    return DemDerivatives(
+        land=np.load(entry_dir / _LAND_FILENAME, mmap_mode="r"),
+        extents=(float(x), float(y)),
+        elevation=(
+            np.load(elevation_filepath, mmap_mode="r")
+            if elevation_filepath.is_file()
+            else None
+        ),
+    )
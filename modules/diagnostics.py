@@ -0,0 +1,115 @@
+"""Collect typed findings from validation checks, and export them as a report."""
+
+from __future__ import annotations
+
+import csv
+import logging
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+import msgspec
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Severity(StrEnum):
+    """Severity of a finding."""
+
+    DEBUG = "debug"
+    INFO = "info"
+    WARNING = "warning"
+    ERROR = "error"
+
+    @property
+    def level(self) -> int:
+        """Equivalent logging level."""
+        return logging.getLevelNamesMapping()[self.name]
+
+
+class Finding(msgspec.Struct, kw_only=True, frozen=True):
+    """Result of a check on a mission."""
+
+    map_name: str
+    check: str
+    """e.g. `military_zones`."""
+    severity: Severity
+    message: str
+    field: str | None = None
+    """Field checked, if any."""
+    expected: int | str | None = None
+    actual: int | str | None = None
+
+
+_FINDING_FIELDS = Finding.__struct_fields__
+
+
+class Diagnostics:
+    """In-memory table of findings, with optional logging as they're recorded."""
+
+    def __init__(self, *, log: bool = True) -> None:
+        """
+        Create empty collector.
+
+        Arguments:
+            log: Also log each finding as it's recorded.
+
+        """
+        self.findings: list[Finding] = []
+        self._log = log
+
+    def record(  # noqa: PLR0913
+        self,
+        *,
+        map_name: str,
+        check: str,
+        severity: Severity,
+        message: str,
+        field: str | None = None,
+        expected: int | str | None = None,
+        actual: int | str | None = None,
+    ) -> None:
+        """Record a finding."""
+        self.findings.append(
+            Finding(
+                map_name=map_name,
+                check=check,
+                severity=severity,
+                message=message,
+                field=field,
+                expected=expected,
+                actual=actual,
+            )
+        )
+        if self._log:
+            LOGGER.log(severity.level, message, stacklevel=2)
+
+    def extend(self, findings: Iterable[Finding]) -> None:
+        """Add findings recorded elsewhere, e.g. by a worker process; not logged."""
+        self.findings.extend(findings)
+
+    def count(self, severity: Severity) -> int:
+        """Count findings of `severity`."""
+        return sum(f.severity == severity for f in self.findings)
+
+    def export(self, filepath: Path) -> None:
+        """Export findings as `.csv`, or otherwise JSON."""
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        if filepath.suffix == ".csv":
+            with filepath.open("w", newline="", encoding="utf-8") as fp:
+                writer = csv.writer(fp)
+                writer.writerow(_FINDING_FIELDS)
+                writer.writerows(
+                    [getattr(f, name) for name in _FINDING_FIELDS]
+                    for f in self.findings
+                )
+        else:
+            filepath.write_bytes(
+                msgspec.json.format(msgspec.json.encode(self.findings), indent=4)
+            )
+
+        log_msg = f"Exported {len(self.findings)} findings to '{filepath}'."
+        LOGGER.info(log_msg)
@@ -0,0 +1,142 @@
+"""
+Stream an ESRI ASCII grid (e.g. grad_meh `dem.asc`), in blocks of rows.
+
+Only one block of rows is held in memory at a time, so peak memory is bounded by
+block size rather than by grid size.
+
+See: https://desktop.arcgis.com/en/arcmap/latest/manage-data/raster-and-images/esri-ascii-raster-format.htm
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING, TextIO
+
+import numpy as np
+import numpy.typing as npt
+from attrs import define
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_HEADER_KEYS = {
+    "ncols",
+    "nrows",
+    "xllcorner",
+    "xllcenter",
+    "yllcorner",
+    "yllcenter",
+    "cellsize",
+    "nodata_value",
+}
+_REQUIRED_HEADER_KEYS = {"ncols", "nrows", "cellsize"}
+
+
+class EsriAsciiGridError(ValueError):
+    """Content isn't a valid ESRI ASCII grid."""
+
+
+@define(kw_only=True, frozen=True)
+class EsriAsciiGridHeader:
+    """ESRI ASCII grid header."""
+
+    ncols: int
+    nrows: int
+    xll: float
+    """x of lower left corner (or centre of lower left cell, if `is_centre`)."""
+    yll: float
+    """y of lower left corner (or centre of lower left cell, if `is_centre`)."""
+    is_centre: bool
+    cellsize: float
+    nodata_value: float | None
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Grid shape, as `rows, cols`."""
+        return self.nrows, self.ncols
+
+    @property
+    def extents(self) -> tuple[float, float]:
+        """Grid `x, y` extents."""
+        return self.ncols * self.cellsize, self.nrows * self.cellsize
+
+
+class EsriAsciiGridReader:
+    """Read an ESRI ASCII grid from a text stream, in blocks of rows."""
+
+    def __init__(self, fp: TextIO) -> None:
+        """
+        Read header from `fp`.
+
+        Raises:
+            EsriAsciiGridError: if header is invalid.
+
+        """
+        self._lines: Iterator[str] = fp
+        self.header = self._read_header()
+
+    def row_blocks(self, block_rows: int) -> Iterator[npt.NDArray[np.float32]]:
+        """
+        Yield grid rows, north first, in blocks of `block_rows` rows.
+
+        The last block is smaller if `nrows` isn't a multiple of `block_rows`.
+
+        Raises:
+            EsriAsciiGridError: if a row has the wrong number of values, or there
+                are too few rows.
+
+        """
+        remaining = self.header.nrows
+        while remaining:
+            lines = list(itertools.islice(self._lines, min(block_rows, remaining)))
+            if not lines:
+                err_msg = f"Expected {remaining} more rows."
+                raise EsriAsciiGridError(err_msg)
+
+            try:
+                block = np.loadtxt(lines, dtype=np.float32, ndmin=2)
+            except ValueError as err:
+                raise EsriAsciiGridError(str(err)) from err
+
+            if block.shape != (len(lines), self.header.ncols):
+                err_msg = (
+                    f"Expected {self.header.ncols} values per row, "
+                    f"got block of shape {block.shape}."
+                )
+                raise EsriAsciiGridError(err_msg)
+
+            remaining -= len(lines)
+            yield block
+
+    def _read_header(self) -> EsriAsciiGridHeader:
+        """Consume header lines, leaving any first data line to be read."""
+        values: dict[str, str] = {}
+        for line in self._lines:
+            # Key and value may be separated by any whitespace, e.g. tabs
+            parts = line.split(None, 1)
+            if len(parts) != 2 or parts[0].lower() not in _HEADER_KEYS:  # noqa: PLR2004
+                self._lines = itertools.chain([line], self._lines)
+                break
+
+            key, value = parts
+            values[key.lower()] = value.strip()
+
+        missing_keys = _REQUIRED_HEADER_KEYS - values.keys()
+        if missing_keys:
+            err_msg = f"Header missing {sorted(missing_keys)}."
+            raise EsriAsciiGridError(err_msg)
+
+        try:
+            return EsriAsciiGridHeader(
+                ncols=int(values["ncols"]),
+                nrows=int(values["nrows"]),
+                xll=float(values.get("xllcorner", values.get("xllcenter", 0))),
+                yll=float(values.get("yllcorner", values.get("yllcenter", 0))),
+                is_centre="xllcenter" in values,
+                cellsize=float(values["cellsize"]),
+                nodata_value=(
+                    float(values["nodata_value"]) if "nodata_value" in values else None
+                ),
+            )
+        except ValueError as err:
+            raise EsriAsciiGridError(str(err)) from err
@@ -2,36 +2,119 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import time
+from enum import StrEnum
 from typing import TYPE_CHECKING
 
+import matplotlib as mpl
 import numpy as np
-from arma3_offline_map_lib.dem import DEM
 from matplotlib import pyplot as plt
 
+from modules.dem_cache import dem_content_hash, load_dem_derivatives
+from modules.png import write_png
+from modules.profiling import stage
+from modules.raster import block_mean, reduction_factor
+from modules.raster_render import render_map
+
 if TYPE_CHECKING:
-    from collections.abc import Iterable
     from pathlib import Path
 
+    import numpy.typing as npt
     from matplotlib.axes import Axes
 
+    from modules.dem_cache import DemDerivatives
     from modules.mission.mission import Mission
-    from modules.mission.position_2d import Position2D
 
 LOGGER = logging.getLogger(__name__)
 MAP_IMAGE_SIZE_PX = 1000
+MARKER_SERIES = {
+    "airports": "A",
+    "bases": "B",
+    "waterports": "W",
+    "outposts": "O",
+    "factories": "F",
+    "resources": "R",
+}
+"""Marker character of each series, in plotting order."""
+
+
+class Renderer(StrEnum):
+    """Map image renderer."""
+
+    MATPLOTLIB = "matplotlib"
+    """matplotlib figure, saved with `savefig()`."""
+    NUMPY = "numpy"
+    """Equivalent image composited directly with NumPy; see `raster_render`."""
+
 
+RENDERER_VERSIONS = {Renderer.MATPLOTLIB: 1, Renderer.NUMPY: 1}
+"""Version of each renderer's output. Increment when output changes, so cached
+renders are regenerated."""
+
+
+def render_inputs_digest(
+    *,
+    mission: Mission,
+    grad_meh_dem_filepath: Path,
+    renderer: Renderer,
+    dem_cache_dir: Path | None = None,
+) -> str:
+    """
+    Return a content hash of everything a map render depends on.
+
+    Covers marker categories and positions, DEM content, renderer and its version
+    (including matplotlib's), and image size.
+
+    Arguments:
+        mission: Mission to render.
+        grad_meh_dem_filepath: DEM file.
+        renderer: Renderer to draw and export image with.
+        dem_cache_dir: If given, the DEM's content hash is memoized here; see
+            `dem_cache.dem_content_hash()`.
+
+    """
+    hash_ = hashlib.sha256(
+        f"{renderer}:{RENDERER_VERSIONS[renderer]}:{mpl.__version__}:"
+        f"{MAP_IMAGE_SIZE_PX}".encode()
+    )
+    hash_.update(len(mission.markers.categories).to_bytes(8))
+    hash_.update(mission.markers.categories)
+    hash_.update(mission.markers.xy)
+    hash_.update(
+        dem_content_hash(grad_meh_dem_filepath, cache_dir=dem_cache_dir).encode()
+        if grad_meh_dem_filepath.is_file()
+        else b"\0"
+    )
+    return hash_.hexdigest()
 
+
+@stage("render")
 def export_map_render(
-    *, mission: Mission, grad_meh_dem_filepath: Path, export_filepath: Path
+    *,
+    mission: Mission,
+    grad_meh_dem_filepath: Path,
+    export_filepath: Path,
+    dem_cache_dir: Path | None = None,
+    renderer: Renderer = Renderer.MATPLOTLIB,
 ) -> None:
-    """Load gzipped DEM (must be `*.asc.gz`) and export a map render."""
-    log_msg = f"'{mission.map_name}': plotting map..."
+    """
+    Load gzipped DEM (must be `*.asc.gz`) and export a map render.
+
+    Arguments:
+        mission: Mission to render.
+        grad_meh_dem_filepath: DEM file.
+        export_filepath: PNG file to export.
+        dem_cache_dir: If given, DEM derivatives are cached here; see
+            `dem_cache.load_dem_derivatives()`.
+        renderer: Renderer to draw and export image with.
+
+    """
+    log_msg = f"'{mission.map_name}': plotting map with {renderer}..."
     LOGGER.info(log_msg)
-    fig, ax = plt.subplots()
-    size_inches = MAP_IMAGE_SIZE_PX / 100  # default 100 ppi
-    fig.set_size_inches(size_inches, size_inches)
-
+    start_time = time.perf_counter()
+    dem = water = None
     if not grad_meh_dem_filepath.is_file():
         log_msg = f"'{mission.map_name}': - no DEM."
         LOGGER.warning(log_msg)
@@ -39,74 +122,129 @@ def export_map_render(
     else:
         log_msg = f"'{mission.map_name}': - loading DEM..."
         LOGGER.info(log_msg)
-        dem = DEM.from_esri_ascii_raster_gz(grad_meh_dem_filepath)
+        with stage("dem_load"):
+            dem = load_dem_derivatives(grad_meh_dem_filepath, cache_dir=dem_cache_dir)
+
         log_msg = f"'{mission.map_name}':   done."
         LOGGER.info(log_msg)
 
         log_msg = f"'{mission.map_name}': - rendering water..."
         LOGGER.info(log_msg)
-        _plot_water(axes=ax, dem=dem)
-        log_msg = f"'{mission.map_name}':   done."
+        with stage("water"):
+            water = water_layer(dem)
+
+        log_msg = (
+            f"'{mission.map_name}':   done; reduced {_describe_raster(dem.land)} "
+            f"DEM land mask to {_describe_raster(water)} water layer."
+        )
         LOGGER.info(log_msg)
 
-    marker_series = {
-        "airports": "A",
-        "bases": "B",
-        "waterports": "W",
-        "outposts": "O",
-        "factories": "F",
-        "resources": "R",
-    }
-    for series_name, marker_char in marker_series.items():
-        raw_series = mission.__getattribute__(series_name)
-        plottable_series = [i.position for i in raw_series if i.position is not None]
-        if raw_series and not plottable_series:
+    positions = series_positions(mission)
+    extents = None if dem is None else dem.extents
+    if renderer is Renderer.NUMPY:
+        with stage("draw"):
+            rgba = render_map(
+                size_px=MAP_IMAGE_SIZE_PX,
+                markers={MARKER_SERIES[k]: v for k, v in positions.items()},
+                water=water,
+                extents=extents,
+            )
+
+        log_msg = f"'{mission.map_name}': - exporting..."
+        LOGGER.info(log_msg)
+        with stage("export"):
+            write_png(export_filepath, rgba)
+
+    else:
+        with stage("draw"):
+            fig, ax = plt.subplots()
+            size_inches = MAP_IMAGE_SIZE_PX / 100  # default 100 ppi
+            fig.set_size_inches(size_inches, size_inches)
+            if water is not None and extents is not None:
+                _plot_water(axes=ax, water=water, extents=extents)
+
+            for series_name, series in positions.items():
+                _plot_series(
+                    axes=ax,
+                    positions=series,
+                    marker=f"${MARKER_SERIES[series_name]}$",
+                )
+                log_msg = f"'{mission.map_name}': - plotted {series_name}."
+                LOGGER.debug(log_msg)
+
+            ax.set_aspect("equal")
+
+        log_msg = f"'{mission.map_name}': - exporting..."
+        LOGGER.info(log_msg)
+        with stage("export"):
+            plt.savefig(export_filepath)
+            plt.close()
+
+    log_msg = (
+        f"'{mission.map_name}': exported '{export_filepath.name}' in "
+        f"{time.perf_counter() - start_time:.2f} s."
+    )
+    LOGGER.info(log_msg)
+
+
+def series_positions(mission: Mission) -> dict[str, npt.NDArray[np.float64]]:
+    """
+    Return plottable positions of each marker series, in `MARKER_SERIES` order.
+
+    Positions that aren't finite are dropped, and series without positions are
+    omitted; both are logged.
+    """
+    plottable = {}
+    for series_name in MARKER_SERIES:
+        positions = mission.markers.category_positions(series_name)
+        plottable_positions = positions[np.isfinite(positions).all(axis=1)]
+        if len(positions) and not len(plottable_positions):
             log_msg = f"'{mission.map_name}': - no {series_name} positions to plot."
             LOGGER.error(log_msg)
 
-        elif plottable_series:
-            _plot_series(
-                axes=ax,
-                iterable_=plottable_series,
-                marker=f"${marker_char}$",
-            )
-            log_msg = f"'{mission.map_name}': - plotted {series_name}."
-            LOGGER.debug(log_msg)
+        elif len(plottable_positions):
+            plottable[series_name] = plottable_positions
 
         else:
             log_msg = f"'{mission.map_name}': - note: no {series_name}."
             LOGGER.info(log_msg)
 
-    ax.set_aspect("equal")
-    log_msg = f"'{mission.map_name}': - exporting..."
-    LOGGER.info(log_msg)
+    return plottable
 
-    plt.savefig(export_filepath)
-    plt.close()
-    log_msg = f"'{mission.map_name}': exported '{export_filepath.name}'."
-    LOGGER.info(log_msg)
+
+def water_layer(dem: DemDerivatives) -> npt.NDArray[np.float32]:
+    """
+    Return opacity of sea area, as fraction of water in each pixel.
+
+    The DEM land mask is reduced to no more than the output resolution.
+    """
+    factor = reduction_factor(dem.land.shape, MAP_IMAGE_SIZE_PX)
+    return 1 - block_mean(dem.land, factor)
 
 
-def _plot_water(axes: Axes, dem: DEM) -> None:
-    """Plot monotone image of sea area; land is transparent."""
-    zeros = np.zeros(dem.elevation.shape)
+def _plot_water(
+    *, axes: Axes, water: npt.NDArray[np.float32], extents: tuple[float, float]
+) -> None:
+    """Plot monotone image of sea area, with opacity `water`; land is transparent."""
     axes.imshow(
-        zeros,
+        np.zeros(water.shape, dtype=np.float32),
         cmap="terrain",
-        extent=(0, dem.extents.x, 0, dem.extents.y),  # order: l, r, btm, top
-        alpha=np.invert(dem.land),
+        extent=(0, extents[0], 0, extents[1]),  # order: l, r, btm, top
+        alpha=water,
     )
 
 
+def _describe_raster(array: npt.NDArray[np.generic]) -> str:
+    """Describe raster shape and memory size, e.g. `4096x4096 (16.0 MiB)`."""
+    shape = "x".join(str(i) for i in array.shape)
+    return f"{shape} ({array.nbytes / 2**20:.1f} MiB)"
+
+
 def _plot_series(
     *,
     axes: Axes,
-    iterable_: Iterable[Position2D],
+    positions: npt.NDArray[np.float64],
     marker: str | None = None,
 ) -> None:
-    """Plot `iterable_` as a scatter series."""
-    axes.scatter(
-        [p.x for p in iterable_],
-        [p.y for p in iterable_],
-        marker=marker,
-    )
+    """Plot `positions` (`(n, 2)` array of `x, y`) as a scatter series."""
+    axes.scatter(positions[:, 0], positions[:, 1], marker=marker)
@@ -1,61 +1,90 @@
-"""Parse a mission's `mapInfo.hpp` file with `cxxheaderparser`."""
+"""
+Parse a mission's `mapInfo.hpp` file.
+
+Uses `mapinfo_hpp_tokenizer`, falling back to a full C++ header parse with
+`cxxheaderparser`.
+"""
 
 from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+from functools import cached_property
 from typing import TYPE_CHECKING, Self
 
 from cxxheaderparser.simple import parse_string
+from cxxheaderparser.types import Array, NameSpecifier, Type
+
+from .mapinfo_hpp_tokenizer import MapInfoHppFields, UnsupportedSyntaxError
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
     from pathlib import Path
 
     from cxxheaderparser.simple import ClassScope
-    from cxxheaderparser.tokfmt import Token
 
 LOGGER = logging.getLogger(__name__)
 
+type _FieldIndex = dict[str, list[str]]
+"""Value tokens of each field, by name, as `cxxheaderparser` `Token.value`s."""
 
-def _get_climate(class_scope: ClassScope) -> str:
-    """Get climate value."""
-    value = _field_lookup(field_name="climate", class_scope=class_scope)
-    return _unquote(str(value))
+type FieldValue = str | int | float | list[FieldValue]
+"""Decoded field value; arrays are (nested) lists."""
 
 
-def _field_lookup(*, field_name: str, class_scope: ClassScope) -> str | None:
-    """Get field by name."""
+def _field_index(class_scope: ClassScope) -> _FieldIndex:
+    """Index fields by name, in a single pass."""
+    index: _FieldIndex = {}
     for field in class_scope.fields:
-        t = field.type
-        if (
-            hasattr(t, "typename")
-            and hasattr(t.typename.segments[0], "name")
-            and t.typename.segments[0].name == field_name
-        ):
-            if field.value is None:
-                err_msg = f"'{field_name}' field has no value."
-                raise ValueError(err_msg)
+        type_ = field.type
+        while isinstance(type_, Array):
+            type_ = type_.array_of
+
+        if not isinstance(type_, Type):
+            continue
+
+        segment = type_.typename.segments[0]
+        if isinstance(segment, NameSpecifier):
+            tokens = [] if field.value is None else field.value.tokens
+            index.setdefault(segment.name, [t.value for t in tokens])
+
+    return index
+
+
+def _field_lookup(*, field_name: str, index: _FieldIndex) -> list[str]:
+    """Get field value tokens by name."""
+    if field_name not in index:
+        err_msg = f"Can't find '{field_name}' field."
+        raise ValueError(err_msg)
+
+    tokens = index[field_name]
+    if not tokens:
+        err_msg = f"'{field_name}' field has no value."
+        raise ValueError(err_msg)
+
+    return tokens
 
-            return field.value.tokens[0].value
 
-    err_msg = f"Can't find '{field_name}' field."
-    raise ValueError(err_msg)
+def _decode_climate(index: _FieldIndex) -> str:
+    """Decode climate value."""
+    tokens = _field_lookup(field_name="climate", index=index)
+    return _unquote(tokens[0])
 
 
-def _get_disabled_town_names(class_scope: ClassScope) -> list[str]:
-    """Get disabled towns."""
-    tokens = _field_array_lookup(field_name="disabledTowns", class_scope=class_scope)
+def _decode_disabled_town_names(index: _FieldIndex) -> list[str]:
+    """Decode disabled towns."""
+    tokens = _field_lookup(field_name="disabledTowns", index=index)
     return _filter_tokens(tokens)
 
 
-def _get_populations(class_scope: ClassScope) -> list[tuple[str, int]]:
+def _decode_populations(index: _FieldIndex) -> list[tuple[str, int]]:
     """
-    Get population names and values.
+    Decode population names and values.
 
     List of tuple instead of dict, as may include duplicate town names.
     """
-    tokens = _field_array_lookup(field_name="population", class_scope=class_scope)
+    tokens = _field_lookup(field_name="population", index=index)
     values = _filter_tokens(tokens)
     return [
         (
@@ -66,28 +95,56 @@ def _get_populations(class_scope: ClassScope) -> list[tuple[str, int]]:
     ]
 
 
-def _field_array_lookup(*, field_name: str, class_scope: ClassScope) -> list[Token]:
-    """Get field by name."""
-    for field in class_scope.fields:
-        t = field.type
-        if (
-            hasattr(t, "array_of")
-            and hasattr(t.array_of, "typename")
-            and hasattr(t.array_of.typename.segments[0], "name")
-            and t.array_of.typename.segments[0].name == field_name
-        ):
-            if field.value is None:
-                err_msg = f"'{field_name}' field has no value."
-                raise ValueError(err_msg)
+def _decode_value(tokens: list[str]) -> FieldValue:
+    """
+    Decode any field value.
+
+    Arrays become (nested) lists. Quoted strings are unquoted; numbers become `int`
+    or `float`; anything else, e.g. a macro name, is left as `str`.
+    """
+    if tokens[0] != "{":
+        return _decode_scalar(tokens)
+
+    return _decode_array(iter(tokens[1:]))
+
+
+def _decode_array(tokens: Iterator[str]) -> list[FieldValue]:
+    """Decode array, consuming tokens after its opening brace."""
+    values: list[FieldValue] = []
+    element: list[str] = []
+    for lexeme in tokens:
+        if lexeme == "{":
+            values.append(_decode_array(tokens))
+        elif lexeme in {",", "}"}:
+            if element:
+                values.append(_decode_scalar(element))
+                element = []
+
+            if lexeme == "}":
+                break
+        else:
+            element.append(lexeme)
+
+    return values
 
-            return field.value.tokens
 
-    err_msg = f"Can't find '{field_name}' field."
-    raise ValueError(err_msg)
+def _decode_scalar(tokens: list[str]) -> str | int | float:
+    """Decode non-array value."""
+    str_ = "".join(tokens)
+    if str_.startswith('"'):
+        return _unquote(str_)
 
+    for type_ in (int, float):
+        try:
+            return type_(str_)
+        except ValueError:
+            pass
 
-def _filter_tokens(tokens: Iterable[Token]) -> list[str]:
-    return [_unquote(token.value) for token in tokens if token.value not in "{},"]
+    return str_
+
+
+def _filter_tokens(tokens: Iterable[str]) -> list[str]:
+    return [_unquote(value) for value in tokens if value not in "{},"]
 
 
 def _unquote(value: str) -> str:
@@ -103,11 +160,50 @@ def _pairwise(t: Iterable[str | int]) -> Iterable[tuple[str | int, str | int]]:
 
 @dataclass(kw_only=True)
 class MapInfoHppData:
-    """Data from a mission's `mapInfo.hpp` file."""
+    """
+    Data from a mission's `mapInfo.hpp` file.
+
+    Fields are indexed by name when parsed, but only decoded on first access. Fields
+    without a dedicated property are available by name from `field()`, e.g.
+    `field("garrison")`.
+    """
+
+    fields: _FieldIndex
+    """Value tokens of each field, by name."""
+    _decoded: dict[str, FieldValue] = dataclass_field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """Values decoded by `field()`, by name."""
+
+    @cached_property
+    def climate(self) -> str:
+        """Climate."""
+        return _decode_climate(self.fields)
+
+    @cached_property
+    def populations(self) -> list[tuple[str, int]]:
+        """Town names and populations. May include duplicate town names."""
+        return _decode_populations(self.fields)
+
+    @cached_property
+    def disabled_town_names(self) -> list[str]:
+        """Disabled town names."""
+        return _decode_disabled_town_names(self.fields)
 
-    climate: str
-    populations: list[tuple[str, int]]
-    disabled_town_names: list[str]
+    def field(self, name: str) -> FieldValue:
+        """
+        Decode any field by name, and cache it.
+
+        Raises:
+            ValueError: if there's no such field, or it has no value.
+
+        """
+        if name not in self._decoded:
+            self._decoded[name] = _decode_value(
+                _field_lookup(field_name=name, index=self.fields)
+            )
+
+        return self._decoded[name]
 
     @classmethod
     def from_file(cls, filepath: Path) -> Self:
@@ -122,10 +218,21 @@ class MapInfoHppData:
     @classmethod
     def from_str(cls, str_: str) -> Self:
         """Parse str of file contents."""
+        try:
+            return cls._from_str_tokenized(str_)
+        except UnsupportedSyntaxError as err:
+            log_msg = f"Couldn't tokenize ({err}); parsing as C++ header."
+            LOGGER.debug(log_msg)
+            return cls._from_str_cxx(str_)
+
+    @classmethod
+    def _from_str_tokenized(cls, str_: str) -> Self:
+        """Parse str of file contents with `mapinfo_hpp_tokenizer`."""
+        return cls(fields=MapInfoHppFields(str_).fields)
+
+    @classmethod
+    def _from_str_cxx(cls, str_: str) -> Self:
+        """Parse str of file contents with `cxxheaderparser`."""
         parsed_data = parse_string(str_)
         class_scope = parsed_data.namespace.classes[0]
-        return cls(
-            climate=_get_climate(class_scope),
-            populations=_get_populations(class_scope),
-            disabled_town_names=_get_disabled_town_names(class_scope),
-        )
+        return cls(fields=_field_index(class_scope))
@@ -0,0 +1,129 @@
+"""
+Tokenize a mission's `mapInfo.hpp` file, for the subset of syntax it uses.
+
+A fast alternative to a full C++ header parse with `cxxheaderparser`. Tokens are
+produced in the same form as `cxxheaderparser` field value tokens, so values can be
+decoded identically.
+
+Anything outside the supported subset raises `UnsupportedSyntaxError`, so the caller
+can fall back to `cxxheaderparser`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<skip>
+        \s+
+        |//[^\n]*
+        |/\*.*?\*/
+        |\#[ \t]*include\b[^\n]*  # ignored, as cxxheaderparser
+    )
+    |(?P<string>"(?:[^"\\\n]|\\.)*")
+    |(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<name>[A-Za-z_]\w*)
+    |(?P<punct>[{}\[\]=;,-])
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class UnsupportedSyntaxError(ValueError):
+    """`mapInfo.hpp` content uses syntax outside the supported subset."""
+
+
+class MapInfoHppFields:
+    """Field value tokens of the single class defined in a `mapInfo.hpp` file."""
+
+    def __init__(self, str_: str) -> None:
+        """
+        Tokenize `str_`.
+
+        Raises:
+            UnsupportedSyntaxError: if `str_` isn't a single class containing only
+                `name = value;` and `name[] = {...};` fields.
+
+        """
+        self.fields: dict[str, list[str]] = {}
+        """Value tokens (including any braces) of each field, by name."""
+
+        tokens = _tokenize(str_)
+        self._expect(tokens, "class")
+        self._expect_name(tokens)
+        self._expect(tokens, "{")
+        while (lexeme := next(tokens, None)) != "}":
+            if lexeme is None or not _is_name(lexeme):
+                raise _unsupported(lexeme)
+
+            self._field(lexeme, tokens)
+
+        self._expect(tokens, ";")
+        if (lexeme := next(tokens, None)) is not None:
+            raise _unsupported(lexeme)
+
+    def _field(self, name: str, tokens: Iterator[str]) -> None:
+        """Consume a field after its `name`."""
+        lexeme = next(tokens, None)
+        if lexeme == "[":
+            self._expect(tokens, "]")
+            lexeme = next(tokens, None)
+
+        if lexeme != "=":
+            raise _unsupported(lexeme)
+
+        value: list[str] = []
+        depth = 0
+        while (lexeme := next(tokens, None)) != ";" or depth:
+            if lexeme is None:
+                raise _unsupported(lexeme)
+
+            depth += {"{": 1, "}": -1}.get(lexeme, 0)
+            value.append(lexeme)
+
+        if not value:
+            raise _unsupported(lexeme)
+
+        self.fields.setdefault(name, value)  # first definition wins
+
+    @staticmethod
+    def _expect(tokens: Iterator[str], expected: str) -> None:
+        lexeme = next(tokens, None)
+        if lexeme != expected:
+            raise _unsupported(lexeme)
+
+    @staticmethod
+    def _expect_name(tokens: Iterator[str]) -> None:
+        lexeme = next(tokens, None)
+        if lexeme is None or not _is_name(lexeme):
+            raise _unsupported(lexeme)
+
+
+def _tokenize(str_: str) -> Iterator[str]:
+    """Yield tokens, skipping whitespace, comments and `#include` directives."""
+    for match in _TOKEN_RE.finditer(str_):
+        kind = match.lastgroup
+        if kind == "skip":
+            continue
+
+        if kind == "other":
+            raise _unsupported(match.group())
+
+        yield match.group()
+
+
+def _is_name(lexeme: str) -> bool:
+    return lexeme[0].isalpha() or lexeme[0] == "_"
+
+
+def _unsupported(lexeme: str | None) -> UnsupportedSyntaxError:
+    if lexeme is None:
+        return UnsupportedSyntaxError("Unexpected end of content.")
+
+    return UnsupportedSyntaxError(f"Unexpected lexeme: {lexeme!r}.")
@@ -0,0 +1,148 @@
+"""`MarkerTable` class."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Self, overload
+
+import msgspec
+import numpy as np
+
+from .marker import Marker
+from .position_2d import Position2D
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import numpy.typing as npt
+
+MARKER_CATEGORIES = (
+    "airports",
+    "factories",
+    "bases",
+    "outposts",
+    "waterports",
+    "resources",
+)
+"""Military zone marker categories; index is category code."""
+
+
+class MarkerTable(msgspec.Struct, frozen=True):
+    """Military zone markers of a mission, stored as columns."""
+
+    names: list[str] = msgspec.field(default_factory=list)
+    """Interned marker names."""
+    categories: bytes = b""
+    """Category codes as uint8; see `codes` and `MARKER_CATEGORIES`."""
+    xy: bytes = b""
+    """Positions as native float64 `x, y` pairs; see `positions`."""
+
+    @property
+    def codes(self) -> npt.NDArray[np.uint8]:
+        """Category codes, as index in `MARKER_CATEGORIES`."""
+        return np.frombuffer(self.categories, dtype=np.uint8)
+
+    @property
+    def positions(self) -> npt.NDArray[np.float64]:
+        """Positions as `(n, 2)` array of `x, y`."""
+        return np.frombuffer(self.xy, dtype=np.float64).reshape(-1, 2)
+
+    @classmethod
+    def from_markers(cls, markers: Mapping[str, Sequence[Marker]]) -> Self:
+        """
+        Construct from markers by category.
+
+        Raises:
+            ValueError: if a category isn't in `MARKER_CATEGORIES`.
+
+        """
+        unknown_categories = markers.keys() - set(MARKER_CATEGORIES)
+        if unknown_categories:
+            err_msg = f"Unknown marker categories: {sorted(unknown_categories)}."
+            raise ValueError(err_msg)
+
+        rows = [
+            (code, marker)
+            for code, category in enumerate(MARKER_CATEGORIES)
+            for marker in markers.get(category, [])
+        ]
+        xy = np.array(
+            [(m.position.x, m.position.y) for _, m in rows], dtype=np.float64
+        ).reshape(-1, 2)
+        return cls(
+            names=[sys.intern(m.name) for _, m in rows],
+            categories=bytes(code for code, _ in rows),
+            xy=xy.tobytes(),
+        )
+
+    def count(self, category: str) -> int:
+        """Count markers in `category`."""
+        return int(np.count_nonzero(self.codes == _code(category)))
+
+    def category_positions(self, category: str) -> npt.NDArray[np.float64]:
+        """Return positions of markers in `category`, as `(n, 2)` array."""
+        positions: npt.NDArray[np.float64] = self.positions[
+            self.codes == _code(category)
+        ]
+        return positions
+
+    def markers(self, category: str) -> MarkerView:
+        """Return lazy `Marker` view of markers in `category`."""
+        return MarkerView(
+            self, rows=np.flatnonzero(self.codes == _code(category)).tolist()
+        )
+
+
+class MarkerView(Sequence[Marker]):
+    """Read-only sequence of `Marker`s, constructed from a `MarkerTable` on access."""
+
+    def __init__(self, table: MarkerTable, *, rows: list[int]) -> None:
+        """View `rows` of `table`."""
+        self._table = table
+        self._rows = rows
+
+    def __len__(self) -> int:
+        """Count markers."""
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, index: int) -> Marker: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Marker]: ...
+
+    def __getitem__(self, index: int | slice) -> Marker | list[Marker]:
+        """Return marker(s) at `index`."""
+        if isinstance(index, slice):
+            return [self._marker(row) for row in self._rows[index]]
+
+        return self._marker(self._rows[index])
+
+    def __eq__(self, other: object) -> bool:
+        """Compare as sequence of `Marker`s."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+
+        return list(self) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Represent as list of `Marker`s."""
+        return repr(list(self))
+
+    def _marker(self, row: int) -> Marker:
+        x, y = self._table.positions[row].tolist()
+        return Marker(name=self._table.names[row], position=Position2D(x=x, y=y))
+
+
+def _code(category: str) -> int:
+    """
+    Return category code.
+
+    Raises:
+        ValueError: if `category` isn't in `MARKER_CATEGORIES`.
+
+    """
+    return MARKER_CATEGORIES.index(category)
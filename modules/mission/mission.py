@@ -2,28 +2,34 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from collections.abc import Mapping
-from pathlib import Path
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING
 
-from attrs import Factory, asdict, define
-from cattrs import ClassValidationError, structure
+import msgspec
+from attrs import Factory, define
 
+from modules.diagnostics import Diagnostics, Severity
+from modules.profiling import stage
 from static_data import in_game_data
 from static_data.au_mission_overrides import DISABLED_TOWNS_IGNORED_PREFIXES
 
 from .mapinfo_hpp_parser import MapInfoHppData
-from .marker import Marker
+from .marker_table import MarkerTable
 from .mission_sqm_parser import MissionSqmData
-from .towns import load_towns_from_dir
+from .towns import load_town_table
 from .utils import map_name_from_mission_dir_path, pretty_iterable_of_str
+from .war_level_points import COUNT_COLUMNS, war_level_points
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .marker_table import MarkerView
     from .types_ import DictNode
 
 LOGGER = logging.getLogger(__name__)
+_MILITARY_ZONES_CHECK = "military_zones"
+_TOWNS_CHECK = "towns"
 
 
 def _towns_from_map_info(
@@ -49,6 +55,21 @@ def _towns_from_map_info(
     return unique_towns
 
 
+def war_level_points_ratio(
+    war_level_points: int | None, max_value: int
+) -> float | None:
+    """Return `war_level_points` as fraction of `max_value`, if known and nonzero."""
+    if not war_level_points:
+        return None
+
+    ratio = war_level_points / max_value
+    if ratio > 1:
+        err_msg = f"War Level Points ratio {ratio} > 1."
+        raise ValueError(err_msg)
+
+    return ratio
+
+
 def _normalise_mission_town_name(name: str) -> str:
     """Normalise town name from mission data, for comparison purposes."""
     for prefix in DISABLED_TOWNS_IGNORED_PREFIXES:
@@ -100,51 +121,71 @@ class Mission:
     Derived from `disabledTowns` array in `mapinfo.hpp`. NB: not necessarily relevant
     to the map!"""
 
-    airports: list[Marker] = Factory(list)
-    """From `mission.sqm`."""
-    factories: list[Marker] = Factory(list)
-    """From `mission.sqm`."""
-    bases: list[Marker] = Factory(list)
-    """From `mission.sqm`."""
-    outposts: list[Marker] = Factory(list)
-    """From `mission.sqm`."""
-    waterports: list[Marker] = Factory(list)
-    """From `mission.sqm`."""
-    resources: list[Marker] = Factory(list)
-    """From `mission.sqm`."""
+    markers: MarkerTable = Factory(MarkerTable)
+    """Military zone markers, from `mission.sqm`."""
 
     exclude: bool = False
     """Omit this mission from the final output."""
 
+    @property
+    def airports(self) -> MarkerView:
+        """From `mission.sqm`."""
+        return self.markers.markers("airports")
+
+    @property
+    def factories(self) -> MarkerView:
+        """From `mission.sqm`."""
+        return self.markers.markers("factories")
+
+    @property
+    def bases(self) -> MarkerView:
+        """From `mission.sqm`."""
+        return self.markers.markers("bases")
+
+    @property
+    def outposts(self) -> MarkerView:
+        """From `mission.sqm`."""
+        return self.markers.markers("outposts")
+
+    @property
+    def waterports(self) -> MarkerView:
+        """From `mission.sqm`."""
+        return self.markers.markers("waterports")
+
+    @property
+    def resources(self) -> MarkerView:
+        """From `mission.sqm`."""
+        return self.markers.markers("resources")
+
     @property
     def airports_count(self) -> int:
         """Enumerate airports."""
-        return len(self.airports)
+        return self.markers.count("airports")
 
     @property
     def waterports_count(self) -> int:
         """Enumerate sea/river ports."""
-        return len(self.waterports)
+        return self.markers.count("waterports")
 
     @property
     def bases_count(self) -> int:
         """Enumerate bases."""
-        return len(self.bases)
+        return self.markers.count("bases")
 
     @property
     def outposts_count(self) -> int:
         """Enumerate outposts."""
-        return len(self.outposts)
+        return self.markers.count("outposts")
 
     @property
     def factories_count(self) -> int:
         """Enumerate factories."""
-        return len(self.factories)
+        return self.markers.count("factories")
 
     @property
     def resources_count(self) -> int:
         """Enumerate resources."""
-        return len(self.resources)
+        return self.markers.count("resources")
 
     @property
     def total_military_zones_count(self) -> int:
@@ -170,33 +211,12 @@ class Mission:
 
     @property
     def war_level_points(self) -> int | None:
-        """Count total war level points."""
-        if not self.towns:
-            return None
-
-        return sum(
-            (
-                8 * self.airports_count,
-                6 * self.bases_count,
-                4 * self.waterports_count,
-                2 * self.outposts_count,
-                2 * self.resources_count,
-                2 * self.factories_count,
-                len(self.towns),  # as self.towns_count may be None
-            )
-        )
+        """Count total War Level points, with in-game weighting."""
+        return war_level_points([getattr(self, column) for column in COUNT_COLUMNS])
 
     def war_level_points_ratio(self, max_value: int) -> float | None:
         """Fraction of `max_value`."""
-        if not self.war_level_points:
-            return None
-
-        ratio = self.war_level_points / max_value
-        if ratio > 1:
-            err_msg = f"War Level Points ratio {ratio} > 1."
-            raise ValueError(err_msg)
-
-        return ratio
+        return war_level_points_ratio(self.war_level_points, max_value)
 
     @classmethod
     def from_data(cls, *, mission_dir: Path, map_index: DictNode) -> Mission | None:
@@ -210,7 +230,7 @@ class Mission:
         map_lookup = map_index[map_name]
         map_display_name = map_lookup.get("display_name")
         map_url = map_lookup.get("url")
-        exclude = map_lookup.get("exclude")
+        exclude = bool(map_lookup.get("exclude"))
 
         if not map_display_name:
             log_msg = f"'{map_name}': map index issue: no `map_display_name`."
@@ -220,8 +240,12 @@ class Mission:
             log_msg = f"'{map_name}': map index issue: no `map_url`."
             LOGGER.error(log_msg)
 
-        parsed_map_info = MapInfoHppData.from_file(mission_dir / "mapInfo.hpp")
-        parsed_mission_sqm = MissionSqmData.from_file(mission_dir / "mission.sqm")
+        with stage("map_info_parse"):
+            parsed_map_info = MapInfoHppData.from_file(mission_dir / "mapInfo.hpp")
+
+        with stage("mission_sqm_parse"):
+            parsed_mission_sqm = MissionSqmData.from_file(mission_dir / "mission.sqm")
+
         log_msg = f"'{map_name}': parsed AU source data."
         LOGGER.info(log_msg)
 
@@ -236,89 +260,155 @@ class Mission:
             exclude=exclude,
         )
         if parsed_mission_sqm:
-            markers_ = parsed_mission_sqm.military_zone_markers
-            mission.airports = markers_["airport"]
-            mission.bases = markers_["milbase"]
-            mission.waterports = markers_["seaport"]
-            mission.outposts = markers_["outpost"]
-            mission.factories = markers_["factory"]
-            mission.resources = markers_["resource"]
+            with stage("marker_collection"):
+                markers_ = parsed_mission_sqm.military_zone_markers
+                mission.markers = MarkerTable.from_markers(
+                    {
+                        "airports": markers_["airport"],
+                        "bases": markers_["milbase"],
+                        "waterports": markers_["seaport"],
+                        "outposts": markers_["outpost"],
+                        "factories": markers_["factory"],
+                        "resources": markers_["resource"],
+                    }
+                )
 
         return mission
 
-    def export_json(self, dir_: Path) -> None:
-        """Export the mission as a JSON file."""
-        export_filename = f"{self.map_name}.json"
-        with Path.open(dir_ / export_filename, "w", encoding="utf-8") as file:
-            json.dump(
-                asdict(self),
-                file,
-                ensure_ascii=False,
-                indent=4,
-            )
-            log_msg = f"'{self.map_name}': exported '{export_filename}'."
-            LOGGER.info(log_msg)
+    def to_json(self) -> bytes:
+        """Encode as indented UTF-8 JSON."""
+        return msgspec.json.format(_JSON_ENCODER.encode(self), indent=4)
+
+    def to_msgpack(self) -> bytes:
+        """Encode as MessagePack."""
+        return _MSGPACK_ENCODER.encode(self)
 
     @classmethod
-    def from_json(cls, file_path: Path) -> Self:
-        """Load previously-exported `Mission` data from `path`."""
-        with Path.open(file_path, "r", encoding="utf-8") as file:
-            try:
-                mission = structure(json.load(file), cls)
-            except ClassValidationError as err:
-                err_msg = f"Error creating `Mission` from JSON: {file_path}."
-                raise ValueError(err_msg) from err
+    def from_json_bytes(cls, data: bytes) -> Mission:
+        """
+        Decode from JSON, validating types.
 
-        return mission
+        Raises:
+            ValueError: if data is malformed or doesn't match `Mission`'s fields.
+
+        """
+        return _decode(_JSON_DECODER, data)
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> Mission:
+        """
+        Decode from MessagePack, validating types.
+
+        Raises:
+            ValueError: if data is malformed or doesn't match `Mission`'s fields.
+
+        """
+        return _decode(_MSGPACK_DECODER, data)
+
+    def validate_and_correct_towns(
+        self,
+        gm_locations_dir: Path,
+        *,
+        towns_cache_dir: Path | None = None,
+        diagnostics: Diagnostics | None = None,
+    ) -> None:
+        """
+        Check against map locations and in-game data.
+
+        Arguments:
+            gm_locations_dir: grad_meh locations directory for the map.
+            towns_cache_dir: If given, map locations are cached here in compact form.
+            diagnostics: Findings are recorded here. If `None`, they're only logged.
+
+        """
+        if diagnostics is None:
+            diagnostics = Diagnostics()
 
-    def validate_and_correct_towns(self, gm_locations_dir: Path) -> None:
-        """Check against map locations and in-game data."""
         map_name = self.map_name
-        gm_towns = self._get_gm_towns(gm_locations_dir)
+        gm_towns = self._get_gm_towns(gm_locations_dir, towns_cache_dir=towns_cache_dir)
         in_game_towns_count = in_game_data.TOWNS_COUNT.get(map_name)
 
         if self.towns and gm_towns:
             if self.towns_count == len(gm_towns):
+                severity = Severity.INFO
                 log_msg = (
                     f"'{map_name}': used {self.towns_count} towns defined in mission; "
                     f"matches map locations data."
                 )
-                LOGGER.info(log_msg)
             else:
+                severity = Severity.WARNING
                 log_msg = (
                     f"'{map_name}': used {self.towns_count} towns defined in mission; "
                     f"doesn't match {len(gm_towns)} in map locations data."
                 )
-                LOGGER.warning(log_msg)
+
+            diagnostics.record(
+                map_name=map_name,
+                check=_TOWNS_CHECK,
+                severity=severity,
+                message=log_msg,
+                field="towns_count",
+                expected=len(gm_towns),
+                actual=self.towns_count,
+            )
 
         elif self.towns:
             log_msg = (
                 f"'{map_name}': {self.towns_count} towns defined in mission; "
                 f"no map locations data."
             )
-            LOGGER.info(log_msg)
+            diagnostics.record(
+                map_name=map_name,
+                check=_TOWNS_CHECK,
+                severity=Severity.INFO,
+                message=log_msg,
+                field="towns_count",
+                actual=self.towns_count,
+            )
         elif gm_towns:
             self.towns = dict.fromkeys(gm_towns)
             log_msg = (
                 f"'{map_name}': 0 towns defined in mission; used {self.towns_count} "
                 f"from map locations data."
             )
-            LOGGER.info(log_msg)
+            diagnostics.record(
+                map_name=map_name,
+                check=_TOWNS_CHECK,
+                severity=Severity.INFO,
+                message=log_msg,
+                field="towns_count",
+                actual=self.towns_count,
+            )
         elif in_game_towns_count:
             self.towns = {f"UNKNOWN_{i}": 0 for i in range(in_game_towns_count)}
             log_msg = (
                 f"'{map_name}': 0 towns defined in mission or map locations data; "
                 f"used {self.towns_count} towns from in-game data."
             )
-            LOGGER.warning(log_msg)
+            diagnostics.record(
+                map_name=map_name,
+                check=_TOWNS_CHECK,
+                severity=Severity.WARNING,
+                message=log_msg,
+                field="towns_count",
+                actual=self.towns_count,
+            )
         else:
             log_msg = (
                 f"'{map_name}': 0 towns defined in mission, retrieved from map "
                 f"locations data or in-game data."
             )
-            LOGGER.error(log_msg)
+            diagnostics.record(
+                map_name=map_name,
+                check=_TOWNS_CHECK,
+                severity=Severity.ERROR,
+                message=log_msg,
+                field="towns_count",
+            )
 
-    def _get_gm_towns(self, gm_locations_dir: Path) -> set[str]:
+    def _get_gm_towns(
+        self, gm_locations_dir: Path, *, towns_cache_dir: Path | None = None
+    ) -> set[str]:
         """
         Return town names from grad_meh data.
 
@@ -333,11 +423,16 @@ class Mission:
             log_msg = f"'{self.map_name}': no grad-meh locations data."
             LOGGER.warning(log_msg)
         else:
-            _gm_towns = load_towns_from_dir(gm_locations_dir)
-            gm_towns_lookup = {
-                _normalise_town_name(t.properties["name"]): t.properties["name"]
-                for t in _gm_towns
-            }
+            cache_filepath = (
+                None
+                if towns_cache_dir is None
+                else towns_cache_dir / f"{self.map_name}_towns.msgpack"
+            )
+            with stage("towns_load"):
+                _gm_towns = load_town_table(
+                    gm_locations_dir, cache_filepath=cache_filepath
+                )
+            gm_towns_lookup = {_normalise_town_name(t): t for t in _gm_towns.names}
 
         gm_towns = set()
         matched_keys = set()
@@ -351,15 +446,35 @@ class Mission:
 
         return gm_towns
 
-    def validate_military_zones(self, data: dict[str, dict[str, int]]) -> None:
-        """Check against in-game data; log issues."""
+    def validate_military_zones(
+        self,
+        data: dict[str, dict[str, int]],
+        *,
+        diagnostics: Diagnostics | None = None,
+    ) -> None:
+        """
+        Check against in-game data.
+
+        Arguments:
+            data: In-game military zone counts, by map name and field.
+            diagnostics: Findings are recorded here. If `None`, they're only logged.
+
+        """
+        if diagnostics is None:
+            diagnostics = Diagnostics()
+
         map_name = self.map_name
         if map_name not in data:
             log_msg = (
                 f"'{map_name}': military zone verification issue: "
                 f"key '{map_name}' not found."
             )
-            LOGGER.error(log_msg)
+            diagnostics.record(
+                map_name=map_name,
+                check=_MILITARY_ZONES_CHECK,
+                severity=Severity.ERROR,
+                message=log_msg,
+            )
 
         in_game_lookup = data.get(self.map_name)
         if not in_game_lookup:
@@ -367,19 +482,52 @@ class Mission:
                 f"'{self.map_name}': military zone verification issue: no data, "
                 "so zone counts can't be verified."
             )
-            LOGGER.error(log_msg)
+            diagnostics.record(
+                map_name=map_name,
+                check=_MILITARY_ZONES_CHECK,
+                severity=Severity.ERROR,
+                message=log_msg,
+            )
 
         else:
             for field in in_game_lookup:
                 field_value = getattr(self, field)
                 reference_value = in_game_lookup.get(field)
                 if field_value != reference_value:
+                    severity = Severity.ERROR
                     log_msg = (
                         f"'{self.map_name}': military zone verification issue: "
                         f"{field}': {field_value} != reference value: "
                         f"{reference_value}."
                     )
-                    LOGGER.error(log_msg)
                 else:
+                    severity = Severity.DEBUG
                     log_msg = f"'{self.map_name}': `{field}` matches in-game data."
-                    LOGGER.debug(log_msg)
+
+                diagnostics.record(
+                    map_name=map_name,
+                    check=_MILITARY_ZONES_CHECK,
+                    severity=severity,
+                    message=log_msg,
+                    field=field,
+                    expected=reference_value,
+                    actual=field_value,
+                )
+
+
+_JSON_ENCODER = msgspec.json.Encoder()
+_JSON_DECODER = msgspec.json.Decoder(Mission)
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+_MSGPACK_DECODER = msgspec.msgpack.Decoder(Mission)
+
+
+def _decode(
+    decoder: msgspec.json.Decoder[Mission] | msgspec.msgpack.Decoder[Mission],
+    data: bytes,
+) -> Mission:
+    """Decode with `decoder`, raising `ValueError` if invalid."""
+    try:
+        return decoder.decode(data)
+    except msgspec.DecodeError as err:  # includes `msgspec.ValidationError`
+        err_msg = f"Error decoding `Mission`: {err}"
+        raise ValueError(err_msg) from err
@@ -1,4 +1,9 @@
-"""Parse a mission's `mission.sqm` file with `armaclass`."""
+"""
+Parse a mission's `mission.sqm` file.
+
+Text files use `mission_sqm_scanner`, falling back to a full parse with `armaclass`.
+Binarized files use `mission_sqm_rap`.
+"""
 
 from __future__ import annotations
 
@@ -9,6 +14,8 @@ from typing import TYPE_CHECKING, Self
 import armaclass
 
 from .marker import Marker
+from .mission_sqm_rap import RapError, is_rapified, read_mission_entities
+from .mission_sqm_scanner import MissionSqmScanError, scan_mission_entities
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -42,12 +49,16 @@ def _collect_markers(node: DictNode) -> list[Marker]:
 
 def _is_relevant_marker(node: DictNode) -> bool:
     """Check if the node represents a relevant marker."""
-    return node.get("dataType") == "Marker" and any(
-        node.get("name", "").lower().startswith(prefix)
-        for prefix in RELEVANT_MARKER_PREFIXES
+    return node.get("dataType") == "Marker" and _is_relevant_marker_name(
+        node.get("name", "")
     )
 
 
+def _is_relevant_marker_name(name: str) -> bool:
+    """Check if the marker name has a relevant prefix."""
+    return any(name.lower().startswith(prefix) for prefix in RELEVANT_MARKER_PREFIXES)
+
+
 def _get_child_layers(node: DictNode) -> list[DictNode]:
     """Return `node`'s child layers."""
     return [e for e in _get_entities(node) if e.get("dataType") == "Layer"]
@@ -61,6 +72,56 @@ def _get_entities(node: DictNode) -> list[DictNode]:
     return [e for e in node["Entities"].values() if isinstance(e, dict)]
 
 
+def _read_rapified_mission_node(filepath: Path) -> DictNode | None:
+    """Return `Mission` class node from binarized file, or `None` if unreadable."""
+    try:
+        mission_node = read_mission_entities(
+            filepath, marker_name_filter=_is_relevant_marker_name
+        )
+    except RapError as err:
+        log_msg = f"Couldn't read binarized `{filepath}`: {err}"
+        LOGGER.warning(log_msg)
+        return None
+
+    log_msg = f"Read binarized `{filepath}`."
+    LOGGER.debug(log_msg)
+    return mission_node
+
+
+def _scan_mission_node(filepath: Path) -> DictNode | None:
+    """Return `Mission` class node from text file, or `None` if unparsable."""
+    try:
+        with filepath.open(errors="ignore") as f:
+            mission_node = scan_mission_entities(
+                f, marker_name_filter=_is_relevant_marker_name
+            )
+    except MissionSqmScanError as err:
+        log_msg = f"Couldn't scan `{filepath}` ({err}); parsing in full."
+        LOGGER.debug(log_msg)
+        return _parse_mission_node(filepath)
+
+    log_msg = f"Scanned `{filepath}`."
+    LOGGER.debug(log_msg)
+    return mission_node
+
+
+def _parse_mission_node(filepath: Path) -> DictNode | None:
+    """Return `Mission` class node from full parse, or `None` if unparsable."""
+    with filepath.open(errors="ignore") as f:
+        data = f.read()
+
+    try:
+        mission = armaclass.parse(data)
+        log_msg = f"Parsed `{filepath}`."
+        LOGGER.debug(log_msg)
+    except armaclass.ParseError:
+        log_msg = f"Couldn't parse `{filepath}`; may be binarized."
+        LOGGER.warning(log_msg)
+        return None
+
+    return mission["Mission"]  # type: ignore[no-any-return]
+
+
 @dataclass(kw_only=True)
 class MissionSqmData:
     """Data from a mission's `mission.sqm` file."""
@@ -70,19 +131,15 @@ class MissionSqmData:
     @classmethod
     def from_file(cls, filepath: Path) -> Self | None:
         """Parse a `mission.sqm` file."""
-        with filepath.open(errors="ignore") as f:
-            data = f.read()
-
-        try:
-            mission = armaclass.parse(data)
-            log_msg = f"Parsed `{filepath}`."
-            LOGGER.debug(log_msg)
-        except armaclass.ParseError:
-            log_msg = f"Couldn't parse `{filepath}`; may be binarized."
-            LOGGER.warning(log_msg)
+        if is_rapified(filepath):
+            mission_node = _read_rapified_mission_node(filepath)
+        else:
+            mission_node = _scan_mission_node(filepath)
+
+        if mission_node is None:
             return None
 
-        marker_list = _collect_markers(mission["Mission"])
+        marker_list = _collect_markers(mission_node)
         markers: dict[str, list[Marker]] = {
             prefix: [] for prefix in RELEVANT_MARKER_PREFIXES
         }
@@ -0,0 +1,227 @@
+"""
+Read marker entities from a binarized ('rapified') `mission.sqm` file.
+
+The file is memory-mapped and decoded in place. Class entries hold the offset of
+their body, so only the `Mission/Entities` tree (including layers) is visited;
+other classes, e.g. object attributes, are never decoded.
+
+The result has the same shape as `mission_sqm_scanner.scan_mission_entities()`.
+
+See: https://community.bistudio.com/wiki/raP_File_Format_-_Elite
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from .types_ import DictNode
+
+RAP_MAGIC = b"\0raP"
+_ROOT_BODY_OFFSET = 16  # after magic, 2 reserved ulongs, offset to enums
+_ENTRY_CLASS = 0
+_ENTRY_VALUE = 1
+_ENTRY_ARRAY = 2
+_ENTRY_EXTERN = 3
+_ENTRY_DELETE = 4
+_ENTRY_ARRAY_WITH_FLAGS = 5
+_TYPE_STRING = 0
+_TYPE_FLOAT = 1
+_TYPE_LONG = 2
+_TYPE_ARRAY = 3
+_TYPE_VARIABLE = 4
+_TYPE_INT64 = 6
+_FLOAT = struct.Struct("<f")
+_LONG = struct.Struct("<i")
+_INT64 = struct.Struct("<q")
+_ULONG = struct.Struct("<I")
+_ITEM_FIELDS = {"dataType", "name", "position"}
+
+
+class RapError(ValueError):
+    """Binarized content is malformed or uses an unknown entry type."""
+
+
+def is_rapified(filepath: Path) -> bool:
+    """Check if the file is binarized."""
+    with filepath.open("rb") as fp:
+        return fp.read(len(RAP_MAGIC)) == RAP_MAGIC
+
+
+def read_mission_entities(
+    filepath: Path, *, marker_name_filter: Callable[[str], bool]
+) -> DictNode:
+    """
+    Return the `Mission` class node, pruned to entities of interest.
+
+    Arguments:
+        filepath: Binarized `mission.sqm` file.
+        marker_name_filter: Markers are kept only if this returns `True` for
+            their name.
+
+    Returns:
+        Node containing only `Entities`, and within those only `Layer`s and kept
+        `Marker`s. Markers have only `dataType`, `name` and `position` fields.
+
+    Raises:
+        RapError: if the file can't be read.
+
+    """
+    with (
+        filepath.open("rb") as fp,
+        mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+    ):
+        reader = _RapReader(buffer, marker_name_filter=marker_name_filter)
+        try:
+            return reader.mission()
+        except (IndexError, struct.error) as err:
+            err_msg = "Unexpected end of data."
+            raise RapError(err_msg) from err
+
+
+class _RapReader:
+    """Decode class bodies on demand from a rapified buffer."""
+
+    def __init__(
+        self, buffer: mmap.mmap, *, marker_name_filter: Callable[[str], bool]
+    ) -> None:
+        if buffer[: len(RAP_MAGIC)] != RAP_MAGIC:
+            err_msg = "Not rapified."
+            raise RapError(err_msg)
+
+        self._buffer = buffer
+        self._marker_name_filter = marker_name_filter
+
+    def mission(self) -> DictNode:
+        """Return the `Mission` class node."""
+        _, root_classes = self._class_body(_ROOT_BODY_OFFSET)
+        if "Mission" not in root_classes:
+            err_msg = "No `Mission` class found."
+            raise RapError(err_msg)
+
+        _, mission_classes = self._class_body(root_classes["Mission"])
+        if "Entities" not in mission_classes:
+            return {}
+
+        return {"Entities": self._entities(mission_classes["Entities"])}
+
+    def _entities(self, offset: int) -> DictNode:
+        """Return kept items of an `Entities` class, by class name."""
+        _, classes = self._class_body(offset)
+        entities: DictNode = {}
+        for class_name, item_offset in classes.items():
+            item = self._item(item_offset)
+            if item is not None:
+                entities[class_name] = item
+
+        return entities
+
+    def _item(self, offset: int) -> DictNode | None:
+        """Return pruned entity node, or `None` if not kept."""
+        values, classes = self._class_body(offset)
+        data_type = values.get("dataType")
+        if data_type == "Layer":
+            entities = (
+                self._entities(classes["Entities"]) if "Entities" in classes else {}
+            )
+            return {"dataType": data_type, "Entities": entities}
+
+        if data_type == "Marker" and self._marker_name_filter(values.get("name", "")):
+            return {k: v for k, v in values.items() if k in _ITEM_FIELDS}
+
+        return None
+
+    def _class_body(self, offset: int) -> tuple[DictNode, dict[str, int]]:
+        """
+        Decode the class body at `offset`.
+
+        Returns:
+            Tuple of values by name, and child class body offsets by name.
+
+        """
+        _, pos = self._asciiz(offset)  # inherited class name
+        count, pos = self._compressed_int(pos)
+        values: DictNode = {}
+        classes: dict[str, int] = {}
+        for _ in range(count):
+            entry_type = self._buffer[pos]
+            pos += 1
+            if entry_type == _ENTRY_CLASS:
+                name, pos = self._asciiz(pos)
+                classes[name] = _ULONG.unpack_from(self._buffer, pos)[0]
+                pos += _ULONG.size
+            elif entry_type == _ENTRY_VALUE:
+                value_type = self._buffer[pos]
+                name, pos = self._asciiz(pos + 1)
+                values[name], pos = self._value(value_type, pos)
+            elif entry_type in {_ENTRY_ARRAY, _ENTRY_ARRAY_WITH_FLAGS}:
+                if entry_type == _ENTRY_ARRAY_WITH_FLAGS:
+                    pos += _ULONG.size
+
+                name, pos = self._asciiz(pos)
+                values[name], pos = self._array(pos)
+            elif entry_type in {_ENTRY_EXTERN, _ENTRY_DELETE}:
+                _, pos = self._asciiz(pos)
+            else:
+                err_msg = f"Unknown entry type {entry_type} at {pos - 1}."
+                raise RapError(err_msg)
+
+        return values, classes
+
+    def _array(self, pos: int) -> tuple[list[Any], int]:
+        """Decode array at `pos`; return values and position after it."""
+        count, pos = self._compressed_int(pos)
+        values = []
+        for _ in range(count):
+            value_type = self._buffer[pos]
+            value, pos = self._value(value_type, pos + 1)
+            values.append(value)
+
+        return values, pos
+
+    def _value(self, value_type: int, pos: int) -> tuple[Any, int]:
+        """Decode value of `value_type` at `pos`; return it and position after it."""
+        if value_type in {_TYPE_STRING, _TYPE_VARIABLE}:
+            return self._asciiz(pos)
+
+        if value_type == _TYPE_FLOAT:
+            return _FLOAT.unpack_from(self._buffer, pos)[0], pos + _FLOAT.size
+
+        if value_type == _TYPE_LONG:
+            return _LONG.unpack_from(self._buffer, pos)[0], pos + _LONG.size
+
+        if value_type == _TYPE_INT64:
+            return _INT64.unpack_from(self._buffer, pos)[0], pos + _INT64.size
+
+        if value_type == _TYPE_ARRAY:
+            return self._array(pos)
+
+        err_msg = f"Unknown value type {value_type} at {pos - 1}."
+        raise RapError(err_msg)
+
+    def _asciiz(self, pos: int) -> tuple[str, int]:
+        """Decode null-terminated string at `pos`; return it and position after it."""
+        end = self._buffer.find(b"\0", pos)
+        if end == -1:
+            err_msg = f"Unterminated string at {pos}."
+            raise RapError(err_msg)
+
+        return self._buffer[pos:end].decode(errors="ignore"), end + 1
+
+    def _compressed_int(self, pos: int) -> tuple[int, int]:
+        """Decode variable-length integer at `pos`; return it and position after it."""
+        value = 0
+        shift = 0
+        while True:
+            byte = self._buffer[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value, pos
+
+            shift += 7
@@ -0,0 +1,331 @@
+"""
+Scan a mission's `mission.sqm` file for marker entities, without a full parse.
+
+Tokens are read line by line and only the `Mission/Entities` tree is followed. Within
+it, only `Layer` entities and `Marker` entities with matching names are kept, so peak
+memory doesn't scale with the number of other objects in the mission.
+
+The result has the same shape as the equivalent subset of `armaclass.parse()`
+output, which remains the reference implementation.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, NoReturn
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .types_ import DictNode
+
+_TOKEN_RE = re.compile(
+    r"""
+    //.*  # line comment
+    |"(?:[^"]|"")*"(?:[ \t]*\\n[ \t]*"(?:[^"]|"")*")*  # string, maybe multi-line
+    |\[\]|\+=|[{};=,:]  # punctuation
+    |[^\s{};=,:"\[\]]+  # word: name or unquoted value
+    |\S  # anything else is invalid
+    """,
+    re.VERBOSE,
+)
+_INVALID_TOKENS = {'"', "[", "]"}
+_PUNCTUATION = {"[]", "+=", "{", "}", ";", "=", ",", ":"}
+_STRING_LINE_BREAK_RE = re.compile(r'"[ \t]*\\n[ \t]*"')
+_ITEM_FIELDS = {"dataType", "name", "position"}
+
+
+class MissionSqmScanError(ValueError):
+    """`mission.sqm` content uses syntax the scanner doesn't handle."""
+
+
+def scan_mission_entities(
+    lines: Iterable[str], *, marker_name_filter: Callable[[str], bool]
+) -> DictNode:
+    """
+    Return the `Mission` class node, pruned to entities of interest.
+
+    Arguments:
+        lines: `mission.sqm` content, e.g. an open file.
+        marker_name_filter: Markers are kept only if this returns `True` for
+            their name.
+
+    Returns:
+        Node containing only `Entities`, and within those only `Layer`s and kept
+        `Marker`s. Markers have only `dataType`, `name` and `position` fields.
+
+    Raises:
+        MissionSqmScanError: if the content can't be scanned.
+
+    """
+    scanner = _Scanner(_tokenize(lines), marker_name_filter=marker_name_filter)
+    return scanner.scan_root()
+
+
+def _tokenize(lines: Iterable[str]) -> Iterator[str]:
+    """Yield tokens from `lines`, skipping whitespace and line comments."""
+    for line_number, line in enumerate(lines, start=1):
+        tokens = _TOKEN_RE.findall(line)
+        if "/" in line:
+            tokens = _strip_comments(tokens, line_number=line_number)
+
+        if not _INVALID_TOKENS.isdisjoint(tokens):
+            err_msg = f"Unexpected content at line {line_number}: {line.strip()}"
+            raise MissionSqmScanError(err_msg)
+
+        yield from tokens
+
+
+def _strip_comments(tokens: list[str], *, line_number: int) -> list[str]:
+    """Remove line comment token and any tokens after it."""
+    for i, lexeme in enumerate(tokens):
+        if lexeme.startswith("//"):
+            return tokens[:i]
+
+        if lexeme.startswith("/*"):
+            err_msg = f"Block comment at line {line_number} not supported."
+            raise MissionSqmScanError(err_msg)
+
+    return tokens
+
+
+def _string_value(token_text: str) -> str:
+    """Return value of a quoted string token, as `armaclass` would."""
+    parts = _STRING_LINE_BREAK_RE.split(token_text[1:-1])
+    return "\n".join(p.replace('""', '"') for p in parts)
+
+
+def _guess_expression(token_text: str) -> Any:  # noqa: ANN401
+    """Return value of an unquoted lexeme, as `armaclass` would."""
+    if token_text[:4].lower() == "true":
+        return True
+
+    if token_text[:5].lower() == "false":
+        return False
+
+    if token_text.startswith("0x"):
+        return int(token_text, 16)
+
+    try:
+        return float(token_text) if "." in token_text else int(token_text)
+    except ValueError:
+        return token_text
+
+
+def _is_word(lexeme: str) -> bool:
+    """Check if the lexeme is a name or unquoted value."""
+    return lexeme not in _PUNCTUATION and not lexeme.startswith('"')
+
+
+class _Scanner:
+    """Recursive descent over the class tree, skipping irrelevant subtrees."""
+
+    def __init__(
+        self, tokens: Iterator[str], *, marker_name_filter: Callable[[str], bool]
+    ) -> None:
+        self._tokens = tokens
+        self._marker_name_filter = marker_name_filter
+
+    def scan_root(self) -> DictNode:
+        """Scan top level; return the `Mission` class node."""
+        mission: DictNode | None = None
+        while (lexeme := next(self._tokens, None)) is not None:
+            class_name = self._class_name_or_skip_property(lexeme)
+            if class_name == "Mission":
+                mission = self._scan_class_with_entities()
+            elif class_name is not None:
+                self._skip_class_body()
+
+        if mission is None:
+            err_msg = "No `Mission` class found."
+            raise MissionSqmScanError(err_msg)
+
+        return mission
+
+    def _scan_class_with_entities(self) -> DictNode:
+        """Scan a class body, keeping only its `Entities` child."""
+        node: DictNode = {}
+        while (lexeme := self._next()) != "}":
+            class_name = self._class_name_or_skip_property(lexeme)
+            if class_name == "Entities":
+                node["Entities"] = self._scan_entities()
+            elif class_name is not None:
+                self._skip_class_body()
+
+        self._expect(";")
+        return node
+
+    def _scan_entities(self) -> DictNode:
+        """Scan an `Entities` class body; return kept items by class name."""
+        entities: DictNode = {}
+        while (lexeme := self._next()) != "}":
+            class_name = self._class_name_or_skip_property(lexeme)
+            if class_name is not None:
+                item = self._scan_item()
+                if item is not None:
+                    entities[class_name] = item
+
+        self._expect(";")
+        return entities
+
+    def _scan_item(self) -> DictNode | None:
+        """Scan an entity class body; return pruned node, or `None` if not kept."""
+        item: DictNode = {}
+        while (lexeme := self._next()) != "}":
+            if lexeme == "class":
+                class_name = self._class_header()
+                if class_name == "Entities":
+                    item["Entities"] = self._scan_entities()
+                elif class_name is not None:
+                    self._skip_class_body()
+
+            elif lexeme in _ITEM_FIELDS:
+                item[lexeme] = self._property_value()
+
+            elif _is_word(lexeme):
+                self._property_value(keep=False)
+
+            else:
+                self._unexpected(lexeme)
+
+        self._expect(";")
+        data_type = item.get("dataType")
+        if data_type == "Layer":
+            return {"dataType": data_type, "Entities": item.get("Entities", {})}
+
+        if data_type == "Marker" and self._marker_name_filter(item.get("name", "")):
+            item.pop("Entities", None)
+            return item
+
+        return None
+
+    def _class_name_or_skip_property(self, lexeme: str) -> str | None:
+        """
+        Handle a statement starting with `lexeme`.
+
+        Returns class name if the statement is a class with a body, ready to be
+        scanned or skipped. Otherwise, consumes the statement and returns `None`.
+        """
+        if lexeme == "class":
+            return self._class_header()
+
+        if not _is_word(lexeme):
+            self._unexpected(lexeme)
+
+        if lexeme in {"delete", "import"}:
+            self._word()
+            self._expect(";")
+        else:
+            self._property_value(keep=False)
+
+        return None
+
+    def _class_header(self) -> str | None:
+        """Consume `class` statement header; return name, or `None` if no body."""
+        name = self._word()
+        lexeme = self._next()
+        if lexeme == ":":
+            self._word()
+            lexeme = self._next()
+
+        if lexeme == ";":
+            return None  # extern declaration
+
+        if lexeme != "{":
+            self._unexpected(lexeme)
+
+        return name
+
+    def _property_value(self, *, keep: bool = True) -> Any:  # noqa: ANN401
+        """Consume a property statement after its name; return value if `keep`."""
+        lexeme = self._next()
+        value: Any = None
+        if lexeme == "[]":
+            lexeme = self._next()
+            if lexeme not in {"=", "+="}:
+                self._unexpected(lexeme)
+
+            self._expect("{")
+            if keep:
+                value = self._array()
+            else:
+                self._skip_braces()
+
+        elif lexeme == "=":
+            value = self._scalar(self._next())
+        else:
+            self._unexpected(lexeme)
+
+        self._expect(";")
+        return value
+
+    def _scalar(self, lexeme: str) -> Any:  # noqa: ANN401
+        """Return value of a scalar lexeme."""
+        if lexeme.startswith('"'):
+            return _string_value(lexeme)
+
+        if lexeme in _PUNCTUATION:
+            self._unexpected(lexeme)
+
+        return _guess_expression(lexeme)
+
+    def _array(self) -> list[Any]:
+        """Consume array contents after opening brace; return values."""
+        values: list[Any] = []
+        lexeme = self._next()
+        while lexeme != "}":
+            values.append(self._array() if lexeme == "{" else self._scalar(lexeme))
+            lexeme = self._next()
+            if lexeme == ",":
+                lexeme = self._next()
+            elif lexeme != "}":
+                self._unexpected(lexeme)
+
+        return values
+
+    def _skip_braces(self) -> None:
+        """Consume tokens after an opening brace, up to the matching closing brace."""
+        depth = 1
+        for lexeme in self._tokens:
+            if lexeme == "{":
+                depth += 1
+            elif lexeme == "}":
+                depth -= 1
+                if not depth:
+                    return
+
+        self._unexpected_end()
+
+    def _skip_class_body(self) -> None:
+        """Consume class body after opening brace, and the terminating `;`."""
+        self._skip_braces()
+        self._expect(";")
+
+    def _word(self) -> str:
+        lexeme = self._next()
+        if not _is_word(lexeme):
+            self._unexpected(lexeme)
+
+        return lexeme
+
+    def _expect(self, expected: str) -> None:
+        lexeme = self._next()
+        if lexeme != expected:
+            self._unexpected(lexeme)
+
+    def _next(self) -> str:
+        lexeme = next(self._tokens, None)
+        if lexeme is None:
+            self._unexpected_end()
+
+        return lexeme
+
+    @staticmethod
+    def _unexpected(lexeme: str) -> NoReturn:
+        err_msg = f"Unexpected lexeme: {lexeme!r}."
+        raise MissionSqmScanError(err_msg)
+
+    @staticmethod
+    def _unexpected_end() -> NoReturn:
+        err_msg = "Unexpected end of file."
+        raise MissionSqmScanError(err_msg)
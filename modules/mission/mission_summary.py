@@ -0,0 +1,59 @@
+"""`MissionSummary` class."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Self
+
+import msgspec
+
+from .mission import war_level_points_ratio
+
+if TYPE_CHECKING:
+    from .mission import Mission
+
+
+class MissionSummary(msgspec.Struct, kw_only=True, frozen=True):
+    """
+    Values derived from a `Mission`, without its marker data.
+
+    Precomputed when the mission is stored, for consumers that don't need markers.
+    """
+
+    map_name: str
+    map_display_name: str | None
+    map_url: str | None
+    climate: str
+    exclude: bool
+    airports_count: int
+    waterports_count: int
+    bases_count: int
+    outposts_count: int
+    factories_count: int
+    resources_count: int
+    total_military_zones_count: int
+    towns_count: int | None
+    war_level_points: int | None
+
+    @classmethod
+    def from_mission(cls, mission: Mission) -> Self:
+        """Summarise `mission`."""
+        return cls(
+            map_name=mission.map_name,
+            map_display_name=mission.map_display_name,
+            map_url=mission.map_url,
+            climate=mission.climate,
+            exclude=mission.exclude,
+            airports_count=mission.airports_count,
+            waterports_count=mission.waterports_count,
+            bases_count=mission.bases_count,
+            outposts_count=mission.outposts_count,
+            factories_count=mission.factories_count,
+            resources_count=mission.resources_count,
+            total_military_zones_count=mission.total_military_zones_count,
+            towns_count=mission.towns_count,
+            war_level_points=mission.war_level_points,
+        )
+
+    def war_level_points_ratio(self, max_value: int) -> float | None:
+        """Fraction of `max_value`."""
+        return war_level_points_ratio(self.war_level_points, max_value)
@@ -0,0 +1,117 @@
+"""`MissionTable` class."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Self
+
+import numpy as np
+import numpy.typing as npt
+from attrs import define
+
+from .war_level_points import (
+    COUNT_COLUMNS,
+    WAR_LEVEL_POINTS_WEIGHTS,
+    ranks,
+    ratios_of_max,
+    scores,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .mission_summary import MissionSummary
+
+_MILITARY_ZONES_COLUMNS = slice(0, 6)
+
+
+@define(kw_only=True, frozen=True, eq=False)
+class MissionTable:
+    """
+    Counts of all missions as one matrix, with derived columns computed once.
+
+    Unknown values, e.g. towns count if a mission has no towns, are NaN. Derived
+    values are NaN where they depend on an unknown value.
+    """
+
+    map_names: list[str]
+    map_display_names: list[str | None]
+    map_urls: list[str | None]
+    climates: list[str]
+    counts: npt.NDArray[np.float64]
+    """`(missions, len(COUNT_COLUMNS))` array."""
+    derived: dict[str, npt.NDArray[np.float64]]
+    """Derived columns, by name:
+
+    - `total_military_zones_count`
+    - `war_level_points`; NaN if no towns
+    - `war_level_points_ratio`: fraction of maximum `war_level_points`; NaN if 0
+    - `war_level_points_rank`: 1 is highest; ties ranked in table order
+    - `war_level_points_percentile`: percent of missions with no more points
+    """
+
+    def __len__(self) -> int:
+        """Count missions."""
+        return len(self.map_names)
+
+    @classmethod
+    def from_summaries(cls, summaries: Sequence[MissionSummary]) -> Self:
+        """Construct from mission summaries, in the given order."""
+        counts = np.array(
+            [
+                [
+                    np.nan if (v := getattr(s, col)) is None else v
+                    for col in COUNT_COLUMNS
+                ]
+                for s in summaries
+            ],
+            dtype=np.float64,
+        ).reshape(-1, len(COUNT_COLUMNS))
+        war_level_points = scores(counts, WAR_LEVEL_POINTS_WEIGHTS[np.newaxis])[0]
+        return cls(
+            map_names=[s.map_name for s in summaries],
+            map_display_names=[s.map_display_name for s in summaries],
+            map_urls=[s.map_url for s in summaries],
+            climates=[s.climate for s in summaries],
+            counts=counts,
+            derived={
+                "total_military_zones_count": np.nan_to_num(
+                    counts[:, _MILITARY_ZONES_COLUMNS]
+                ).sum(axis=1),
+                "war_level_points": war_level_points,
+                "war_level_points_ratio": ratios_of_max(war_level_points),
+                "war_level_points_rank": ranks(war_level_points),
+                "war_level_points_percentile": _percentiles(war_level_points),
+            },
+        )
+
+    def column(self, name: str) -> npt.NDArray[np.float64]:
+        """
+        Return count or derived column.
+
+        Raises:
+            KeyError: if no such column.
+
+        """
+        if name in COUNT_COLUMNS:
+            column: npt.NDArray[np.float64] = self.counts[:, COUNT_COLUMNS.index(name)]
+            return column
+
+        return self.derived[name]
+
+    def order_by_rank(self) -> npt.NDArray[np.intp]:
+        """Return row indices in `war_level_points_rank` order."""
+        return np.argsort(self.derived["war_level_points_rank"], kind="stable")
+
+
+def _percentiles(values: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Return percent of known `values` no greater than each; NaN where unknown."""
+    known = np.sort(values[np.isfinite(values)])
+    if not known.size:
+        return np.full(values.shape, np.nan)
+
+    percentiles: npt.NDArray[np.float64] = np.where(
+        np.isfinite(values),
+        100 * np.searchsorted(known, values, side="right") / known.size,
+        np.nan,
+    )
+    return percentiles
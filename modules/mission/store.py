@@ -0,0 +1,195 @@
+"""
+Store `Mission`s in a single MessagePack container, with an offset index.
+
+Missions are appended to `missions.msgpack` as separately-encoded records. The index
+(`missions_index.json`) maps each `map_name` to its latest record, so a single
+mission can be read without decoding the others, and all missions can be read in
+one pass over the file. Superseded records are dropped by `compact()`.
+
+The index also holds a `MissionSummary` of each mission, so summaries can be read
+without touching the store file.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+from typing import TYPE_CHECKING
+
+import msgspec
+
+from .mission import Mission
+from .mission_summary import MissionSummary
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+STORE_FILENAME = "missions.msgpack"
+INDEX_FILENAME = "missions_index.json"
+STORE_VERSION = 3
+"""Incremented when the record format changes; older stores are discarded."""
+
+
+class _Record(msgspec.Struct, kw_only=True):
+    """Location of a record in the store file, and summary of its mission."""
+
+    offset: int
+    length: int
+    summary: MissionSummary
+
+
+class _Index(msgspec.Struct):
+    version: int
+    records: dict[str, _Record]
+    """By `map_name`."""
+
+
+class MissionStore:
+    """Missions stored in a directory, by `map_name`."""
+
+    def __init__(self, dir_: Path) -> None:
+        """
+        Open store in `dir_`. Nothing is written until missions are added.
+
+        Store is empty if it doesn't exist, or was written with a different
+        `STORE_VERSION`.
+        """
+        self._store_filepath = dir_ / STORE_FILENAME
+        self._index_filepath = dir_ / INDEX_FILENAME
+        self._records = self._load_records()
+
+    def __contains__(self, map_name: object) -> bool:
+        """Check if mission is stored."""
+        return map_name in self._records
+
+    def __len__(self) -> int:
+        """Count missions."""
+        return len(self._records)
+
+    @property
+    def map_names(self) -> list[str]:
+        """Stored `map_name`s, sorted."""
+        return sorted(self._records)
+
+    def get(self, map_name: str) -> Mission:
+        """
+        Load a single mission.
+
+        Raises:
+            KeyError: if not stored.
+            ValueError: if record can't be decoded.
+
+        """
+        record = self._records[map_name]
+        with self._store_filepath.open("rb") as fp:
+            fp.seek(record.offset)
+            return Mission.from_msgpack(fp.read(record.length))
+
+    def summaries(self) -> list[MissionSummary]:
+        """Return summaries of all missions, sorted by `map_name`."""
+        return [record.summary for _, record in sorted(self._records.items())]
+
+    def load_all(self) -> list[Mission]:
+        """
+        Load all missions, sorted by `map_name`, in one pass over the store.
+
+        Raises:
+            ValueError: if a record can't be decoded.
+
+        """
+        if not self._records:
+            return []
+
+        with (
+            self._store_filepath.open("rb") as fp,
+            mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+        ):
+            return [
+                Mission.from_msgpack(
+                    buffer[record.offset : record.offset + record.length]
+                )
+                for _, record in sorted(self._records.items())
+            ]
+
+    def add(self, missions: Iterable[Mission]) -> None:
+        """Append missions, superseding any stored with the same `map_name`."""
+        self._store_filepath.parent.mkdir(parents=True, exist_ok=True)
+        with self._store_filepath.open("ab") as fp:
+            offset = fp.tell()
+            for mission in missions:
+                data = mission.to_msgpack()
+                fp.write(data)
+                self._records[mission.map_name] = _Record(
+                    offset=offset,
+                    length=len(data),
+                    summary=MissionSummary.from_mission(mission),
+                )
+                offset += len(data)
+
+        self._save_index()
+
+    def remove(self, map_name: str) -> None:
+        """Remove mission, if stored."""
+        if self._records.pop(map_name, None) is not None:
+            self._save_index()
+
+    def compact(self) -> None:
+        """Rewrite store without superseded or removed records."""
+        live_size = sum(r.length for r in self._records.values())
+        if (
+            not self._store_filepath.is_file()
+            or self._store_filepath.stat().st_size == live_size
+        ):
+            return
+
+        temp_filepath = self._store_filepath.with_suffix(".tmp")
+        records = {}
+        with (
+            self._store_filepath.open("rb") as source,
+            temp_filepath.open("wb") as dest,
+        ):
+            for map_name, record in sorted(self._records.items()):
+                source.seek(record.offset)
+                records[map_name] = _Record(
+                    offset=dest.tell(), length=record.length, summary=record.summary
+                )
+                dest.write(source.read(record.length))
+
+        temp_filepath.replace(self._store_filepath)
+        self._records = records
+        self._save_index()
+        log_msg = f"Compacted '{self._store_filepath.name}' to {live_size} bytes."
+        LOGGER.debug(log_msg)
+
+    def _load_records(self) -> dict[str, _Record]:
+        """Load index; empty if missing, stale or inconsistent with store."""
+        if not (self._index_filepath.is_file() and self._store_filepath.is_file()):
+            return {}
+
+        try:
+            index = msgspec.json.decode(self._index_filepath.read_bytes(), type=_Index)
+        except msgspec.DecodeError as err:
+            log_msg = f"Ignoring invalid '{self._index_filepath.name}': {err}."
+            LOGGER.warning(log_msg)
+            return {}
+
+        store_size = self._store_filepath.stat().st_size
+        if index.version != STORE_VERSION or any(
+            r.offset + r.length > store_size for r in index.records.values()
+        ):
+            log_msg = f"Ignoring stale or inconsistent '{self._index_filepath.name}'."
+            LOGGER.warning(log_msg)
+            return {}
+
+        return index.records
+
+    def _save_index(self) -> None:
+        """Save index, replacing any previous one atomically."""
+        index = _Index(version=STORE_VERSION, records=self._records)
+        temp_filepath = self._index_filepath.with_suffix(".tmp")
+        temp_filepath.write_bytes(
+            msgspec.json.format(msgspec.json.encode(index), indent=4)
+        )
+        temp_filepath.replace(self._index_filepath)
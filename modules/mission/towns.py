@@ -3,20 +3,53 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
 
+import msgspec
+import numpy as np
 from arma3_offline_map_lib.geojson import (
     geojson_gz_files_in_dir,
     load_features_from_file,
 )
 
 if TYPE_CHECKING:
-    from pathlib import Path
-
+    import numpy.typing as npt
     from arma3_offline_map_lib.geojson import Feature
 
 
 LOGGER = logging.getLogger(__name__)
+_TOWN_FILENAME_STEMS = ("namecitycapital", "namecity", "namevillage")
+
+
+class TownTable(msgspec.Struct, frozen=True):
+    """Town names and positions, stored as columns."""
+
+    names: list[str]
+    xy: bytes
+    """Positions as native float64 `x, y` pairs; see `positions`."""
+
+    @property
+    def positions(self) -> npt.NDArray[np.float64]:
+        """Positions as `(n, 2)` array of `x, y`."""
+        return np.frombuffer(self.xy, dtype=np.float64).reshape(-1, 2)
+
+    @classmethod
+    def from_features(cls, features: list[Feature]) -> Self:
+        """Construct from GeoJSON `Point` features with a `name` property."""
+        xy = np.array(
+            [f.geometry.coordinates[:2] for f in features], dtype=np.float64
+        ).reshape(-1, 2)
+        return cls(names=[f.properties["name"] for f in features], xy=xy.tobytes())
+
+
+class _TownTableCache(msgspec.Struct):
+    """Cached `TownTable`, with the source file stamps it was built from."""
+
+    sources: dict[str, tuple[int, int]]
+    """`(mtime_ns, size)` of each source file, by filename."""
+    towns: TownTable
 
 
 def load_towns_from_dir(path: Path) -> list[Feature]:
@@ -32,14 +65,66 @@ def load_towns_from_dir(path: Path) -> list[Feature]:
     """
     towns: list[Feature] = []
 
-    filepaths = [
-        fp
-        for fp in geojson_gz_files_in_dir(path)
-        if fp.stem.removesuffix(".geojson")
-        in ("namecitycapital", "namecity", "namevillage")
-    ]
-    for fp in filepaths:
+    for fp in _town_filepaths(path):
         locations = load_features_from_file(fp)
         towns.extend(locations)
 
     return towns
+
+
+def load_town_table(path: Path, *, cache_filepath: Path | None = None) -> TownTable:
+    """
+    Load town locations from files in a directory, as a `TownTable`.
+
+    Directory must exist.
+
+    Arguments:
+        path: Directory containing `{FILENAME_STEM}.geojson.gz` files.
+        cache_filepath: If given, the table is read from this file if it's still
+            current, i.e. source files are unchanged; otherwise it's rebuilt from
+            source files and written to this file.
+
+    """
+    sources = {
+        fp.name: (fp.stat().st_mtime_ns, fp.stat().st_size)
+        for fp in _town_filepaths(path)
+    }
+    if cache_filepath is not None and cache_filepath.is_file():
+        try:
+            cache = msgspec.msgpack.decode(
+                cache_filepath.read_bytes(), type=_TownTableCache
+            )
+        except msgspec.DecodeError:
+            log_msg = f"Ignored invalid towns cache `{cache_filepath}`."
+            LOGGER.warning(log_msg)
+        else:
+            if cache.sources == sources:
+                log_msg = f"Loaded towns from cache `{cache_filepath}`."
+                LOGGER.debug(log_msg)
+                return cache.towns
+
+    towns = TownTable.from_features(load_towns_from_dir(path))
+    if cache_filepath is not None:
+        cache_filepath.parent.mkdir(parents=True, exist_ok=True)
+        # Written atomically, as worker processes may load the same map's towns
+        with tempfile.NamedTemporaryFile(
+            dir=cache_filepath.parent, suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_file.write(
+                msgspec.msgpack.encode(_TownTableCache(sources=sources, towns=towns))
+            )
+
+        Path(temp_file.name).replace(cache_filepath)
+        log_msg = f"Saved towns to cache `{cache_filepath}`."
+        LOGGER.debug(log_msg)
+
+    return towns
+
+
+def _town_filepaths(path: Path) -> list[Path]:
+    """Return relevant GeoJSON files in directory."""
+    return sorted(
+        fp
+        for fp in geojson_gz_files_in_dir(path)
+        if fp.stem.removesuffix(".geojson") in _TOWN_FILENAME_STEMS
+    )
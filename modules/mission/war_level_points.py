@@ -0,0 +1,146 @@
+"""
+Score missions by War Level points, under one or many weightings.
+
+A weighting is a vector of points per item of each of `COUNT_COLUMNS`. Missions are
+scored under all weightings at once, as a single matrix product.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+from attrs import define
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .mission_table import MissionTable
+
+COUNT_COLUMNS = (
+    "airports_count",
+    "bases_count",
+    "waterports_count",
+    "outposts_count",
+    "resources_count",
+    "factories_count",
+    "towns_count",
+)
+"""Counts that War Level points are derived from, in weight vector order."""
+WAR_LEVEL_POINTS_WEIGHTS = np.array([8, 6, 4, 2, 2, 2, 1], dtype=np.float64)
+"""In-game War Level points per item of each of `COUNT_COLUMNS`."""
+
+
+@define(kw_only=True, frozen=True, eq=False)
+class WeightingResults:
+    """Scores of missions under each of several weightings."""
+
+    map_names: list[str]
+    weights: npt.NDArray[np.float64]
+    """`(weightings, len(COUNT_COLUMNS))` array."""
+    scores: npt.NDArray[np.float64]
+    """`(weightings, missions)` array; NaN if a count is unknown."""
+    ratios: npt.NDArray[np.float64]
+    """Scores as fraction of each weighting's maximum; NaN if unknown or <= 0."""
+    ranks: npt.NDArray[np.float64]
+    """1 is highest under each weighting; see `ranks()`."""
+    rank_changes: npt.NDArray[np.float64]
+    """Places moved up (positive) or down, compared to in-game weighting."""
+
+
+def scores(
+    counts: npt.NDArray[np.float64], weights: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """
+    Score missions under each weighting.
+
+    Arguments:
+        counts: `(missions, len(COUNT_COLUMNS))` array.
+        weights: `(weightings, len(COUNT_COLUMNS))` array.
+
+    Returns:
+        `(weightings, missions)` array.
+
+    Raises:
+        ValueError: if array shapes don't match `COUNT_COLUMNS`.
+
+    """
+    for name, array in {"counts": counts, "weights": weights}.items():
+        if array.ndim != 2 or array.shape[1] != len(COUNT_COLUMNS):  # noqa: PLR2004
+            err_msg = (
+                f"`{name}` must have shape (n, {len(COUNT_COLUMNS)}), "
+                f"got {array.shape}."
+            )
+            raise ValueError(err_msg)
+
+    scores_: npt.NDArray[np.float64] = weights @ counts.T
+    return scores_
+
+
+def war_level_points(counts: Sequence[int | None]) -> int | None:
+    """
+    Return in-game War Level points for one mission's `COUNT_COLUMNS` values.
+
+    `None` if towns count is unknown or 0.
+    """
+    if not counts[-1]:
+        return None
+
+    counts_ = np.array([counts], dtype=np.float64)
+    return int(scores(counts_, WAR_LEVEL_POINTS_WEIGHTS[np.newaxis])[0, 0])
+
+
+def evaluate_weightings(
+    table: MissionTable, weights: npt.NDArray[np.float64]
+) -> WeightingResults:
+    """
+    Score, rank and compare all missions in `table` under each weighting.
+
+    Raises:
+        ValueError: if `weights` isn't a `(weightings, len(COUNT_COLUMNS))` array.
+
+    """
+    all_scores = scores(table.counts, np.vstack([WAR_LEVEL_POINTS_WEIGHTS, weights]))
+    all_ranks = ranks(all_scores)
+    return WeightingResults(
+        map_names=table.map_names,
+        weights=weights,
+        scores=all_scores[1:],
+        ratios=ratios_of_max(all_scores[1:]),
+        ranks=all_ranks[1:],
+        rank_changes=all_ranks[0] - all_ranks[1:],
+    )
+
+
+def ranks(scores: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """
+    Rank `scores` along last axis; 1 is highest.
+
+    Ties are ranked in index order. NaN scores rank last.
+    """
+    order = np.argsort(-np.nan_to_num(scores, nan=-np.inf), axis=-1, kind="stable")
+    ranks_ = np.empty(scores.shape, dtype=np.float64)
+    np.put_along_axis(
+        ranks_,
+        order,
+        np.broadcast_to(np.arange(1, scores.shape[-1] + 1), scores.shape),
+        axis=-1,
+    )
+    return ranks_
+
+
+def ratios_of_max(scores: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Return `scores` as fraction of maximum along last axis; NaN if unknown/<= 0."""
+    if not scores.shape[-1]:
+        return scores.copy()
+
+    max_ = np.max(
+        np.where(np.isfinite(scores), scores, -np.inf), axis=-1, keepdims=True
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratios: npt.NDArray[np.float64] = np.where(
+            (scores > 0) & (max_ > 0), scores / max_, np.nan
+        )
+
+    return ratios
@@ -0,0 +1,80 @@
+"""Encode RGBA images as PNG, with `zlib` and NumPy only."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import numpy.typing as npt
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_BIT_DEPTH = 8
+_COLOR_TYPE_RGBA = 6
+_FILTER_SUB = 1
+_CHANNELS = 4
+_DIMENSIONS = 3
+
+
+def encode_png(rgba: npt.NDArray[np.uint8], *, compression: int = 6) -> bytes:
+    """
+    Encode image as PNG.
+
+    Each row is filtered with the PNG "Sub" filter (difference from the pixel to the
+    left), which is vectorized and compresses flat areas well.
+
+    Arguments:
+        rgba: `(height, width, 4)` array.
+        compression: zlib compression level, 0-9.
+
+    Raises:
+        ValueError: if `rgba` isn't an RGBA image.
+
+    """
+    if rgba.ndim != _DIMENSIONS or rgba.shape[2] != _CHANNELS or rgba.dtype != np.uint8:
+        err_msg = (
+            f"Expected (height, width, 4) uint8 array, not {rgba.shape} {rgba.dtype}."
+        )
+        raise ValueError(err_msg)
+
+    height, width, _ = rgba.shape
+    rows = rgba.reshape(height, width * _CHANNELS)
+    filtered = np.empty((height, 1 + width * _CHANNELS), dtype=np.uint8)
+    filtered[:, 0] = _FILTER_SUB
+    filtered[:, 1 : 1 + _CHANNELS] = rows[:, :_CHANNELS]
+    np.subtract(
+        rows[:, _CHANNELS:], rows[:, :-_CHANNELS], out=filtered[:, 1 + _CHANNELS :]
+    )
+    header = struct.pack(
+        ">IIBBBBB", width, height, _BIT_DEPTH, _COLOR_TYPE_RGBA, 0, 0, 0
+    )
+    return b"".join(
+        (
+            _SIGNATURE,
+            _chunk(b"IHDR", header),
+            _chunk(b"IDAT", zlib.compress(filtered.tobytes(), compression)),
+            _chunk(b"IEND", b""),
+        )
+    )
+
+
+def write_png(filepath: Path, rgba: npt.NDArray[np.uint8]) -> None:
+    """Encode image as PNG and write to `filepath`."""
+    filepath.write_bytes(encode_png(rgba))
+
+
+def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Return PNG chunk: length, type, data and CRC of type and data."""
+    return b"".join(
+        (
+            struct.pack(">I", len(data)),
+            chunk_type,
+            data,
+            struct.pack(">I", zlib.crc32(chunk_type + data)),
+        )
+    )
@@ -0,0 +1,336 @@
+"""
+Time named stages of mission analysis, and optionally profile them with cProfile.
+
+Stages are marked in code with `stage()`, which does nothing unless a `Profiler` is
+active for the current mission (see `Profiler.mission()`). Stages may be nested;
+each is measured both including and excluding its nested stages.
+
+Optionally, peak memory of each stage is also measured with `tracemalloc`, and the
+process's maximum resident set size (RSS) is recorded. The latter is a high-water
+mark over the lifetime of the process, so it isn't attributed to stages or missions.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+import msgspec
+from attrs import define
+
+if sys.platform != "win32":
+    import resource
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+STAGE_SEPARATOR = "/"
+_PEAK_TOLERANCE_BYTES = 2**16
+
+
+class StageMeasurement(msgspec.Struct, kw_only=True, frozen=True):
+    """Measurement of a stage for a mission."""
+
+    map_name: str
+    stage: str
+    """Path of nested stage names, e.g. `render/dem_load`."""
+    seconds: float
+    """Wall time, including nested stages."""
+    self_seconds: float
+    """Wall time, excluding nested stages."""
+    peak_traced_bytes: int | None = None
+    """Peak memory traced by `tracemalloc` during stage (including nested stages),
+    above that at start; `None` if memory not measured."""
+    peak_stage: str | None = None
+    """Most nested stage in which `peak_traced_bytes` was reached."""
+    max_rss_bytes: int | None = None
+    """Maximum RSS of the process over its lifetime so far (including any earlier
+    missions it analysed), at end of stage; `None` if memory not measured or not
+    available on platform."""
+
+
+class StageSummary(msgspec.Struct, kw_only=True, frozen=True):
+    """Measurements of a stage, over all missions."""
+
+    stage: str
+    count: int
+    total_seconds: float
+    mean_seconds: float
+    max_seconds: float
+    max_map_name: str
+    """Mission with `max_seconds`."""
+    max_peak_traced_bytes: int | None = None
+
+
+class MissionMemory(msgspec.Struct, kw_only=True, frozen=True):
+    """Peak memory of a mission, over all its stages."""
+
+    map_name: str
+    peak_traced_bytes: int
+    """Maximum `peak_traced_bytes` of outermost stages."""
+    peak_stage: str
+    """Most nested stage in which `peak_traced_bytes` was reached."""
+
+
+class _Report(msgspec.Struct, kw_only=True, frozen=True):
+    stages: list[StageSummary]
+    missions_by_memory: list[MissionMemory]
+    max_rss_bytes: int | None
+    measurements: list[StageMeasurement]
+
+
+@define(kw_only=True)
+class _Frame:
+    """Stage in progress, or mission root if `path` is empty."""
+
+    profiler: Profiler
+    map_name: str
+    path: str = ""
+    cprofile: cProfile.Profile | None = None
+    nested_seconds: float = 0
+    start_traced_bytes: int = 0
+    peak_traced_bytes: int = 0
+    """Absolute peak of traced memory, so far."""
+    peak_stage: str = ""
+    """Most nested stage in which `peak_traced_bytes` was reached."""
+
+    def update_peak(self, peak_traced_bytes: int, stage: str) -> None:
+        """
+        Update peak, if `peak_traced_bytes` (reached in `stage`) exceeds it.
+
+        `stage` is only credited with a peak that exceeds the current one by more
+        than `_PEAK_TOLERANCE_BYTES`, so small allocations after a nested stage
+        (e.g. of its result) don't mask the nested stage's peak.
+        """
+        if peak_traced_bytes > self.peak_traced_bytes + _PEAK_TOLERANCE_BYTES:
+            self.peak_stage = stage
+
+        self.peak_traced_bytes = max(self.peak_traced_bytes, peak_traced_bytes)
+
+
+_current_frame: ContextVar[_Frame | None] = ContextVar("_current_frame", default=None)
+
+
+class Profiler:
+    """Collector of stage measurements."""
+
+    def __init__(
+        self, *, cprofile_dir: Path | None = None, memory: bool = False
+    ) -> None:
+        """
+        Create empty collector.
+
+        Arguments:
+            cprofile_dir: If given, each stage is also profiled with cProfile, and
+                stats dumped here as `<map name>.<stage path>.prof`. Time spent in
+                nested stages is excluded from each dump.
+            memory: Also measure peak memory of each stage. Starts `tracemalloc`,
+                which slows execution and adds memory overhead.
+
+        """
+        self.measurements: list[StageMeasurement] = []
+        self.cprofile_dir = cprofile_dir
+        if cprofile_dir:
+            cprofile_dir.mkdir(parents=True, exist_ok=True)
+
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def mission(self, map_name: str) -> Iterator[None]:
+        """Activate for stages of `map_name` in the current context."""
+        token = _current_frame.set(_Frame(profiler=self, map_name=map_name))
+        try:
+            yield
+        finally:
+            _current_frame.reset(token)
+
+    def extend(self, measurements: Iterable[StageMeasurement]) -> None:
+        """Add measurements made elsewhere, e.g. by a worker process."""
+        self.measurements.extend(measurements)
+
+    def summaries(self) -> list[StageSummary]:
+        """Summarise measurements by stage, in descending order of total time."""
+        by_stage: dict[str, list[StageMeasurement]] = {}
+        for measurement in self.measurements:
+            by_stage.setdefault(measurement.stage, []).append(measurement)
+
+        summaries = []
+        for stage_, measurements in by_stage.items():
+            total_seconds = sum(m.seconds for m in measurements)
+            slowest = max(measurements, key=lambda m: m.seconds)
+            peak_traced_bytes = [
+                m.peak_traced_bytes
+                for m in measurements
+                if m.peak_traced_bytes is not None
+            ]
+            summaries.append(
+                StageSummary(
+                    stage=stage_,
+                    count=len(measurements),
+                    total_seconds=total_seconds,
+                    mean_seconds=total_seconds / len(measurements),
+                    max_seconds=slowest.seconds,
+                    max_map_name=slowest.map_name,
+                    max_peak_traced_bytes=max(peak_traced_bytes, default=None),
+                )
+            )
+
+        return sorted(summaries, key=lambda s: s.total_seconds, reverse=True)
+
+    def missions_by_memory(self) -> list[MissionMemory]:
+        """Return peak memory of each mission, in descending order."""
+        by_map_name: dict[str, list[StageMeasurement]] = {}
+        for measurement in self.measurements:
+            if (
+                measurement.peak_traced_bytes is not None
+                and STAGE_SEPARATOR not in measurement.stage
+            ):
+                by_map_name.setdefault(measurement.map_name, []).append(measurement)
+
+        missions = []
+        for map_name, measurements in by_map_name.items():
+            peak = max(measurements, key=lambda m: m.peak_traced_bytes or 0)
+            missions.append(
+                MissionMemory(
+                    map_name=map_name,
+                    peak_traced_bytes=peak.peak_traced_bytes or 0,
+                    peak_stage=peak.peak_stage or peak.stage,
+                )
+            )
+
+        return sorted(missions, key=lambda m: m.peak_traced_bytes, reverse=True)
+
+    def max_rss_bytes(self) -> int | None:
+        """
+        Return maximum RSS of any process measured, over its lifetime.
+
+        `None` if memory not measured or RSS not available on platform.
+        """
+        return max(
+            (m.max_rss_bytes for m in self.measurements if m.max_rss_bytes is not None),
+            default=None,
+        )
+
+    def export(self, filepath: Path) -> None:
+        """
+        Export measurements.
+
+        As `.folded`, one collapsed stack per measurement with self time in
+        microseconds (e.g. for `flamegraph.pl`); otherwise as JSON, with stage
+        summaries, missions ranked by peak traced memory, and maximum RSS of any
+        process.
+        """
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        if filepath.suffix == ".folded":
+            filepath.write_text(
+                "".join(
+                    f"{m.map_name};{m.stage.replace(STAGE_SEPARATOR, ';')} "
+                    f"{round(m.self_seconds * 1e6)}\n"
+                    for m in self.measurements
+                ),
+                encoding="utf-8",
+            )
+        else:
+            report = _Report(
+                stages=self.summaries(),
+                missions_by_memory=self.missions_by_memory(),
+                max_rss_bytes=self.max_rss_bytes(),
+                measurements=self.measurements,
+            )
+            filepath.write_bytes(
+                msgspec.json.format(msgspec.json.encode(report), indent=4)
+            )
+
+        log_msg = f"Exported {len(self.measurements)} stage timings to '{filepath}'."
+        LOGGER.info(log_msg)
+
+
+def profiled(profiler: Profiler | None, map_name: str) -> AbstractContextManager[None]:
+    """Return `profiler.mission(map_name)`, or if `profiler` is `None` a no-op."""
+    return nullcontext() if profiler is None else profiler.mission(map_name)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Measure the enclosed code as stage `name`, if a `Profiler` is active."""
+    parent = _current_frame.get()
+    if parent is None:
+        yield
+        return
+
+    profiler = parent.profiler
+    frame = _Frame(
+        profiler=profiler,
+        map_name=parent.map_name,
+        path=f"{parent.path}{STAGE_SEPARATOR}{name}" if parent.path else name,
+        cprofile=None if profiler.cprofile_dir is None else cProfile.Profile(),
+    )
+    token = _current_frame.set(frame)
+    if parent.cprofile:
+        parent.cprofile.disable()
+
+    if profiler.memory:
+        frame.start_traced_bytes, parent_peak = tracemalloc.get_traced_memory()
+        parent.update_peak(parent_peak, parent.path)
+        frame.peak_traced_bytes = frame.start_traced_bytes
+        tracemalloc.reset_peak()
+
+    start_time = time.perf_counter()
+    if frame.cprofile:
+        frame.cprofile.enable()
+
+    try:
+        yield
+    finally:
+        if frame.cprofile:
+            frame.cprofile.disable()
+
+        seconds = time.perf_counter() - start_time
+        peak_traced_bytes = peak_stage = max_rss_bytes = None
+        if profiler.memory:
+            # Peak isn't reset at end of a nested stage, so is only exceeded if
+            # reached in this stage itself
+            frame.update_peak(tracemalloc.get_traced_memory()[1], frame.path)
+            parent.update_peak(frame.peak_traced_bytes, frame.peak_stage)
+            peak_traced_bytes = frame.peak_traced_bytes - frame.start_traced_bytes
+            peak_stage = frame.peak_stage
+            max_rss_bytes = _max_rss_bytes()
+
+        _current_frame.reset(token)
+        parent.nested_seconds += seconds
+        if parent.cprofile:
+            parent.cprofile.enable()
+
+        profiler.measurements.append(
+            StageMeasurement(
+                map_name=frame.map_name,
+                stage=frame.path,
+                seconds=seconds,
+                self_seconds=seconds - frame.nested_seconds,
+                peak_traced_bytes=peak_traced_bytes,
+                peak_stage=peak_stage,
+                max_rss_bytes=max_rss_bytes,
+            )
+        )
+        if frame.cprofile and profiler.cprofile_dir:
+            filename = f"{frame.map_name}.{frame.path.replace(STAGE_SEPARATOR, '.')}"
+            frame.cprofile.dump_stats(profiler.cprofile_dir / f"{filename}.prof")
+
+
+def _max_rss_bytes() -> int | None:
+    """Return maximum RSS of this process so far; `None` if not available."""
+    if sys.platform == "win32":
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # KiB on Linux
@@ -0,0 +1,58 @@
+"""Raster (2D array) operations, e.g. for map layers."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+
+def reduction_factor(shape: tuple[int, ...], size_px: int) -> int:
+    """Return smallest block size that reduces `shape` to at most `size_px` square."""
+    return max(1, math.ceil(max(shape) / size_px))
+
+
+def block_reduce(
+    array: npt.NDArray[np.generic],
+    factor: int,
+    *,
+    ufunc: np.ufunc = np.add,
+    dtype: npt.DTypeLike | None = None,
+) -> npt.NDArray[np.generic]:
+    """
+    Reduce `array` over non-overlapping `factor` x `factor` blocks with `ufunc`.
+
+    Vectorized with `ufunc.reduceat`, without padding or copying `array`. Blocks at
+    the bottom and right edges are smaller if `array` isn't a multiple of `factor`.
+
+    Arguments:
+        array: 2D array.
+        factor: Block size.
+        ufunc: Binary ufunc to reduce with, e.g. `np.add`, `np.maximum`.
+        dtype: Accumulator and output dtype.
+
+    Returns:
+        2D array, with shape `ceil(array.shape / factor)`.
+
+    """
+    rows = np.arange(0, array.shape[0], factor)
+    cols = np.arange(0, array.shape[1], factor)
+    reduced_rows = ufunc.reduceat(array, rows, axis=0, dtype=dtype)
+    return ufunc.reduceat(reduced_rows, cols, axis=1, dtype=dtype)
+
+
+def block_mean(array: npt.NDArray[np.generic], factor: int) -> npt.NDArray[np.float32]:
+    """
+    Return mean of `array` over non-overlapping `factor` x `factor` blocks.
+
+    e.g. for a boolean mask, the fraction of each block that is `True`.
+    """
+    sums = block_reduce(array, factor, dtype=np.float32)
+    row_sizes = np.diff(np.arange(0, array.shape[0], factor), append=array.shape[0])
+    col_sizes = np.diff(np.arange(0, array.shape[1], factor), append=array.shape[1])
+    means: npt.NDArray[np.float32] = sums / np.outer(row_sizes, col_sizes)
+    return means.astype(np.float32)
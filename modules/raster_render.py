@@ -0,0 +1,352 @@
+"""
+Render map images directly into a NumPy RGBA buffer, without a matplotlib figure.
+
+The layout reproduces that of a default matplotlib figure with an equal-aspect
+axes: water as a monotone layer, each marker series as glyphs in the next colour of
+the default property cycle, and the axes frame, ticks and tick labels. Marker glyphs
+and tick labels are rasterised once per process with matplotlib, as sprites, and
+composited with NumPy.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+from attrs import define
+from matplotlib import colormaps, rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator, ScalarFormatter
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+_DPI = 100
+"""Matplotlib default, in pixels per inch."""
+_PX_PER_PT = _DPI / 72
+_MAX_TICK_BINS = 9
+_TICK_STEPS = (1, 2, 2.5, 5, 10)
+"""As matplotlib's `AutoLocator`."""
+_SPRITE_SIZE_PX = 24
+"""Width and height of marker sprites; even, so sprites centre on a pixel corner."""
+_TEXT_SPRITE_SIZE_PX = (120, 40)
+
+
+@define(kw_only=True, frozen=True)
+class _Sprite:
+    """Pre-rasterised image, placed by its anchor point."""
+
+    rgb: npt.NDArray[np.float32]
+    alpha: npt.NDArray[np.float32]
+    anchor: tuple[float, float]
+    """`x, y` position in sprite, in px from top left, to place at target."""
+
+
+@define(kw_only=True, frozen=True)
+class _Box:
+    """Rectangle of image, in px from top left."""
+
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+
+@define(kw_only=True, frozen=True)
+class _Axes:
+    """Data limits and their box in the image."""
+
+    xlim: tuple[float, float]
+    ylim: tuple[float, float]
+    box: _Box
+
+    def to_px(
+        self, x: npt.NDArray[np.float64], y: npt.NDArray[np.float64]
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """Transform data coordinates to px from top left of image."""
+        box = self.box
+        px = box.left + (x - self.xlim[0]) / (self.xlim[1] - self.xlim[0]) * (
+            box.right - box.left
+        )
+        py = box.bottom - (y - self.ylim[0]) / (self.ylim[1] - self.ylim[0]) * (
+            box.bottom - box.top
+        )
+        return px, py
+
+
+def render_map(
+    *,
+    size_px: int,
+    markers: Mapping[str, npt.NDArray[np.float64]],
+    water: npt.NDArray[np.float32] | None = None,
+    extents: tuple[float, float] | None = None,
+) -> npt.NDArray[np.uint8]:
+    """
+    Render map.
+
+    Arguments:
+        size_px: Width and height of image.
+        markers: Positions (`(n, 2)` arrays of `x, y`) of each series, by marker
+            character, in plotting order.
+        water: Opacity of water, with row 0 at the top; rendered over `extents`.
+        extents: Map width and height, in m. Required with `water`.
+
+    Returns:
+        `(size_px, size_px, 4)` RGBA image.
+
+    """
+    image = np.ones((size_px, size_px, 3), dtype=np.float32)
+    axes = _layout(size_px=size_px, markers=markers, extents=extents)
+    box = axes.box
+    plot_area = image[box.top : box.bottom, box.left : box.right]
+    if water is not None and extents is not None:
+        _composite_water(plot_area, water=water, extents=extents, axes=axes)
+
+    for color_index, (marker_char, positions) in enumerate(markers.items()):
+        sprite = _marker_sprite(marker_char, color_index)
+        for px, py in zip(*axes.to_px(positions[:, 0], positions[:, 1]), strict=True):
+            _composite(plot_area, sprite, x=px - box.left, y=py - box.top)
+
+    _draw_frame_and_ticks(image, axes=axes)
+    rgba = np.empty((size_px, size_px, 4), dtype=np.uint8)
+    rgba[..., :3] = np.rint(image * 255)
+    rgba[..., 3] = 255
+    return rgba
+
+
+def _layout(
+    *,
+    size_px: int,
+    markers: Mapping[str, npt.NDArray[np.float64]],
+    extents: tuple[float, float] | None,
+) -> _Axes:
+    """
+    Return data limits and axes box, as matplotlib autoscales them.
+
+    Limits cover all markers and the map, with margins except where they would
+    cross a map edge (a "sticky edge"). The box is the default subplot area, shrunk
+    about its centre to give equal aspect.
+    """
+    points = [p for p in markers.values() if len(p)]
+    stickies: list[list[float]] = [[], []]
+    if extents:
+        points.append(np.array([[0, 0], extents], dtype=np.float64))
+        stickies = [[0, extents[0]], [0, extents[1]]]
+
+    margins = rcParams["axes.xmargin"], rcParams["axes.ymargin"]
+    xlim, ylim = (
+        _autoscale(
+            np.concatenate(points)[:, axis] if points else np.array([0.0, 1.0]),
+            stickies=stickies[axis],
+            margin=margins[axis],
+        )
+        for axis in range(2)
+    )
+    left = rcParams["figure.subplot.left"] * size_px
+    right = rcParams["figure.subplot.right"] * size_px
+    top = (1 - rcParams["figure.subplot.top"]) * size_px
+    bottom = (1 - rcParams["figure.subplot.bottom"]) * size_px
+    data_ratio = (ylim[1] - ylim[0]) / (xlim[1] - xlim[0])
+    width = min(right - left, (bottom - top) / data_ratio)
+    height = width * data_ratio
+    centre_x, centre_y = (left + right) / 2, (top + bottom) / 2
+    return _Axes(
+        xlim=xlim,
+        ylim=ylim,
+        box=_Box(
+            left=round(centre_x - width / 2),
+            top=round(centre_y - height / 2),
+            right=round(centre_x + width / 2),
+            bottom=round(centre_y + height / 2),
+        ),
+    )
+
+
+def _autoscale(
+    values: npt.NDArray[np.float64], *, stickies: Sequence[float], margin: float
+) -> tuple[float, float]:
+    """Return view limits of `values`, as matplotlib's `autoscale_view()`."""
+    low, high = MaxNLocator().nonsingular(values.min(), values.max())
+    low_bound = max((s for s in stickies if s <= low), default=None)
+    high_bound = min((s for s in stickies if s >= high), default=None)
+    delta = (high - low) * margin
+    low, high = low - delta, high + delta
+    if low_bound is not None:
+        low = max(low, low_bound)
+
+    if high_bound is not None:
+        high = min(high, high_bound)
+
+    return low, high
+
+
+def _composite_water(
+    plot_area: npt.NDArray[np.float32],
+    *,
+    water: npt.NDArray[np.float32],
+    extents: tuple[float, float],
+    axes: _Axes,
+) -> None:
+    """Blend water colour into `plot_area`, resampling `water` to nearest pixel."""
+    box = axes.box
+    (left, right), (bottom, top) = axes.to_px(
+        np.array([0, extents[0]]), np.array([0, extents[1]])
+    )
+    col_centres = np.arange(box.left, box.right) + 0.5
+    row_centres = np.arange(box.top, box.bottom) + 0.5
+    col_indices = np.floor(
+        (col_centres - left) / (right - left) * water.shape[1]
+    ).astype(int)
+    row_indices = np.floor(
+        (row_centres - top) / (bottom - top) * water.shape[0]
+    ).astype(int)
+    cols_in_map = np.flatnonzero((col_indices >= 0) & (col_indices < water.shape[1]))
+    rows_in_map = np.flatnonzero((row_indices >= 0) & (row_indices < water.shape[0]))
+    if not len(cols_in_map) or not len(rows_in_map):
+        return
+
+    # Indices increase monotonically, so pixels over the map are a contiguous block
+    rows = slice(rows_in_map[0], rows_in_map[-1] + 1)
+    cols = slice(cols_in_map[0], cols_in_map[-1] + 1)
+    alpha = water.take(row_indices[rows], axis=0).take(col_indices[cols], axis=1)
+    target = plot_area[rows, cols]
+    target += alpha[..., None] * (_water_color() - target)
+
+
+def _composite(
+    image: npt.NDArray[np.float32], sprite: _Sprite, *, x: float, y: float
+) -> None:
+    """Blend `sprite` into `image` with its anchor at `x, y`, clipped to `image`."""
+    left = round(x - sprite.anchor[0])
+    top = round(y - sprite.anchor[1])
+    height, width = sprite.alpha.shape
+    clipped_left, clipped_top = max(left, 0), max(top, 0)
+    clipped_right = min(left + width, image.shape[1])
+    clipped_bottom = min(top + height, image.shape[0])
+    if clipped_left >= clipped_right or clipped_top >= clipped_bottom:
+        return
+
+    source = (
+        slice(clipped_top - top, clipped_bottom - top),
+        slice(clipped_left - left, clipped_right - left),
+    )
+    target = image[clipped_top:clipped_bottom, clipped_left:clipped_right]
+    target += sprite.alpha[source][..., None] * (sprite.rgb[source] - target)
+
+
+def _draw_frame_and_ticks(image: npt.NDArray[np.float32], *, axes: _Axes) -> None:
+    """Draw axes frame, and ticks and tick labels on bottom and left."""
+    box = axes.box
+    image[box.top, box.left : box.right + 1] = 0
+    image[box.bottom, box.left : box.right + 1] = 0
+    image[box.top : box.bottom + 1, box.left] = 0
+    image[box.top : box.bottom + 1, box.right] = 0
+
+    tick_length = round(rcParams["xtick.major.size"] * _PX_PER_PT)
+    label_offset = (
+        rcParams["xtick.major.size"] + rcParams["xtick.major.pad"]
+    ) * _PX_PER_PT
+    x_ticks, x_labels = _ticks(
+        axes.xlim, bins=_tick_bins(box.right - box.left, label_height_factor=3)
+    )
+    for tick, label in zip(
+        axes.to_px(x_ticks, np.zeros_like(x_ticks))[0], x_labels, strict=True
+    ):
+        column = round(tick)
+        image[box.bottom : box.bottom + tick_length + 1, column] = 0
+        _composite(
+            image,
+            _text_sprite(label, ha="center", va="top"),
+            x=tick,
+            y=box.bottom + label_offset,
+        )
+
+    y_ticks, y_labels = _ticks(
+        axes.ylim, bins=_tick_bins(box.bottom - box.top, label_height_factor=2)
+    )
+    for tick, label in zip(
+        axes.to_px(np.zeros_like(y_ticks), y_ticks)[1], y_labels, strict=True
+    ):
+        row = round(tick)
+        image[row, box.left - tick_length : box.left + 1] = 0
+        _composite(
+            image,
+            _text_sprite(label, ha="right", va="center_baseline"),
+            x=box.left - label_offset,
+            y=tick,
+        )
+
+
+def _tick_bins(length_px: int, *, label_height_factor: int) -> int:
+    """Return maximum tick intervals on axis, as matplotlib's `get_tick_space()`."""
+    font_size = rcParams["font.size"]
+    space = int(length_px / _PX_PER_PT // (font_size * label_height_factor))
+    return int(np.clip(space, 1, _MAX_TICK_BINS))
+
+
+def _ticks(
+    limits: tuple[float, float], *, bins: int
+) -> tuple[npt.NDArray[np.float64], list[str]]:
+    """Return tick values within `limits`, and labels, as matplotlib's defaults."""
+    values = np.asarray(
+        MaxNLocator(nbins=bins, steps=_TICK_STEPS).tick_values(*limits),
+        dtype=np.float64,
+    )
+    tolerance = (limits[1] - limits[0]) * 1e-10
+    values = values[
+        (values >= limits[0] - tolerance) & (values <= limits[1] + tolerance)
+    ]
+    formatter = ScalarFormatter()
+    formatter.create_dummy_axis()
+    formatter.axis.set_view_interval(*limits)  # type: ignore[union-attr]
+    return values, formatter.format_ticks(values.tolist())
+
+
+@functools.cache
+def _water_color() -> npt.NDArray[np.float32]:
+    return np.array(colormaps["terrain"](0)[:3], dtype=np.float32)
+
+
+@functools.cache
+def _marker_sprite(marker_char: str, color_index: int) -> _Sprite:
+    """Rasterise scatter marker `$<marker_char>$` in property cycle colour."""
+    size_inches = _SPRITE_SIZE_PX / _DPI
+    figure = Figure(figsize=(size_inches, size_inches), dpi=_DPI, facecolor="none")
+    axes = figure.add_axes((0, 0, 1, 1))
+    axes.set_axis_off()
+    axes.set_xlim(-1, 1)
+    axes.set_ylim(-1, 1)
+    axes.scatter([0], [0], marker=f"${marker_char}$", color=f"C{color_index}")
+    return _rasterise(figure, anchor=(_SPRITE_SIZE_PX / 2, _SPRITE_SIZE_PX / 2))
+
+
+@functools.cache
+def _text_sprite(text: str, *, ha: str, va: str) -> _Sprite:
+    """Rasterise tick label `text`, anchored by its alignment."""
+    width, height = _TEXT_SPRITE_SIZE_PX
+    figure = Figure(figsize=(width / _DPI, height / _DPI), dpi=_DPI, facecolor="none")
+    anchor_x = {"left": 0, "center": width / 2, "right": width}[ha]
+    anchor_y = 0 if va == "top" else height / 2
+    figure.text(
+        anchor_x / width,
+        1 - anchor_y / height,
+        text,
+        fontsize=rcParams["xtick.labelsize"],
+        ha=ha,
+        va=va,
+    )
+    return _rasterise(figure, anchor=(anchor_x, anchor_y))
+
+
+def _rasterise(figure: Figure, *, anchor: tuple[float, float]) -> _Sprite:
+    canvas = FigureCanvasAgg(figure)
+    canvas.draw()  # type: ignore[no-untyped-call]
+    rgba = np.asarray(
+        canvas.buffer_rgba(),  # type: ignore[no-untyped-call]
+        dtype=np.float32,
+    )
+    rgba /= 255
+    return _Sprite(rgb=rgba[..., :3], alpha=rgba[..., 3], anchor=anchor)
@@ -1,12 +1,22 @@
 """Define constants and non-core functions used by multiple scripts."""
 
+from __future__ import annotations
+
+import atexit
 import logging
+import multiprocessing
 import tomllib
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from rich.logging import RichHandler
 
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
 LOGGER = logging.getLogger(__name__)
+_log_queue: Queue[logging.LogRecord] | None = None
 
 
 def load_config(path: Path) -> dict[str, str]:
@@ -15,14 +25,44 @@ def load_config(path: Path) -> dict[str, str]:
         return tomllib.load(fp)
 
 
-def configure_logging() -> None:
-    """Configure logging in scripts."""
+def configure_logging(*, queued: bool = False) -> None:
+    """
+    Configure logging in scripts.
+
+    Arguments:
+        queued: Log records are only enqueued by the logging thread or process, and
+            rendered by a single listener thread. The queue is available from
+            `log_queue()`, for worker processes to enqueue to.
+
+    """
+    global _log_queue  # noqa: PLW0603
+
+    handler = RichHandler()
+    handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    if not queued:
+        logging.basicConfig(level="INFO", handlers=[handler])
+        return
+
+    _log_queue = multiprocessing.Queue()
+    listener = QueueListener(_log_queue, handler, respect_handler_level=True)
     logging.basicConfig(
-        level="INFO",
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[RichHandler()],
+        level="INFO", format="%(message)s", handlers=[QueueHandler(_log_queue)]
     )
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def log_queue() -> Queue[logging.LogRecord] | None:
+    """Return the queue for log records, if logging is configured as queued."""
+    return _log_queue
+
+
+def project_version() -> str:
+    """Get project version from `pyproject.toml`."""
+    filepath = _BASE_PATH / "../pyproject.toml"
+    with filepath.open("rb") as fp:
+        version = tomllib.load(fp).get("project", {}).get("version")
+        return str(version)
 
 
 def require_dir(path: Path) -> None:
@@ -38,4 +78,5 @@ _CONFIG = load_config(_BASE_PATH / "config.toml")
 AU_MAPS_DIRPATH = Path(_CONFIG["AU_SOURCE_DIR_RELATIVE"]) / "A3A/addons/maps"
 GRAD_MEH_DIRPATH = Path(_CONFIG["GRAD_MEH_DATA_DIR_RELATIVE"])
 DATA_DIRPATH = Path(_CONFIG["INTERMEDIATE_DATA_DIR_RELATIVE"])
+CACHE_DIRPATH = DATA_DIRPATH / "cache"
 DOC_DIRPATH = Path(_CONFIG["MARKDOWN_OUTPUT_DIR_RELATIVE"])
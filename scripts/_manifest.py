@@ -0,0 +1,93 @@
+"""
+Track content hashes of mission inputs, so unchanged missions can be reused.
+
+Content hashes of map render inputs are tracked separately, in a manifest of the
+same form, so unchanged renders can be reused.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Self
+
+from attrs import Factory, define
+
+from modules.mission.utils import map_name_from_mission_dir_path
+from static_data import au_mission_overrides, in_game_data
+from static_data.map_index import MAP_INDEX
+
+MANIFEST_FILENAME = "manifest.json"
+RENDER_MANIFEST_FILENAME = "render_manifest.json"
+_GRAD_MEH_TOWN_FILENAMES = (
+    "namecitycapital.geojson.gz",
+    "namecity.geojson.gz",
+    "namevillage.geojson.gz",
+)
+
+
+def mission_inputs_digest(
+    *, mission_dir: Path, grad_meh_dir: Path, project_version: str
+) -> str:
+    """
+    Return a content hash of everything the analysis of a mission depends on.
+
+    Covers `mission.sqm`, `mapInfo.hpp`, grad_meh town locations, the mission's
+    static reference data, and the project version. The DEM is only used to render
+    the map, so is covered by `map_render.render_inputs_digest()` instead.
+    """
+    map_name = map_name_from_mission_dir_path(mission_dir)
+    hash_ = hashlib.sha256(project_version.encode())
+    filepaths = [
+        mission_dir / "mission.sqm",
+        mission_dir / "mapInfo.hpp",
+        *(
+            grad_meh_dir / map_name / "geojson/locations" / filename
+            for filename in _GRAD_MEH_TOWN_FILENAMES
+        ),
+    ]
+    for filepath in filepaths:
+        hash_.update(filepath.name.encode())
+        if filepath.is_file():
+            with filepath.open("rb") as fp:
+                hash_.update(hashlib.file_digest(fp, "sha256").digest())
+        else:
+            hash_.update(b"\0")
+
+    static_data = [
+        MAP_INDEX.get(map_name),
+        in_game_data.MILITARY_ZONES_COUNT.get(map_name),
+        in_game_data.TOWNS_COUNT.get(map_name),
+        au_mission_overrides.DISABLED_TOWNS_IGNORED_PREFIXES,
+    ]
+    hash_.update(json.dumps(static_data, sort_keys=True).encode())
+    return hash_.hexdigest()
+
+
+@define(kw_only=True)
+class Manifest:
+    """Input hashes of previously-analysed missions (or rendered maps)."""
+
+    digests: dict[str, str] = Factory(dict)
+    """Keys are `map_name`; values are `mission_inputs_digest()` (or
+    `map_render.render_inputs_digest()`)."""
+
+    @classmethod
+    def load(cls, dir_: Path, *, filename: str = MANIFEST_FILENAME) -> Self:
+        """Load manifest from `dir_`; empty if none exists."""
+        filepath = dir_ / filename
+        if not filepath.is_file():
+            return cls()
+
+        with Path.open(filepath, encoding="utf-8") as fp:
+            return cls(digests=json.load(fp))
+
+    def save(self, dir_: Path, *, filename: str = MANIFEST_FILENAME) -> None:
+        """Save manifest to `dir_`."""
+        with Path.open(dir_ / filename, "w", encoding="utf-8") as fp:
+            json.dump(self.digests, fp, indent=4, sort_keys=True)
+
+    def is_current(self, map_name: str, digest: str) -> bool:
+        """Return `True` if `map_name` was last analysed with inputs `digest`."""
+        return self.digests.get(map_name) == digest
@@ -1,29 +1,68 @@
-"""Analyse a single mission in AU source code and export `Mission` as JSON."""
+"""Analyse a single mission in AU source code, store `Mission` and render its map."""
 
 from __future__ import annotations
 
 import argparse
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import NamedTuple
 
-from modules.map_render import export_map_render
+from modules.diagnostics import Diagnostics
+from modules.map_render import Renderer, export_map_render, render_inputs_digest
 from modules.mission.mission import Mission
+from modules.mission.store import MissionStore
+from modules.mission.utils import map_name_from_mission_dir_path
+from modules.profiling import Profiler, profiled, stage
 from scripts._common import (
     AU_MAPS_DIRPATH,
+    CACHE_DIRPATH,
     DATA_DIRPATH,
     GRAD_MEH_DIRPATH,
     LOGGER,
     configure_logging,
     require_dir,
 )
+from scripts._manifest import RENDER_MANIFEST_FILENAME, Manifest
 from static_data import in_game_data
 from static_data.map_index import MAP_INDEX
 
-if TYPE_CHECKING:
-    from pathlib import Path
+PROFILE_FILENAME = "profile.json"
 
 
-def analyse_mission(mission_dir: Path) -> str | None:
-    """Analyse a single mission and export intermediate data."""
+class RenderOutcome(NamedTuple):
+    """Result of `render_mission()`."""
+
+    digest: str
+    """Digest of render inputs; see `map_render.render_inputs_digest()`."""
+    cached: bool
+    """Existing render was reused."""
+
+
+def analyse_mission(
+    mission_dir: Path,
+    *,
+    diagnostics: Diagnostics | None = None,
+    profiler: Profiler | None = None,
+) -> Mission | None:
+    """
+    Analyse a single mission; its map render is exported by `render_mission()`.
+
+    Arguments:
+        mission_dir: Mission source directory.
+        diagnostics: Validation findings are recorded here. If `None`, they're only
+            logged.
+        profiler: If given, stages of analysis are timed and recorded here.
+
+    Returns:
+        `Mission`, for the caller to store; `None` if it can't be analysed.
+
+    """
+    with profiled(profiler, map_name_from_mission_dir_path(mission_dir)):
+        return _analyse_mission(mission_dir, diagnostics=diagnostics)
+
+
+def _analyse_mission(
+    mission_dir: Path, *, diagnostics: Diagnostics | None
+) -> Mission | None:
     for path in AU_MAPS_DIRPATH, GRAD_MEH_DIRPATH:
         require_dir(path)
 
@@ -34,29 +73,134 @@ def analyse_mission(mission_dir: Path) -> str | None:
     if mission is None:
         return None
 
-    mission.validate_military_zones(in_game_data.MILITARY_ZONES_COUNT)
-    mission.validate_and_correct_towns(
-        GRAD_MEH_DIRPATH / mission.map_name / "geojson/locations"
-    )
-    mission.export_json(DATA_DIRPATH)
+    with stage("validation"):
+        mission.validate_military_zones(
+            in_game_data.MILITARY_ZONES_COUNT, diagnostics=diagnostics
+        )
+        mission.validate_and_correct_towns(
+            GRAD_MEH_DIRPATH / mission.map_name / "geojson/locations",
+            towns_cache_dir=CACHE_DIRPATH,
+            diagnostics=diagnostics,
+        )
+
+    return mission
+
+
+def render_mission(
+    mission: Mission,
+    *,
+    cached_digest: str | None = None,
+    profiler: Profiler | None = None,
+    renderer: Renderer = Renderer.MATPLOTLIB,
+) -> RenderOutcome:
+    """
+    Export map render of an analysed mission to `DATA_DIRPATH`.
+
+    An existing render is reused if its inputs are unchanged, i.e. their digest is
+    `cached_digest`.
+
+    Arguments:
+        mission: Mission to render.
+        cached_digest: Digest of inputs of the existing render, e.g. from the
+            render manifest; `None` if unknown.
+        profiler: If given, the render is timed and recorded here.
+        renderer: Map renderer.
+
+    """
+    grad_meh_dem_filepath = GRAD_MEH_DIRPATH / mission.map_name / "dem.asc.gz"
     map_render_filepath = DATA_DIRPATH / f"{mission.map_name}_map.png"
-    if map_render_filepath.exists():
-        log_msg = f"'{mission.map_name}': map render already exists - skipping."
-        LOGGER.info(log_msg)
+    dem_cache_dir = CACHE_DIRPATH / "dem"
+    with profiled(profiler, mission.map_name):
+        with stage("render_digest"):
+            digest = render_inputs_digest(
+                mission=mission,
+                grad_meh_dem_filepath=grad_meh_dem_filepath,
+                renderer=renderer,
+                dem_cache_dir=dem_cache_dir,
+            )
+
+        if digest == cached_digest and map_render_filepath.is_file():
+            log_msg = f"'{mission.map_name}': map render is up to date - skipping."
+            LOGGER.info(log_msg)
+            return RenderOutcome(digest=digest, cached=True)
 
-    else:
         export_map_render(
             mission=mission,
-            grad_meh_dem_filepath=GRAD_MEH_DIRPATH / mission.map_name / "dem.asc.gz",
-            export_filepath=DATA_DIRPATH / f"{mission.map_name}_map.png",
+            grad_meh_dem_filepath=grad_meh_dem_filepath,
+            export_filepath=map_render_filepath,
+            dem_cache_dir=dem_cache_dir,
+            renderer=renderer,
         )
 
-    return mission.map_name
+    return RenderOutcome(digest=digest, cached=False)
 
 
 if __name__ == "__main__":
     configure_logging()
     parser = argparse.ArgumentParser()
     parser.add_argument("map_name")
+    parser.add_argument(
+        "--diagnostics",
+        type=Path,
+        help="export validation findings to this `.json` or `.csv` file",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=DATA_DIRPATH / PROFILE_FILENAME,
+        help=(
+            "time stages of analysis, and export timings to this `.json` or "
+            f"`.folded` file (default: {PROFILE_FILENAME} in working data directory)"
+        ),
+    )
+    parser.add_argument(
+        "--cprofile-dir",
+        type=Path,
+        help="with --profile, also dump cProfile stats of each stage to this folder",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="with --profile, also measure peak memory of each stage (slower)",
+    )
+    parser.add_argument(
+        "--renderer",
+        type=Renderer,
+        choices=list(Renderer),
+        default=Renderer.MATPLOTLIB,
+        help="map renderer (default: %(default)s)",
+    )
     args = parser.parse_args()
-    analyse_mission(AU_MAPS_DIRPATH / f"Antistasi_{args.map_name}.{args.map_name}")
+    if (args.cprofile_dir or args.memory) and not args.profile:
+        parser.error("--cprofile-dir and --memory require --profile")
+
+    diagnostics = Diagnostics()
+    profiler = (
+        Profiler(cprofile_dir=args.cprofile_dir, memory=args.memory)
+        if args.profile
+        else None
+    )
+    mission = analyse_mission(
+        AU_MAPS_DIRPATH / f"Antistasi_{args.map_name}.{args.map_name}",
+        diagnostics=diagnostics,
+        profiler=profiler,
+    )
+    if mission:
+        with profiled(profiler, mission.map_name), stage("store"):
+            MissionStore(DATA_DIRPATH).add([mission])
+
+        render_manifest = Manifest.load(DATA_DIRPATH, filename=RENDER_MANIFEST_FILENAME)
+        render_manifest.digests[mission.map_name] = render_mission(
+            mission,
+            cached_digest=render_manifest.digests.get(mission.map_name),
+            profiler=profiler,
+            renderer=args.renderer,
+        ).digest
+        render_manifest.save(DATA_DIRPATH, filename=RENDER_MANIFEST_FILENAME)
+
+    if args.diagnostics:
+        diagnostics.export(args.diagnostics)
+
+    if profiler:
+        profiler.export(args.profile)
@@ -1,25 +1,183 @@
-"""Analyse each mission in a folder of AU source code and export `Mission`s as JSON."""
+"""
+Analyse each mission in a folder of AU source code, store `Mission`s and render maps.
+
+Missions are analysed and stored first; map renders are exported by a separate
+stage, which can run in its own worker processes alongside analysis.
+"""
 
 from __future__ import annotations
 
+import argparse
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial
+from logging.handlers import QueueHandler
+from pathlib import Path
+from queue import Queue as ThreadQueue
+from queue import SimpleQueue
+from typing import TYPE_CHECKING, NamedTuple
+
+from attrs import define
 from rich.progress import track
 
-from modules.mission.utils import pretty_iterable_of_str
+from modules.diagnostics import Diagnostics, Finding, Severity
+from modules.map_render import Renderer
+from modules.mission.store import STORE_FILENAME, MissionStore
+from modules.mission.utils import (
+    map_name_from_mission_dir_path,
+    pretty_iterable_of_str,
+)
+from modules.profiling import Profiler, StageMeasurement, profiled, stage
 from modules.utils import mission_dirs_in_dir
 from scripts._common import (
     AU_MAPS_DIRPATH,
     DATA_DIRPATH,
+    GRAD_MEH_DIRPATH,
     LOGGER,
     configure_logging,
+    log_queue,
+    project_version,
     require_dir,
 )
-from scripts.analyse_mission import analyse_mission
+from scripts._manifest import (
+    RENDER_MANIFEST_FILENAME,
+    Manifest,
+    mission_inputs_digest,
+)
+from scripts.analyse_mission import (
+    PROFILE_FILENAME,
+    RenderOutcome,
+    analyse_mission,
+    render_mission,
+)
 from static_data import in_game_data
 from static_data.map_index import MAP_INDEX
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from multiprocessing.queues import Queue
+
+    from modules.mission.mission import Mission
+
+DIAGNOSTICS_FILENAME = "diagnostics.json"
+DEFAULT_RENDER_MEMORY_MIB = 512
+DEFAULT_RENDER_QUEUE_SIZE = 64
+_MEMORY_LOG_COUNT = 5
+_worker_log_queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+
+
+@define(kw_only=True, frozen=True)
+class RenderSettings:
+    """Settings of the render stage."""
+
+    renderer: Renderer = Renderer.MATPLOTLIB
+    jobs: int = 1
+    """Maximum number of concurrent renders, in worker processes."""
+    memory_bytes: int = DEFAULT_RENDER_MEMORY_MIB * 2**20
+    """Estimated peak memory of a render. A render only starts while this much
+    memory is available, unless no other render is in progress."""
+    queue_size: int = DEFAULT_RENDER_QUEUE_SIZE
+    """Number of analysed missions that may wait to be rendered before analysis
+    pauses."""
+
+
+class _WorkerError(Exception):
+    """Error in a worker process, with log records emitted before it."""
+
+    def __init__(self, message: str, records: list[logging.LogRecord]) -> None:
+        # Both passed as `args`, so they're pickled back to the parent process
+        super().__init__(message, records)
+        self.message = message
+        self.records = records
+
+    def __str__(self) -> str:
+        """Return message."""
+        return self.message
+
+
+class _WorkerResult(NamedTuple):
+    mission: Mission | None
+    findings: list[Finding]
+    measurements: list[StageMeasurement]
+    records: list[logging.LogRecord]
+
+
+class _RenderResult(NamedTuple):
+    map_name: str
+    outcome: RenderOutcome
+    measurements: list[StageMeasurement]
+    records: list[logging.LogRecord]
+
+
+@define(kw_only=True)
+class _RenderCache:
+    """Render manifest, and counts of renders reused or regenerated this run."""
 
-def analyse_missions() -> None:
-    """Analyse all missions."""
+    manifest: Manifest
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, map_name: str, outcome: RenderOutcome) -> None:
+        """Record outcome of rendering `map_name`."""
+        self.manifest.digests[map_name] = outcome.digest
+        if outcome.cached:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def log_summary(self) -> None:
+        """Log counts of renders reused and regenerated."""
+        log_msg = (
+            f"Map renders: {self.hits} up to date (cache hits), "
+            f"{self.misses} rendered (misses)."
+        )
+        LOGGER.info(log_msg)
+
+
+def analyse_missions(  # noqa: PLR0913
+    *,
+    jobs: int = 1,
+    force: bool = False,
+    live_log: bool = False,
+    diagnostics_filepath: Path | None = None,
+    profiler: Profiler | None = None,
+    render: RenderSettings | None = None,
+) -> None:
+    """
+    Analyse all missions, and render their maps.
+
+    Missions whose inputs are unchanged since they were last analysed (according to
+    the manifest in `DATA_DIRPATH`) are reused rather than re-analysed. Analysed
+    missions are added to the `MissionStore` in `DATA_DIRPATH` as they complete,
+    and then queued for rendering; reused missions are queued once all are
+    analysed. The store is complete, e.g. for `build_docs`, before renders are.
+
+    A map render is only regenerated if its inputs have changed since it was last
+    rendered (according to the render manifest in `DATA_DIRPATH`), or it's missing;
+    see `map_render.render_inputs_digest()`.
+
+    If `jobs` and `render.jobs` are both 1, missions are rendered serially after
+    all are analysed. Otherwise, they're rendered in a separate pool of worker
+    processes, as analysis continues.
+
+    Arguments:
+        jobs: Number of worker processes. If 1, missions are analysed serially in
+            this process.
+        force: Re-analyse all missions and re-render all maps, ignoring the
+            manifests.
+        live_log: If `jobs` > 1 and logging is queued (see `configure_logging()`),
+            worker processes enqueue log records as they're emitted, rather than
+            them being grouped by mission.
+        diagnostics_filepath: `.json` or `.csv` file to export validation findings
+            of missions analysed in this run to. If `None`, `DIAGNOSTICS_FILENAME`
+            in `DATA_DIRPATH`.
+        profiler: If given, stages of analysis of each mission are measured and
+            recorded here, including in worker processes, and summarised in log.
+        render: Render stage settings. If `None`, defaults.
+
+    """
     require_dir(AU_MAPS_DIRPATH)
     DATA_DIRPATH.mkdir(parents=True, exist_ok=True)
 
@@ -33,18 +191,150 @@ def analyse_missions() -> None:
     log_msg = f"Found {len(mission_dirs)} candidate missions in {AU_MAPS_DIRPATH}."
     LOGGER.info(log_msg)
 
+    manifest = Manifest() if force else Manifest.load(DATA_DIRPATH)
+    render_cache = _RenderCache(
+        manifest=Manifest()
+        if force
+        else Manifest.load(DATA_DIRPATH, filename=RENDER_MANIFEST_FILENAME)
+    )
+    store = MissionStore(DATA_DIRPATH)
+    project_version_ = project_version()
+    digests = {
+        mission_dir: mission_inputs_digest(
+            mission_dir=mission_dir,
+            grad_meh_dir=GRAD_MEH_DIRPATH,
+            project_version=project_version_,
+        )
+        for mission_dir in mission_dirs
+    }
+    reused_map_names = {
+        map_name_from_mission_dir_path(mission_dir)
+        for mission_dir, digest in digests.items()
+        if _is_reusable(mission_dir, digest=digest, manifest=manifest, store=store)
+    }
+    stale_mission_dirs = [
+        mission_dir
+        for mission_dir in mission_dirs
+        if map_name_from_mission_dir_path(mission_dir) not in reused_map_names
+    ]
+    if reused_map_names:
+        log_msg = (
+            f"Reused {len(reused_map_names)} unchanged missions: "
+            f"{pretty_iterable_of_str(sorted(reused_map_names))}."
+        )
+        LOGGER.info(log_msg)
+
+    render = RenderSettings() if render is None else render
+    log_queue_ = log_queue() if live_log else None
+    render_stage = (
+        _SerialRenderStage(settings=render, cache=render_cache, profiler=profiler)
+        if jobs == 1 and render.jobs == 1
+        else _PooledRenderStage(
+            settings=render,
+            cache=render_cache,
+            profiler=profiler,
+            log_queue_=log_queue_,
+        )
+    )
+    diagnostics = Diagnostics()
+    if jobs > 1:
+        log_msg = f"Analysing with {jobs} worker processes."
+        LOGGER.info(log_msg)
+        results = _analyse_in_pool(
+            stale_mission_dirs,
+            jobs=jobs,
+            diagnostics=diagnostics,
+            profiler=profiler,
+            log_queue_=log_queue_,
+        )
+    else:
+        results = (
+            analyse_mission(mission_dir, diagnostics=diagnostics, profiler=profiler)
+            for mission_dir in stale_mission_dirs
+        )
+
     analysed_map_names = set()
-    for mission_dir in track(mission_dirs, description="Analysing missions..."):
-        map_name = analyse_mission(mission_dir)
-        if map_name:
-            analysed_map_names.add(map_name)
+    for mission_dir, mission in zip(
+        stale_mission_dirs,
+        track(
+            results, total=len(stale_mission_dirs), description="Analysing missions..."
+        ),
+        strict=True,
+    ):
+        if mission:
+            with profiled(profiler, mission.map_name), stage("store"):
+                store.add([mission])
+
+            analysed_map_names.add(mission.map_name)
+            manifest.digests[mission.map_name] = digests[mission_dir]
+            render_stage.put(mission)
+        else:
+            map_name = map_name_from_mission_dir_path(mission_dir)
+            store.remove(map_name)
+            manifest.digests.pop(map_name, None)
 
+    store.compact()
+    manifest.save(DATA_DIRPATH)
     log_msg = (
-        f"Exported data for {len(analysed_map_names)} missions to '{DATA_DIRPATH}'."
+        f"Stored data for {len(analysed_map_names)} missions in "
+        f"'{DATA_DIRPATH / STORE_FILENAME}'; reused {len(reused_map_names)}."
     )
     LOGGER.info(log_msg)
 
-    unused_map_index_names = MAP_INDEX.keys() - analysed_map_names
+    # Reused missions' renders are checked too, as e.g. the renderer may differ
+    _finish_renders(
+        render_stage,
+        reused_missions=[store.get(map_name) for map_name in sorted(reused_map_names)],
+        cache=render_cache,
+    )
+    _export_diagnostics(
+        diagnostics,
+        DATA_DIRPATH / DIAGNOSTICS_FILENAME
+        if diagnostics_filepath is None
+        else diagnostics_filepath,
+    )
+    if profiler:
+        _log_profiler_summaries(profiler)
+
+    _warn_unused_keys(analysed_map_names | reused_map_names)
+
+
+def _finish_renders(
+    render_stage: _SerialRenderStage | _PooledRenderStage,
+    *,
+    reused_missions: list[Mission],
+    cache: _RenderCache,
+) -> None:
+    """
+    Queue `reused_missions` for rendering, and wait for all renders.
+
+    The render manifest is saved even if rendering fails, so completed renders are
+    reused next time.
+    """
+    for mission in reused_missions:
+        render_stage.put(mission)
+
+    try:
+        render_stage.close()
+    finally:
+        cache.manifest.save(DATA_DIRPATH, filename=RENDER_MANIFEST_FILENAME)
+
+    cache.log_summary()
+
+
+def _export_diagnostics(diagnostics: Diagnostics, filepath: Path) -> None:
+    """Export findings, and log counts of errors and warnings."""
+    diagnostics.export(filepath)
+    log_msg = (
+        f"Validation: {diagnostics.count(Severity.ERROR)} errors, "
+        f"{diagnostics.count(Severity.WARNING)} warnings."
+    )
+    LOGGER.info(log_msg)
+
+
+def _warn_unused_keys(map_names: set[str]) -> None:
+    """Warn of map index and in-game data keys not in `map_names`."""
+    unused_map_index_names = MAP_INDEX.keys() - map_names
     if unused_map_index_names:
         log_msg = (
             f"{len(unused_map_index_names)} unused map index key(s): "
@@ -52,9 +342,7 @@ def analyse_missions() -> None:
         )
         LOGGER.warning(log_msg)
 
-    unused_in_game_map_names = (
-        in_game_data.MILITARY_ZONES_COUNT.keys() - analysed_map_names
-    )
+    unused_in_game_map_names = in_game_data.MILITARY_ZONES_COUNT.keys() - map_names
     if unused_in_game_map_names:
         log_msg = (
             f"{len(unused_in_game_map_names)} unused in-game data key(s): "
@@ -63,6 +351,506 @@ def analyse_missions() -> None:
         LOGGER.warning(log_msg)
 
 
+def _log_profiler_summaries(profiler: Profiler) -> None:
+    """
+    Log total time of each stage, slowest first, and missions using most memory.
+
+    Maximum RSS is logged once, as it is per process rather than per mission.
+    """
+    for summary in profiler.summaries():
+        log_msg = (
+            f"Stage '{summary.stage}': {summary.total_seconds:.2f} s total over "
+            f"{summary.count} missions; slowest '{summary.max_map_name}' "
+            f"{summary.max_seconds:.2f} s."
+        )
+        LOGGER.info(log_msg)
+
+    for rank, mission in enumerate(
+        profiler.missions_by_memory()[:_MEMORY_LOG_COUNT], start=1
+    ):
+        log_msg = (
+            f"Memory #{rank}: '{mission.map_name}': peak traced "
+            f"{mission.peak_traced_bytes / 2**20:.1f} MiB in '{mission.peak_stage}'."
+        )
+        LOGGER.info(log_msg)
+
+    max_rss_bytes = profiler.max_rss_bytes()
+    if max_rss_bytes is not None:
+        log_msg = (
+            f"Maximum RSS of any analysis process: {max_rss_bytes / 2**20:.1f} MiB."
+        )
+        LOGGER.info(log_msg)
+
+
+def _is_reusable(
+    mission_dir: Path, *, digest: str, manifest: Manifest, store: MissionStore
+) -> bool:
+    """Return `True` if the mission's inputs are unchanged and its data exists."""
+    map_name = map_name_from_mission_dir_path(mission_dir)
+    return manifest.is_current(map_name, digest) and map_name in store
+
+
+def _analyse_in_pool(
+    mission_dirs: list[Path],
+    *,
+    jobs: int,
+    diagnostics: Diagnostics,
+    profiler: Profiler | None = None,
+    log_queue_: Queue[logging.LogRecord] | None = None,
+) -> Iterator[Mission | None]:
+    """
+    Analyse missions in a process pool.
+
+    Results are yielded in `mission_dirs` order. Unless `log_queue_` is given, each
+    worker's log records are buffered and replayed in this process alongside its
+    result, so log output is deterministic and not interleaved between missions.
+    If analysis of a mission fails, its records are replayed before the error is
+    re-raised.
+
+    Arguments:
+        mission_dirs: Missions to analyse.
+        jobs: Number of worker processes.
+        diagnostics: Workers' validation findings are added here. They aren't
+            logged again, as workers already log them.
+        profiler: If given, workers time stages, and measurements are added here.
+        log_queue_: If given, workers enqueue log records here as they're emitted.
+
+    """
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(logging.getLogger().getEffectiveLevel(), log_queue_),
+    ) as executor:
+        results = executor.map(
+            partial(
+                _analyse_mission_in_worker,
+                profile=profiler is not None,
+                cprofile_dir=profiler.cprofile_dir if profiler else None,
+                memory=profiler.memory if profiler else False,
+            ),
+            mission_dirs,
+        )
+        with _replaying_worker_error():
+            for result in results:
+                _replay(result.records)
+                diagnostics.extend(result.findings)
+                if profiler:
+                    profiler.extend(result.measurements)
+
+                yield result.mission
+
+
+def _init_worker(level: int, log_queue_: Queue[logging.LogRecord] | None) -> None:
+    """
+    Route worker process logging to `log_queue_`, or if `None` to a buffer.
+
+    Records are filtered as in the parent.
+    """
+    root_logger = logging.getLogger()
+    root_logger.handlers = [
+        QueueHandler(_worker_log_queue if log_queue_ is None else log_queue_)
+    ]
+    root_logger.setLevel(level)
+
+
+def _analyse_mission_in_worker(
+    mission_dir: Path, *, profile: bool, cprofile_dir: Path | None, memory: bool
+) -> _WorkerResult:
+    """
+    Analyse a single mission.
+
+    Returns:
+        Result, with validation findings, stage measurements if `profile`, and log
+        records emitted meanwhile.
+
+    Raises:
+        _WorkerError: if analysis fails, with log records emitted meanwhile.
+
+    """
+    diagnostics = Diagnostics()
+    profiler = Profiler(cprofile_dir=cprofile_dir, memory=memory) if profile else None
+    with _raising_worker_error(f"Analysis of `{mission_dir}` failed."):
+        mission = analyse_mission(
+            mission_dir, diagnostics=diagnostics, profiler=profiler
+        )
+
+    return _WorkerResult(
+        mission=mission,
+        findings=diagnostics.findings,
+        measurements=profiler.measurements if profiler else [],
+        records=_drain_worker_log_queue(),
+    )
+
+
+class _SerialRenderStage:
+    """Render missions in this process, after all are queued."""
+
+    def __init__(
+        self,
+        *,
+        settings: RenderSettings,
+        cache: _RenderCache,
+        profiler: Profiler | None,
+    ) -> None:
+        """Create empty queue."""
+        self._settings = settings
+        self._cache = cache
+        self._profiler = profiler
+        self._missions: list[Mission] = []
+
+    def put(self, mission: Mission) -> None:
+        """Queue `mission` for rendering."""
+        self._missions.append(mission)
+
+    def close(self) -> None:
+        """Render all queued missions."""
+        for mission in track(self._missions, description="Rendering maps..."):
+            outcome = render_mission(
+                mission,
+                cached_digest=self._cache.manifest.digests.get(mission.map_name),
+                profiler=self._profiler,
+                renderer=self._settings.renderer,
+            )
+            self._cache.record(mission.map_name, outcome)
+
+
+class _PooledRenderStage:
+    """
+    Render missions in a pool of worker processes, fed by a bounded queue.
+
+    A dispatcher thread takes missions from the queue and submits them to the pool,
+    while fewer than `RenderSettings.jobs` renders are in progress and (if known)
+    enough memory is available. Worker log records are replayed, and stage
+    measurements added to the profiler, as renders complete.
+    """
+
+    def __init__(
+        self,
+        *,
+        settings: RenderSettings,
+        cache: _RenderCache,
+        profiler: Profiler | None,
+        log_queue_: Queue[logging.LogRecord] | None,
+        render_in_worker: Callable[..., _RenderResult] | None = None,
+    ) -> None:
+        """
+        Start dispatcher thread; the pool starts with the first mission.
+
+        Missions are rendered in worker processes by `render_in_worker`; if `None`,
+        `_render_mission_in_worker()`.
+        """
+        self._settings = settings
+        self._cache = cache
+        self._profiler = profiler
+        self._log_queue = log_queue_
+        self._render_in_worker = (
+            _render_mission_in_worker if render_in_worker is None else render_in_worker
+        )
+        self._queue: ThreadQueue[Mission | None] = ThreadQueue(
+            maxsize=settings.queue_size
+        )
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._dispatch, name="render-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, mission: Mission) -> None:
+        """Queue `mission` for rendering; blocks while the queue is full."""
+        self._queue.put(mission)
+
+    def close(self) -> None:
+        """
+        Wait for all queued missions to be rendered.
+
+        Raises:
+            RuntimeError: if rendering failed.
+
+        """
+        log_msg = "Waiting for map renders..."
+        LOGGER.info(log_msg)
+        self._queue.put(None)
+        self._thread.join()
+        if self._error:
+            err_msg = "Map rendering failed."
+            raise RuntimeError(err_msg) from self._error
+
+    def _dispatch(self) -> None:
+        """Submit queued missions to pool until `None` is queued, then wait."""
+        closed = False
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self._settings.jobs,
+                initializer=_init_worker,
+                initargs=(logging.getLogger().getEffectiveLevel(), self._log_queue),
+            ) as executor:
+                profiler = self._profiler
+                render = partial(
+                    self._render_in_worker,
+                    profile=profiler is not None,
+                    cprofile_dir=profiler.cprofile_dir if profiler else None,
+                    memory=profiler.memory if profiler else False,
+                    renderer=self._settings.renderer,
+                )
+                in_progress: set[Future[_RenderResult]] = set()
+                while (mission := self._queue.get()) is not None:
+                    while in_progress and not self._can_start(len(in_progress)):
+                        in_progress = self._wait(in_progress)
+
+                    in_progress.add(
+                        executor.submit(
+                            render,
+                            mission,
+                            cached_digest=self._cache.manifest.digests.get(
+                                mission.map_name
+                            ),
+                        )
+                    )
+
+                closed = True
+                while in_progress:
+                    in_progress = self._wait(in_progress)
+
+        except BaseException as err:  # noqa: BLE001 - re-raised by `close()`
+            self._error = err
+            # Unblock `put()` until `close()`, unless it has already been called
+            while not closed and self._queue.get() is not None:
+                pass
+
+    def _can_start(self, in_progress_count: int) -> bool:
+        """Return `True` if another render may start."""
+        if in_progress_count >= self._settings.jobs:
+            return False
+
+        available_bytes = _available_memory_bytes()
+        if (
+            available_bytes is not None
+            and available_bytes < self._settings.memory_bytes
+        ):
+            log_msg = (
+                f"Only {available_bytes / 2**20:.0f} MiB memory available; "
+                f"waiting for {in_progress_count} render(s) to finish."
+            )
+            LOGGER.debug(log_msg)
+            return False
+
+        return True
+
+    def _wait(
+        self, in_progress: set[Future[_RenderResult]]
+    ) -> set[Future[_RenderResult]]:
+        """Wait for a render to complete, and handle its result; return others."""
+        done, not_done = wait(in_progress, return_when=FIRST_COMPLETED)
+        for future in done:
+            with _replaying_worker_error():
+                result = future.result()
+
+            _replay(result.records)
+            self._cache.record(result.map_name, result.outcome)
+            if self._profiler:
+                self._profiler.extend(result.measurements)
+
+        return not_done
+
+
+def _render_mission_in_worker(  # noqa: PLR0913
+    mission: Mission,
+    *,
+    cached_digest: str | None,
+    profile: bool,
+    cprofile_dir: Path | None,
+    memory: bool,
+    renderer: Renderer,
+) -> _RenderResult:
+    """
+    Render a single mission, unless its render is up to date.
+
+    Returns:
+        Result, with render outcome, stage measurements if `profile`, and log
+        records emitted meanwhile.
+
+    Raises:
+        _WorkerError: if rendering fails, with log records emitted meanwhile.
+
+    """
+    profiler = Profiler(cprofile_dir=cprofile_dir, memory=memory) if profile else None
+    with _raising_worker_error(f"'{mission.map_name}': rendering failed."):
+        outcome = render_mission(
+            mission, cached_digest=cached_digest, profiler=profiler, renderer=renderer
+        )
+    return _RenderResult(
+        map_name=mission.map_name,
+        outcome=outcome,
+        measurements=profiler.measurements if profiler else [],
+        records=_drain_worker_log_queue(),
+    )
+
+
+@contextmanager
+def _raising_worker_error(message: str) -> Iterator[None]:
+    """
+    Re-raise any error in a worker process as `_WorkerError`.
+
+    Log records buffered meanwhile are attached, so they aren't lost, or replayed
+    with the worker's next result.
+    """
+    try:
+        yield
+    except Exception as err:
+        raise _WorkerError(message, _drain_worker_log_queue()) from err
+
+
+@contextmanager
+def _replaying_worker_error() -> Iterator[None]:
+    """Replay log records of any `_WorkerError` raised, before re-raising it."""
+    try:
+        yield
+    except _WorkerError as err:
+        _replay(err.records)
+        raise
+
+
+def _drain_worker_log_queue() -> list[logging.LogRecord]:
+    """Return log records buffered in this worker process since last drained."""
+    records = []
+    while not _worker_log_queue.empty():
+        records.append(_worker_log_queue.get())
+
+    return records
+
+
+def _replay(records: list[logging.LogRecord]) -> None:
+    """Handle log records emitted by a worker process, in this process."""
+    for record in records:
+        logging.getLogger(record.name).handle(record)
+
+
+def _available_memory_bytes() -> int | None:
+    """
+    Return memory available for new processes without swapping.
+
+    Read from `/proc/meminfo`, so Linux only; `None` elsewhere.
+    """
+    try:
+        meminfo = Path("/proc/meminfo").read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+    for line in meminfo.splitlines():
+        if line.startswith("MemAvailable:"):
+            return int(line.split()[1]) * 1024  # KiB
+
+    return None
+
+
 if __name__ == "__main__":
-    configure_logging()
-    analyse_missions()
+    configure_logging(queued=True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes (default: 1, i.e. serial)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=(
+            "re-analyse all missions and re-render all maps, even if their inputs "
+            "are unchanged"
+        ),
+    )
+    parser.add_argument(
+        "--live-log",
+        action="store_true",
+        help="with --jobs, log as workers emit records, rather than grouped by mission",
+    )
+    parser.add_argument(
+        "--diagnostics",
+        type=Path,
+        help=(
+            "export validation findings to this `.json` or `.csv` file "
+            f"(default: {DIAGNOSTICS_FILENAME} in working data directory)"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=DATA_DIRPATH / PROFILE_FILENAME,
+        help=(
+            "time stages of analysis of each mission, and export timings to this "
+            f"`.json` or `.folded` file (default: {PROFILE_FILENAME} in working data "
+            "directory)"
+        ),
+    )
+    parser.add_argument(
+        "--cprofile-dir",
+        type=Path,
+        help="with --profile, also dump cProfile stats of each stage to this folder",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help=(
+            "with --profile, also measure peak memory of each stage and rank "
+            "missions by it (slower)"
+        ),
+    )
+    parser.add_argument(
+        "--renderer",
+        type=Renderer,
+        choices=list(Renderer),
+        default=Renderer.MATPLOTLIB,
+        help=(
+            "map renderer; `numpy` composites images directly, which is faster "
+            "(default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--render-jobs",
+        type=int,
+        help=(
+            "maximum number of map renders in parallel, in worker processes "
+            "separate from analysis (default: same as --jobs)"
+        ),
+    )
+    parser.add_argument(
+        "--render-memory",
+        type=int,
+        default=DEFAULT_RENDER_MEMORY_MIB,
+        help=(
+            "estimated peak memory of a render, in MiB; renders only start in "
+            "parallel while this much is available (default: %(default)s)"
+        ),
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    if args.render_jobs is not None and args.render_jobs < 1:
+        parser.error("--render-jobs must be at least 1")
+
+    if (args.cprofile_dir or args.memory) and not args.profile:
+        parser.error("--cprofile-dir and --memory require --profile")
+
+    profiler = (
+        Profiler(cprofile_dir=args.cprofile_dir, memory=args.memory)
+        if args.profile
+        else None
+    )
+
+    analyse_missions(
+        jobs=args.jobs,
+        force=args.force,
+        live_log=args.live_log,
+        diagnostics_filepath=args.diagnostics,
+        profiler=profiler,
+        render=RenderSettings(
+            renderer=args.renderer,
+            jobs=args.jobs if args.render_jobs is None else args.render_jobs,
+            memory_bytes=args.render_memory * 2**20,
+        ),
+    )
+    if profiler:
+        profiler.export(args.profile)
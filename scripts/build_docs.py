@@ -1,56 +1,59 @@
-"""Load all `Mission`s from JSON and generate the Markdown doc."""
+"""Load all `MissionSummary`s from the store and generate the Markdown doc."""
 
 from __future__ import annotations
 
-import tomllib
 from operator import attrgetter
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import attrs
+import msgspec
+import numpy as np
 
-from modules.mission.mission import Mission
+from modules.mission.mission_summary import MissionSummary
+from modules.mission.mission_table import MissionTable
+from modules.mission.store import INDEX_FILENAME, MissionStore
 from modules.mission.utils import pretty_iterable_of_str
 from scripts._common import (
     DATA_DIRPATH,
     DOC_DIRPATH,
     LOGGER,
     configure_logging,
+    project_version,
     require_dir,
 )
 from scripts._docs_includes import COLUMNS, INTRO_MARKDOWN, OUTRO_MARKDOWN
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence, Sized
+    from collections.abc import Sized
 
 
-def build_docs() -> None:
-    """Generate the Markdown doc representing site content."""
-    for path in DATA_DIRPATH, DOC_DIRPATH:
+def build_docs(*, data_dir: Path = DATA_DIRPATH, doc_dir: Path = DOC_DIRPATH) -> None:
+    """
+    Generate the Markdown doc representing site content.
+
+    Arguments:
+        data_dir: Directory of the mission store.
+        doc_dir: Directory to save the doc to.
+
+    """
+    for path in data_dir, doc_dir:
         require_dir(path)
 
-    project_version_ = _project_version()
+    project_version_ = project_version()
     log_msg = f"Project version {project_version_}"
     LOGGER.info(log_msg)
 
-    missions = _missions_from_json(DATA_DIRPATH)
-    max_war_level_points = max(
-        m.war_level_points for m in missions if m.war_level_points
-    )
+    table = MissionTable.from_summaries(_summaries_from_store(data_dir))
     markdown_content = [
         INTRO_MARKDOWN,
-        _markdown_total_missions(missions),
-        _markdown_table(
-            missions=sorted(missions, key=_sort_missions_by_points, reverse=True),
-            columns=COLUMNS,
-            max_war_level_points=max_war_level_points,
-        ),
+        _markdown_total_missions(table),
+        _markdown_table(table=table, columns=COLUMNS),
         OUTRO_MARKDOWN,
         _markdown_project_version(project_version_),
     ]
     LOGGER.info("Generated Markdown.")
 
-    doc_filepath = DOC_DIRPATH / "index.md"
+    doc_filepath = doc_dir / "index.md"
     with Path.open(doc_filepath, "w", encoding="utf-8") as fp:
         fp.write("".join(markdown_content))
 
@@ -58,30 +61,40 @@ def build_docs() -> None:
     LOGGER.info(log_msg)
 
 
-def _project_version() -> str:
-    """Get project version from `pyproject.toml`."""
-    filepath = Path(__file__).resolve().parent / "../pyproject.toml"
-    with filepath.open("rb") as fp:
-        version = tomllib.load(fp).get("project", {}).get("version")
-        return str(version)
+def _summaries_from_store(path: Path) -> list[MissionSummary]:
+    """
+    Load summaries of previously-stored `Mission`s from `path`.
 
+    Raises:
+        RuntimeError: if there are no summaries, other than of excluded missions.
 
-def _missions_from_json(path: Path) -> list[Mission]:
-    """Load previously-exported `Missions` from `path`."""
-    json_files = [p for p in list(path.iterdir()) if p.suffix == ".json"]
-    log_msg = f"Found {len(json_files)} files in {path}."
+    """
+    missions = MissionStore(path).summaries()
+    log_msg = f"Found {len(missions)} missions in {path / INDEX_FILENAME}."
     LOGGER.info(log_msg)
 
-    missions = [Mission.from_json(fp) for fp in json_files]
     filtered_missions = [m for m in missions if not m.exclude]
     log_msg = f"Loaded data for {len(filtered_missions)} missions; "
     log_msg += f"{len(missions) - len(filtered_missions)} excluded."
     LOGGER.info(log_msg)
+    if not filtered_missions:
+        err_msg = (
+            f"No mission summaries in '{path / INDEX_FILENAME}' "
+            "(missing, invalid, or all missions excluded); run `analyse_missions` "
+            "first."
+        )
+        raise RuntimeError(err_msg)
 
     required_fields = {
         field.name
-        for field in attrs.fields(Mission)
-        if field.name not in ["disabled_towns", "waterports", "exclude"]
+        for field in msgspec.structs.fields(MissionSummary)
+        if field.name
+        not in [
+            "waterports_count",
+            "total_military_zones_count",
+            "war_level_points",
+            "exclude",
+        ]
     }
     for mission in filtered_missions:
         empty_fields = {f for f in required_fields if not getattr(mission, f)}
@@ -100,11 +113,10 @@ def _markdown_total_missions(missions: Sized) -> str:
 
 def _markdown_table(
     *,
-    missions: Sequence[Mission],
+    table: MissionTable,
     columns: dict[str, dict[str, str | bool]],
-    max_war_level_points: int,
 ) -> str:
-    """Create Markdown table."""
+    """Create Markdown table, with missions in War Level points rank order."""
     th_values = [
         str(properties.get("display_heading", col))
         for col, properties in columns.items()
@@ -118,35 +130,35 @@ def _markdown_table(
 
     tdivider += "|\n"
     trs = [
-        _markdown_table_row(
-            mission=m, columns=columns, max_war_level_points=max_war_level_points
-        )
-        for m in missions
+        _markdown_table_row(table=table, row=row, columns=columns)
+        for row in table.order_by_rank().tolist()
     ]
     return thead + tdivider + "".join(trs) + "\n"
 
 
 def _markdown_table_row(
     *,
-    mission: Mission,
+    table: MissionTable,
+    row: int,
     columns: dict[str, dict[str, str | bool]],
-    max_war_level_points: int,
 ) -> str:
     """Create Markdown table row."""
     tr = ""
     for col in columns:
         td_value = ""
         if col == "map_name":
-            td_value = str(mission.map_display_name)
-            if mission.map_url:
-                td_value = f"[{td_value}]({mission.map_url})"
+            td_value = str(table.map_display_names[row])
+            if table.map_urls[row]:
+                td_value = f"[{td_value}]({table.map_urls[row]})"
 
         elif col == "war_level_points_ratio_dynamic":
-            ratio = mission.war_level_points_ratio(max_war_level_points)
-            if ratio:
+            ratio = table.column("war_level_points_ratio")[row]
+            if not np.isnan(ratio):
                 td_value = f"{ratio:.2f}"
+        elif col == "climate":
+            td_value = table.climates[row]
         else:
-            td_value = _markdown_handle_missing_value(getattr(mission, col))
+            td_value = _markdown_handle_missing_value(table.column(col)[row])
 
         tr += f"| {td_value} "
 
@@ -154,13 +166,13 @@ def _markdown_table_row(
     return tr
 
 
-def _markdown_handle_missing_value(val: int | str | None) -> str:
+def _markdown_handle_missing_value(val: float) -> str:
     """
-    Display '' instead of '0' if value is `None`.
+    Display '' instead of '0' if value is NaN.
 
-    `None` is used to flag unknown/missing value, as opposed to calculated zero.
+    NaN is used to flag unknown/missing value, as opposed to calculated zero.
     """
-    return "" if val is None else str(val)
+    return "" if np.isnan(val) else str(int(val))
 
 
 def _markdown_project_version(v: str) -> str:
@@ -168,11 +180,6 @@ def _markdown_project_version(v: str) -> str:
     return f"\n- Version {v}\n"
 
 
-def _sort_missions_by_points(mission: Mission) -> int:
-    """Sort order for `Mission`s table."""
-    return 0 if mission.war_level_points is None else mission.war_level_points
-
-
 if __name__ == "__main__":
     configure_logging()
     build_docs()
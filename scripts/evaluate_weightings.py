@@ -0,0 +1,132 @@
+"""
+Score stored missions under candidate War Level points weightings.
+
+Weightings are read from a `.csv` file with a header row of count names (see
+`COUNT_COLUMNS`) and one weighting per row, or a `.npy` file of the same matrix.
+Results are exported as `.csv` (one row per weighting and mission) or `.npz`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from modules.mission.mission_table import MissionTable
+from modules.mission.store import MissionStore
+from modules.mission.war_level_points import (
+    COUNT_COLUMNS,
+    WeightingResults,
+    evaluate_weightings,
+)
+from scripts._common import DATA_DIRPATH, LOGGER, configure_logging, require_dir
+
+_CSV_FIELDS = ("weighting", "map_name", "score", "ratio", "rank", "rank_change")
+
+
+def evaluate_weightings_from_file(
+    weights_filepath: Path, output_filepath: Path
+) -> None:
+    """Score missions under weightings from file and export results."""
+    require_dir(DATA_DIRPATH)
+    weights = _load_weights(weights_filepath)
+    summaries = [s for s in MissionStore(DATA_DIRPATH).summaries() if not s.exclude]
+    results = evaluate_weightings(MissionTable.from_summaries(summaries), weights)
+    log_msg = (
+        f"Scored {len(summaries)} missions under {len(weights)} weightings; "
+        f"max rank change {int(np.nanmax(np.abs(results.rank_changes), initial=0))}."
+    )
+    LOGGER.info(log_msg)
+
+    if output_filepath.suffix == ".npz":
+        _export_npz(results, output_filepath)
+    else:
+        _export_csv(results, output_filepath)
+
+    log_msg = f"Results saved to {output_filepath}."
+    LOGGER.info(log_msg)
+
+
+def _load_weights(filepath: Path) -> npt.NDArray[np.float64]:
+    """
+    Load `(weightings, len(COUNT_COLUMNS))` matrix from `.csv` or `.npy` file.
+
+    Raises:
+        ValueError: if file doesn't have the expected columns, or `.npy` array isn't
+            a matrix of them.
+
+    """
+    if filepath.suffix == ".npy":
+        weights: npt.NDArray[np.float64] = np.load(filepath).astype(np.float64)
+        if weights.ndim != 2 or weights.shape[1] != len(COUNT_COLUMNS):  # noqa: PLR2004
+            err_msg = (
+                f"{filepath}: expected (weightings, {len(COUNT_COLUMNS)}) array, "
+                f"not {weights.shape}."
+            )
+            raise ValueError(err_msg)
+
+        return weights
+
+    with filepath.open(newline="", encoding="utf-8") as fp:
+        reader = csv.DictReader(fp)
+        missing_columns = set(COUNT_COLUMNS) - set(reader.fieldnames or [])
+        if missing_columns:
+            err_msg = f"{filepath}: missing columns {sorted(missing_columns)}."
+            raise ValueError(err_msg)
+
+        rows = [[float(row[col]) for col in COUNT_COLUMNS] for row in reader]
+
+    return np.array(rows, dtype=np.float64).reshape(-1, len(COUNT_COLUMNS))
+
+
+def _export_csv(results: WeightingResults, filepath: Path) -> None:
+    """Export results, one row per weighting and mission."""
+    with filepath.open("w", newline="", encoding="utf-8") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(_CSV_FIELDS)
+        for weighting, (scores, ratios, ranks, rank_changes) in enumerate(
+            zip(
+                results.scores.tolist(),
+                results.ratios.tolist(),
+                results.ranks.astype(int).tolist(),
+                results.rank_changes.astype(int).tolist(),
+                strict=True,
+            )
+        ):
+            writer.writerows(
+                zip(
+                    [weighting] * len(results.map_names),
+                    results.map_names,
+                    scores,
+                    ratios,
+                    ranks,
+                    rank_changes,
+                    strict=True,
+                )
+            )
+
+
+def _export_npz(results: WeightingResults, filepath: Path) -> None:
+    """Export results as arrays, indexed `[weighting, mission]`."""
+    np.savez_compressed(
+        filepath,
+        map_names=np.array(results.map_names),
+        count_columns=np.array(COUNT_COLUMNS),
+        weights=results.weights,
+        scores=results.scores,
+        ratios=results.ratios,
+        ranks=results.ranks,
+        rank_changes=results.rank_changes,
+    )
+
+
+if __name__ == "__main__":
+    configure_logging()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("weights", type=Path, help="`.csv` or `.npy` weightings file")
+    parser.add_argument("output", type=Path, help="`.csv` or `.npz` results file")
+    args = parser.parse_args()
+    evaluate_weightings_from_file(args.weights, args.output)
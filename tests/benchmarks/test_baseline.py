@@ -0,0 +1,88 @@
+"""Test comparing benchmark results against a baseline."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from benchmarks.baseline import Baseline, CorpusParameters, compare
+from benchmarks.suite import BenchmarkResult
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CORPUS = CorpusParameters(
+    missions=1, markers_per_layer=1, layer_depth=0, towns=1, dem_size_px=8
+)
+BASELINE = Baseline.from_results(
+    [
+        BenchmarkResult(name="mission_sqm_parse", seconds=[1.0, 1.0, 1.1, 0.9]),
+        BenchmarkResult(name="render", seconds=[2.0, 2.0, 2.0]),
+    ],
+    corpus=CORPUS,
+    repeat=3,
+)
+
+
+def test_save_load(tmp_path: Path) -> None:
+    """Baseline round-trips through file."""
+    # arrange
+    filepath = tmp_path / "baseline.json"
+    # act
+    BASELINE.save(filepath)
+    # assert
+    assert Baseline.load(filepath) == BASELINE
+
+
+def test_load_invalid(tmp_path: Path) -> None:
+    """Invalid baseline file raises `ValueError`."""
+    # arrange
+    filepath = tmp_path / "baseline.json"
+    filepath.write_text("{}")
+    # act, assert
+    with pytest.raises(ValueError, match="Error decoding baseline"):
+        Baseline.load(filepath)
+
+
+@pytest.mark.parametrize(
+    ("seconds", "expected"),
+    [
+        ([2.0, 2.0, 2.0], False),
+        ([2.3, 2.3, 2.3], False),  # within threshold
+        ([2.5, 2.5, 2.5], True),
+    ],
+)
+def test_compare_threshold(seconds: list[float], expected: bool) -> None:  # noqa: FBT001
+    """Median time increased by more than threshold is a regression."""
+    # act
+    [comparison] = compare(
+        BASELINE,
+        [BenchmarkResult(name="render", seconds=seconds)],
+        threshold=0.2,
+    )
+    # assert
+    assert comparison.is_regression == expected
+
+
+def test_compare_within_noise() -> None:
+    """Increase within baseline interquartile range isn't a regression."""
+    # act
+    [comparison] = compare(
+        BASELINE,
+        [BenchmarkResult(name="mission_sqm_parse", seconds=[1.1])],
+        threshold=0.05,
+    )
+    # assert
+    assert comparison.change == pytest.approx(0.1)
+    assert not comparison.is_regression
+
+
+def test_compare_ignores_new_benchmarks() -> None:
+    """Benchmarks not in baseline aren't compared."""
+    # act
+    comparisons = compare(
+        BASELINE, [BenchmarkResult(name="build_docs", seconds=[9.0])], threshold=0.2
+    )
+    # assert
+    assert comparisons == []
@@ -0,0 +1,53 @@
+"""Test generating a synthetic mission corpus."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from benchmarks.corpus import generate_corpus
+from modules.dem_cache import load_dem_derivatives
+from modules.diagnostics import Diagnostics, Severity
+from modules.mission.mission import Mission
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_generate_corpus(tmp_path: Path) -> None:
+    """Missions are read with the configured number of markers and towns."""
+    # act
+    corpus = generate_corpus(
+        tmp_path, missions=2, markers_per_layer=14, layer_depth=2, towns=9
+    )
+    # assert
+    assert [d.name for d in corpus.mission_dirs] == [
+        "Antistasi_Synth0.synth0",
+        "Antistasi_Synth1.synth1",
+    ]
+    for mission_dir in corpus.mission_dirs:
+        mission = Mission.from_data(mission_dir=mission_dir, map_index=corpus.map_index)
+        assert mission
+        # 14 per layer * 3 layers, of which 1 in 7 irrelevant
+        assert mission.total_military_zones_count == 36
+        assert mission.waterports_count == 6
+        assert mission.towns_count == 9
+
+
+def test_generate_corpus_grad_meh(tmp_path: Path) -> None:
+    """grad_meh locations match mission towns, and DEM has land and water."""
+    # arrange
+    corpus = generate_corpus(tmp_path, missions=1, towns=9, dem_size_px=64)
+    mission = Mission.from_data(
+        mission_dir=corpus.mission_dirs[0], map_index=corpus.map_index
+    )
+    assert mission
+    diagnostics = Diagnostics(log=False)
+    # act
+    mission.validate_and_correct_towns(
+        corpus.grad_meh_dir / "synth0/geojson/locations", diagnostics=diagnostics
+    )
+    dem = load_dem_derivatives(corpus.grad_meh_dir / "synth0/dem.asc.gz")
+    # assert
+    assert [f.severity for f in diagnostics.findings] == [Severity.INFO]
+    assert dem.land.shape == (64, 64)
+    assert 0 < dem.land.mean() < 1
@@ -0,0 +1,160 @@
+"""Mission data shared between tests."""
+
+from modules.mission.marker import Marker
+from modules.mission.marker_table import MarkerTable
+from modules.mission.mission import Mission
+from modules.mission.position_2d import Position2D
+
+MISSION = Mission(
+    map_name="altis",
+    map_display_name="Altis",
+    map_url=None,
+    climate="arid",
+    towns={"Kavala": 500, "Çay": None},
+    disabled_towns=["Sofia"],
+    markers=MarkerTable.from_markers(
+        {
+            "airports": [
+                Marker(name="airport_1", position=Position2D(x=14623.5, y=16763.3))
+            ],
+            "outposts": [Marker(name="outpost_2", position=Position2D(x=1200, y=8000))],
+        }
+    ),
+)
+
+# Cut down/edited version of `.../Antistasi_Altis.Altis/mission.sqm`
+MISSION_SQM = r"""
+version=54;
+class EditorData
+{
+	moveGridStep=1;
+	class ItemIDProvider
+	{
+		nextID=4201;
+	};
+};
+binarizationWanted=0;
+addons[]=
+{
+	"A3_Characters_F",
+	"A3_Modules_F"
+};
+class AddonsMetaData
+{
+	class List
+	{
+		items=1;
+		class Item0
+		{
+			className="A3_Characters_F";
+			name="Arma 3 Alpha - Characters and Clothing";
+		};
+	};
+};
+class Mission
+{
+	class Intel
+	{
+		briefingName="Antistasi ""Ultimate"" - Altis";
+		overviewText="Line one" \n "line two";
+		timeOfChanges=1800.0002;
+	};
+	class Entities
+	{
+		items=4;
+		class Item0
+		{
+			dataType="Marker";
+			position[]={14623.5,17.91,16763.3};
+			name="airport_1";
+			type="flag_NATO";
+			id=1;
+			atlOffset=-1.5258789e-005;
+		};
+		class Item1
+		{
+			dataType="Object";
+			class PositionInfo
+			{
+				position[]={3688.3,5.0014,13131.8};
+				angles[]={0,5.9,0};
+			};
+			side="Empty";
+			class Attributes
+			{
+				name="outpost_decoy";
+			};
+			id=2;
+			type="Land_Cargo_HQ_V1_F";
+		};
+		class Item2
+		{
+			dataType="Layer";
+			name="Military zones";
+			class Entities
+			{
+				items=3;
+				class Item0
+				{
+					dataType="Marker";
+					position[]={3688.3,5.0014,13131.8};
+					name="Outpost_2";
+					type="Empty";
+					id=3;
+				};
+				class Item1
+				{
+					dataType="Marker";
+					position[]={1200,8000};
+					name="control_1";
+					type="Empty";
+					id=4;
+				};
+				class Item2
+				{
+					dataType="Layer";
+					name="Nested";
+					class Entities
+					{
+						items=1;
+						class Item0
+						{
+							dataType="Marker";
+							position[]={9000.25,12.5,4000.75};
+							name="seaport_3";
+							markerType="RECTANGLE";
+							id=5;
+						};
+					};
+					id=6;
+				};
+			};
+			id=7;
+		};
+		class Item3
+		{
+			dataType="Group";
+			side="West";
+			class Entities
+			{
+				items=1;
+				class Item0
+				{
+					dataType="Marker";
+					position[]={1,2,3};
+					name="factory_in_group";
+					id=8;
+				};
+			};
+			id=9;
+		};
+		class Item4
+		{
+			dataType="Marker";
+			position[]={5000,0,6000};
+			name="milbase_4";
+			id=10;
+		};
+	};
+};
+"""
@@ -1,12 +1,9 @@
 """Test parsing a mission's `mapInfo.hpp` file."""
 
-from cxxheaderparser.simple import parse_string
+import pytest
 
-from modules.mission.mapinfo_hpp_parser import (
-    _get_climate,
-    _get_disabled_town_names,
-    _get_populations,
-)
+from modules.mission.mapinfo_hpp_parser import MapInfoHppData
+from modules.mission.mapinfo_hpp_tokenizer import UnsupportedSyntaxError
 
 # Cut down/edited version of `.../Antistasi_Altis.Altis/mapInfo.hpp`
 MAP_INFO_HPP = r"""
@@ -42,35 +39,108 @@ class altis {
 };"""  # noqa: E501
 
 
-def test_get_climate() -> None:
-    """Get climate value."""
+def test_climate() -> None:
+    """Get climate value, indexed by `cxxheaderparser`."""
     # arrange
-    class_scope = parse_string(MAP_INFO_HPP).namespace.classes[0]
+    data = MapInfoHppData._from_str_cxx(MAP_INFO_HPP)
     # act
-    value = _get_climate(class_scope)
+    value = data.climate
     # assert
     assert value == "arid"
 
 
-def test_get_populations() -> None:
-    """Get populations value."""
+def test_populations() -> None:
+    """Get populations value, indexed by `cxxheaderparser`."""
     # arrange
-    class_scope = parse_string(MAP_INFO_HPP).namespace.classes[0]
+    data = MapInfoHppData._from_str_cxx(MAP_INFO_HPP)
     # act
-    value = _get_populations(class_scope)
+    value = data.populations
     # assert
     assert value == [("Therisa", 154), ("Zaros", 371), ("Poliakko", 136)]
 
 
-def test_get_disabled_towns() -> None:
-    """Get populations value."""
+def test_disabled_town_names() -> None:
+    """Get disabled towns value, indexed by `cxxheaderparser`."""
     # arrange
-    class_scope = parse_string(MAP_INFO_HPP).namespace.classes[0]
+    data = MapInfoHppData._from_str_cxx(MAP_INFO_HPP)
     # act
-    value = _get_disabled_town_names(class_scope)
+    value = data.disabled_town_names
     # assert
     assert value == [
         "Tikanen",
         "toipela",
         "hirvela",
     ]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        MAP_INFO_HPP,
+        "// comment\n" + MAP_INFO_HPP.replace("\t", "\t/* comment */ ", 1),
+    ],
+)
+def test_backends_identical(data: str) -> None:
+    """Tokenizer and `cxxheaderparser` backends give identical output."""
+    # act
+    tokenized = MapInfoHppData._from_str_tokenized(data)
+    cxx = MapInfoHppData._from_str_cxx(data)
+    # assert
+    assert tokenized == cxx
+    assert tokenized.populations == [
+        ("Therisa", 154),
+        ("Zaros", 371),
+        ("Poliakko", 136),
+    ]
+
+
+def test_from_str_falls_back() -> None:
+    """Syntax outside tokenizer subset falls back to `cxxheaderparser`."""
+    # arrange
+    data = MAP_INFO_HPP.replace("\tclimate", "\tstatic const int x = 1;\n\tclimate")
+    with pytest.raises(UnsupportedSyntaxError):
+        MapInfoHppData._from_str_tokenized(data)
+
+    # act
+    value = MapInfoHppData.from_str(data)
+    # assert
+    assert value == MapInfoHppData._from_str_cxx(data)
+
+
+def test_arbitrary_fields() -> None:
+    """Fields without a dedicated property are decoded by name."""
+    # arrange
+    data = MapInfoHppData.from_str(MAP_INFO_HPP)
+    # act, assert
+    assert data.field("garrison") == [
+        [],
+        [
+            "outpost_24",
+            "factory_7",
+            "factory_5",
+            "airport_2",
+            "seaport_4",
+            "outpost_5",
+            "outpost_6",
+            "milbase_4",
+            "control_52",
+            "control_33",
+        ],
+        [],
+        ["control_52", "control_33"],
+    ]
+    assert data.field("banks") == [
+        [16586.6, 12834.5, -0.638584],
+        [16545.8, 12784.5, -0.485485],
+        [16633.3, 12807, -0.635017],
+    ]
+    assert data.field("climate") == "arid"
+    assert data.field("antennasBlacklistIndex") == [4, 10, 12, 15, 17]
+    assert data.field("buildObjects") == [
+        "BUILDABLES_HISTORIC",
+        "BUILDABLES_MODERN_SAND",
+        "BUILDABLES_ARID",
+        "BUILDABLES_UNIVERSAL",
+    ]
+    with pytest.raises(ValueError, match="Can't find 'notAField' field"):
+        data.field("notAField")
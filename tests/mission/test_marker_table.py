@@ -0,0 +1,55 @@
+"""Test `MarkerTable`."""
+
+import numpy as np
+import pytest
+
+from modules.mission.marker import Marker
+from modules.mission.marker_table import MarkerTable
+from modules.mission.position_2d import Position2D
+
+MARKERS = {
+    "bases": [
+        Marker(name="milbase_1", position=Position2D(x=1.5, y=2.5)),
+        Marker(name="milbase_2", position=Position2D(x=3, y=4)),
+    ],
+    "airports": [Marker(name="airport_1", position=Position2D(x=5, y=6))],
+}
+
+
+def test_from_markers() -> None:
+    """Markers are grouped by category, with positions as an array."""
+    # act
+    table = MarkerTable.from_markers(MARKERS)
+    # assert
+    assert table.count("bases") == 2
+    assert table.count("resources") == 0
+    assert table.category_positions("bases").tolist() == [[1.5, 2.5], [3, 4]]
+    assert table.positions.shape == (3, 2)
+
+
+def test_markers_view() -> None:
+    """Lazy view has the original `Marker`s."""
+    # act
+    view = MarkerTable.from_markers(MARKERS).markers("bases")
+    # assert
+    assert len(view) == 2
+    assert view[1] == MARKERS["bases"][1]
+    assert view == MARKERS["bases"]
+    assert list(view[:1]) == MARKERS["bases"][:1]
+
+
+def test_empty() -> None:
+    """Empty table has no markers."""
+    # act
+    table = MarkerTable()
+    # assert
+    assert table.count("airports") == 0
+    assert not table.markers("airports")
+    assert np.array_equal(table.positions, np.empty((0, 2)))
+
+
+def test_from_markers_unknown_category() -> None:
+    """Unknown category raises `ValueError`."""
+    # act, assert
+    with pytest.raises(ValueError, match="Unknown marker categories"):
+        MarkerTable.from_markers({"towns": []})
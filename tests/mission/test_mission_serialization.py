@@ -0,0 +1,83 @@
+"""Test encoding and decoding `Mission`."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from modules.mission.mission import Mission
+from tests.mission.fixtures import MISSION
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_to_json() -> None:
+    """JSON is unescaped UTF-8, with all fields."""
+    # act
+    data = MISSION.to_json()
+    # assert
+    assert "Çay" in data.decode()
+    assert json.loads(data)["towns"] == {"Kavala": 500, "Çay": None}
+    assert json.loads(data)["markers"]["names"] == ["airport_1", "outpost_2"]
+
+
+@pytest.mark.parametrize("format_", ["json", "msgpack"])
+def test_round_trip(format_: str) -> None:
+    """Decoded mission equals the original."""
+    # act
+    if format_ == "json":
+        mission = Mission.from_json_bytes(MISSION.to_json())
+    else:
+        mission = Mission.from_msgpack(MISSION.to_msgpack())
+    # assert
+    assert mission == MISSION
+
+
+@pytest.mark.parametrize("format_", ["json", "msgpack"])
+def test_round_trip_from_data_without_exclude(tmp_path: Path, format_: str) -> None:
+    """Mission of a map index entry without `exclude` round-trips, as not excluded."""
+    # arrange
+    mission_dir = tmp_path / "Antistasi_Altis.altis"
+    mission_dir.mkdir()
+    (mission_dir / "mapInfo.hpp").write_text(
+        'class altis {\n\tpopulation[] = {{"Kavala",500}};\n'
+        '\tdisabledTowns[] = {};\n\tclimate = "arid";\n};\n',
+        encoding="utf-8",
+    )
+    (mission_dir / "mission.sqm").write_text(
+        "version=54;\nclass Mission\n{\n\tclass Entities\n\t{\n\t\titems=0;\n"
+        "\t};\n};\n",
+        encoding="utf-8",
+    )
+    map_index = {"altis": {"display_name": "Altis", "url": "https://example.com"}}
+    original = Mission.from_data(mission_dir=mission_dir, map_index=map_index)
+    assert original
+    # act
+    if format_ == "json":
+        mission = Mission.from_json_bytes(original.to_json())
+    else:
+        mission = Mission.from_msgpack(original.to_msgpack())
+    # assert
+    assert mission == original
+    assert mission.exclude is False
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"map_name": "altis"}',  # missing required fields
+        (
+            b'{"map_name": 1, "map_display_name": null, "map_url": null, '
+            b'"climate": "arid"}'
+        ),
+        b"{",
+    ],
+)
+def test_from_json_bytes_invalid(data: bytes) -> None:
+    """Malformed or invalid data raises `ValueError`."""
+    # act, assert
+    with pytest.raises(ValueError, match="Error decoding `Mission`"):
+        Mission.from_json_bytes(data)
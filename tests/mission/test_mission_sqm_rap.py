@@ -0,0 +1,124 @@
+"""Test reading a binarized `mission.sqm` file."""
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING, Any
+
+import armaclass
+import pytest
+
+from modules.mission.mission_sqm_parser import (
+    _collect_markers,
+    _is_relevant_marker_name,
+)
+from modules.mission.mission_sqm_rap import (
+    RapError,
+    is_rapified,
+    read_mission_entities,
+)
+from tests.mission.fixtures import MISSION_SQM
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _compressed_int(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _asciiz(value: str) -> bytes:
+    return value.encode() + b"\0"
+
+
+def _array(values: list[Any]) -> bytes:
+    out = bytearray(_compressed_int(len(values)))
+    for value in values:
+        if isinstance(value, list):
+            out += b"\3" + _array(value)
+        elif isinstance(value, str):
+            out += b"\0" + _asciiz(value)
+        elif isinstance(value, float):
+            out += b"\1" + struct.pack("<f", value)
+        else:
+            out += b"\2" + struct.pack("<i", value)
+
+    return bytes(out)
+
+
+def _write_class_body(out: bytearray, node: dict[str, Any]) -> None:
+    """Append class body; child class bodies follow, as in binarized files."""
+    out += _asciiz("") + _compressed_int(len(node))
+    child_classes = []
+    for name, value in node.items():
+        if isinstance(value, dict):
+            out += b"\0" + _asciiz(name)
+            child_classes.append((len(out), value))
+            out += b"\0\0\0\0"
+        elif isinstance(value, list):
+            out += b"\2" + _asciiz(name) + _array(value)
+        elif isinstance(value, str):
+            out += b"\1\0" + _asciiz(name) + _asciiz(value)
+        elif isinstance(value, float):
+            out += b"\1\1" + _asciiz(name) + struct.pack("<f", value)
+        else:
+            out += b"\1\2" + _asciiz(name) + struct.pack("<i", value)
+
+    for offset_pos, child in child_classes:
+        struct.pack_into("<I", out, offset_pos, len(out))
+        _write_class_body(out, child)
+
+
+def _rapify(node: dict[str, Any]) -> bytes:
+    out = bytearray(b"\0raP" + struct.pack("<III", 0, 8, 0))
+    _write_class_body(out, node)
+    struct.pack_into("<I", out, 12, len(out))
+    out += struct.pack("<I", 0)  # no enums
+    return bytes(out)
+
+
+def test_read_mission_entities_matches_text(tmp_path: Path) -> None:
+    """Markers from binarized file match those from the equivalent text file."""
+    # arrange
+    parsed = armaclass.parse(MISSION_SQM)
+    reference = _collect_markers(parsed["Mission"])
+    filepath = tmp_path / "mission.sqm"
+    filepath.write_bytes(_rapify(parsed))
+    # act
+    markers = _collect_markers(
+        read_mission_entities(filepath, marker_name_filter=_is_relevant_marker_name)
+    )
+    # assert
+    assert is_rapified(filepath)
+    assert [m.name for m in markers] == [m.name for m in reference]
+    for marker, reference_marker in zip(markers, reference, strict=True):
+        # binarized values are single precision
+        assert marker.position.x == pytest.approx(reference_marker.position.x)
+        assert marker.position.y == pytest.approx(reference_marker.position.y)
+
+
+def test_read_mission_entities_truncated(tmp_path: Path) -> None:
+    """Truncated file raises `RapError`."""
+    # arrange
+    filepath = tmp_path / "mission.sqm"
+    filepath.write_bytes(_rapify(armaclass.parse(MISSION_SQM))[:200])
+    # act, assert
+    with pytest.raises(RapError):
+        read_mission_entities(filepath, marker_name_filter=_is_relevant_marker_name)
+
+
+def test_is_rapified_text(tmp_path: Path) -> None:
+    """Text file isn't detected as binarized."""
+    # arrange
+    filepath = tmp_path / "mission.sqm"
+    filepath.write_text(MISSION_SQM)
+    # act, assert
+    assert not is_rapified(filepath)
@@ -0,0 +1,64 @@
+"""Test scanning a mission's `mission.sqm` file, against `armaclass` as reference."""
+
+import armaclass
+import pytest
+
+from modules.mission.mission_sqm_parser import (
+    _collect_markers,
+    _is_relevant_marker_name,
+)
+from modules.mission.mission_sqm_scanner import (
+    MissionSqmScanError,
+    scan_mission_entities,
+)
+from tests.mission.fixtures import MISSION_SQM
+
+
+def test_scan_mission_entities_matches_armaclass() -> None:
+    """Scanned markers are identical to those from a full `armaclass` parse."""
+    # arrange
+    reference = _collect_markers(armaclass.parse(MISSION_SQM)["Mission"])
+    # act
+    scanned = _collect_markers(
+        scan_mission_entities(
+            MISSION_SQM.splitlines(keepends=True),
+            marker_name_filter=_is_relevant_marker_name,
+        )
+    )
+    # assert
+    assert scanned == reference
+    assert [m.name for m in scanned] == [
+        "airport_1",
+        "milbase_4",
+        "Outpost_2",
+        "seaport_3",
+    ]
+
+
+def test_scan_mission_entities_prunes_entities() -> None:
+    """Only layers and relevant markers are kept."""
+    # act
+    node = scan_mission_entities(
+        MISSION_SQM.splitlines(keepends=True),
+        marker_name_filter=_is_relevant_marker_name,
+    )
+    # assert
+    assert list(node) == ["Entities"]
+    assert list(node["Entities"]) == ["Item0", "Item2", "Item4"]
+    assert node["Entities"]["Item0"] == {
+        "dataType": "Marker",
+        "position": [14623.5, 17.91, 16763.3],
+        "name": "airport_1",
+    }
+
+
+def test_scan_mission_entities_rejects_unsupported_syntax() -> None:
+    """Unsupported syntax raises, so caller can fall back to `armaclass`."""
+    # arrange
+    data = "class Mission\n{\n\t/* block\n\tcomment */\n};\n"
+    # act, assert
+    with pytest.raises(MissionSqmScanError):
+        scan_mission_entities(
+            data.splitlines(keepends=True),
+            marker_name_filter=_is_relevant_marker_name,
+        )
@@ -0,0 +1,44 @@
+"""Test `MissionTable`."""
+
+import numpy as np
+from attrs import evolve
+
+from modules.mission.mission_summary import MissionSummary
+from modules.mission.mission_table import MissionTable
+from modules.mission.war_level_points import ranks
+from tests.mission.fixtures import MISSION
+
+SUMMARIES = [
+    MissionSummary.from_mission(MISSION),  # 12 War Level points
+    MissionSummary.from_mission(evolve(MISSION, map_name="b", towns={})),
+    MissionSummary.from_mission(evolve(MISSION, map_name="c", towns={"x": 1})),
+]
+
+
+def test_derived_columns_match_summaries() -> None:
+    """Derived columns match per-mission values; unknown values are NaN."""
+    # act
+    table = MissionTable.from_summaries(SUMMARIES)
+    # assert
+    assert np.array_equal(
+        table.column("war_level_points"), [12, np.nan, 11], equal_nan=True
+    )
+    assert table.column("total_military_zones_count").tolist() == [2, 2, 2]
+    assert np.allclose(
+        table.column("war_level_points_ratio"),
+        [s.war_level_points_ratio(12) or np.nan for s in SUMMARIES],
+        equal_nan=True,
+    )
+    assert table.column("war_level_points_rank").tolist() == [1, 3, 2]
+    assert np.array_equal(
+        table.column("war_level_points_percentile"), [100, np.nan, 50], equal_nan=True
+    )
+    assert table.order_by_rank().tolist() == [0, 2, 1]
+
+
+def test_ranks_ties_in_index_order() -> None:
+    """Tied scores are ranked in index order, along last axis."""
+    # act
+    value = ranks(np.array([[1, 3, 3, np.nan], [4, 3, 2, 1]]))
+    # assert
+    assert value.tolist() == [[3, 1, 2, 4], [1, 2, 3, 4]]
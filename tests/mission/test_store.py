@@ -0,0 +1,68 @@
+"""Test storing `Mission`s."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from attrs import evolve
+
+from modules.mission.mission_summary import MissionSummary
+from modules.mission.store import INDEX_FILENAME, STORE_FILENAME, MissionStore
+from tests.mission.fixtures import MISSION
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_add_and_reopen(tmp_path: Path) -> None:
+    """Missions can be read singly or in bulk after reopening the store."""
+    # arrange
+    missions = [evolve(MISSION, map_name=name) for name in ("tanoa", "altis")]
+    MissionStore(tmp_path).add(missions)
+    # act
+    store = MissionStore(tmp_path)
+    # assert
+    assert store.map_names == ["altis", "tanoa"]
+    assert store.get("tanoa") == missions[0]
+    assert store.load_all() == [missions[1], missions[0]]
+
+
+def test_add_supersedes_and_compact(tmp_path: Path) -> None:
+    """Re-added mission supersedes the stored one; compaction drops the old."""
+    # arrange
+    store = MissionStore(tmp_path)
+    store.add([MISSION])
+    size = (tmp_path / STORE_FILENAME).stat().st_size
+    updated = evolve(MISSION, climate="cold")  # same encoded size
+    # act
+    store.add([updated])
+    store.compact()
+    # assert
+    assert (tmp_path / STORE_FILENAME).stat().st_size == size
+    assert MissionStore(tmp_path).load_all() == [updated]
+
+
+def test_inconsistent_index_ignored(tmp_path: Path) -> None:
+    """Store is empty if its index refers beyond the end of the store file."""
+    # arrange
+    MissionStore(tmp_path).add([MISSION])
+    (tmp_path / STORE_FILENAME).write_bytes(b"")
+    # act
+    store = MissionStore(tmp_path)
+    # assert
+    assert (tmp_path / INDEX_FILENAME).is_file()
+    assert len(store) == 0
+
+
+def test_summaries_without_store_file(tmp_path: Path) -> None:
+    """Summaries are read from the index alone."""
+    # arrange
+    MissionStore(tmp_path).add([MISSION])
+    store = MissionStore(tmp_path)
+    (tmp_path / STORE_FILENAME).unlink()
+    # act
+    summaries = store.summaries()
+    # assert
+    assert summaries == [MissionSummary.from_mission(MISSION)]
+    assert summaries[0].war_level_points == MISSION.war_level_points == 12
+    assert summaries[0].total_military_zones_count == 2
@@ -0,0 +1,111 @@
+"""Test loading and caching grad_meh town locations."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from modules.mission import towns
+from modules.mission.towns import load_town_table, load_towns_from_dir
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _write_towns(dir_: Path, stem: str, towns_: dict[str, tuple[float, float]]) -> None:
+    dir_.mkdir(parents=True, exist_ok=True)
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [x, y]},
+            "properties": {"name": name},
+        }
+        for name, (x, y) in towns_.items()
+    ]
+    with gzip.open(dir_ / f"{stem}.geojson.gz", "wt", encoding="utf-8") as fp:
+        json.dump(features, fp)
+
+
+@pytest.fixture
+def locations_dir(tmp_path: Path) -> Path:
+    """Directory of grad_meh town files, and an irrelevant file."""
+    dir_ = tmp_path / "locations"
+    _write_towns(dir_, "namecitycapital", {"Kavala": (3500, 13000)})
+    _write_towns(dir_, "namevillage", {"Sofia": (25700, 21300), "Çay": (1.5, 2.5)})
+    _write_towns(dir_, "hill", {"Hill 1": (100, 100)})
+    return dir_
+
+
+def test_load_town_table(locations_dir: Path) -> None:
+    """Table has the same towns as the GeoJSON features."""
+    # arrange
+    features = load_towns_from_dir(locations_dir)
+    # act
+    table = load_town_table(locations_dir)
+    # assert
+    assert table.names == [f.properties["name"] for f in features]
+    assert table.names == ["Kavala", "Sofia", "Çay"]
+    assert table.positions.tolist() == [
+        list(f.geometry.coordinates[:2]) for f in features
+    ]
+
+
+def test_load_town_table_cached(
+    locations_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """While source files are unchanged, the table is loaded from cache."""
+    # arrange
+    cache_filepath = tmp_path / "cache/towns.msgpack"
+    table = load_town_table(locations_dir, cache_filepath=cache_filepath)
+    monkeypatch.setattr(towns, "load_towns_from_dir", _fail)
+    # act
+    cached = load_town_table(locations_dir, cache_filepath=cache_filepath)
+    # assert
+    assert cached == table
+    assert [p.name for p in cache_filepath.parent.iterdir()] == ["towns.msgpack"]
+
+
+@pytest.mark.parametrize("change", ["content", "mtime"])
+def test_load_town_table_cache_invalidated(
+    locations_dir: Path, tmp_path: Path, change: str
+) -> None:
+    """If a source file's size or modification time changes, the table is rebuilt."""
+    # arrange
+    cache_filepath = tmp_path / "towns.msgpack"
+    load_town_table(locations_dir, cache_filepath=cache_filepath)
+    if change == "content":
+        _write_towns(locations_dir, "namecitycapital", {"Pyrgos": (16800, 12700)})
+    else:
+        filepath = locations_dir / "namecitycapital.geojson.gz"
+        stat = filepath.stat()
+        _write_towns(locations_dir, "namecitycapital", {"Kavalo": (3500, 13000)})
+        assert filepath.stat().st_size == stat.st_size
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    # act
+    table = load_town_table(locations_dir, cache_filepath=cache_filepath)
+    # assert
+    assert table == load_town_table(locations_dir)
+    assert table.names[0] == ("Pyrgos" if change == "content" else "Kavalo")
+
+
+def test_load_town_table_corrupt_cache(
+    locations_dir: Path, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A corrupt cache file is ignored and replaced."""
+    # arrange
+    cache_filepath = tmp_path / "towns.msgpack"
+    cache_filepath.write_bytes(b"\xc1 not msgpack")
+    # act
+    table = load_town_table(locations_dir, cache_filepath=cache_filepath)
+    # assert
+    assert table == load_town_table(locations_dir)
+    assert "Ignored invalid towns cache" in caplog.text
+    assert load_town_table(locations_dir, cache_filepath=cache_filepath) == table
+
+
+def _fail(*_: object) -> None:
+    raise AssertionError
@@ -0,0 +1,51 @@
+"""Test War Level points weightings."""
+
+import numpy as np
+import pytest
+from attrs import evolve
+
+from modules.mission.mission_summary import MissionSummary
+from modules.mission.mission_table import MissionTable
+from modules.mission.war_level_points import (
+    WAR_LEVEL_POINTS_WEIGHTS,
+    evaluate_weightings,
+    scores,
+)
+from tests.mission.fixtures import MISSION
+
+TABLE = MissionTable.from_summaries(
+    [
+        MissionSummary.from_mission(MISSION),  # 1 airport, 1 outpost, 2 towns
+        MissionSummary.from_mission(
+            evolve(MISSION, map_name="b", towns={f"t{i}": 1 for i in range(9)})
+        ),
+    ]
+)
+
+
+def test_evaluate_weightings() -> None:
+    """Each weighting is scored and ranks compared with in-game weighting."""
+    # arrange
+    weights = np.vstack([WAR_LEVEL_POINTS_WEIGHTS, [10, 0, 0, 0, 0, 0, 0]])
+    # act
+    results = evaluate_weightings(TABLE, weights)
+    # assert
+    assert results.scores.tolist() == [[12, 19], [10, 10]]
+    assert results.ratios.tolist() == [[12 / 19, 1], [1, 1]]
+    assert results.ranks.tolist() == [[2, 1], [1, 2]]
+    assert results.rank_changes.tolist() == [[0, 0], [1, -1]]
+
+
+def test_in_game_weighting_matches_mission() -> None:
+    """In-game weighting is the `Mission.war_level_points` special case."""
+    # act
+    value = scores(TABLE.counts, WAR_LEVEL_POINTS_WEIGHTS[np.newaxis])
+    # assert
+    assert value[0, 0] == MISSION.war_level_points
+
+
+def test_scores_wrong_shape() -> None:
+    """Weights not matching count columns raise `ValueError`."""
+    # act, assert
+    with pytest.raises(ValueError, match="must have shape"):
+        scores(TABLE.counts, np.ones((3, 4)))
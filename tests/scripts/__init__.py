@@ -0,0 +1,12 @@
+"""
+Tests of scripts; skipped unless `scripts/config.toml` exists.
+
+Scripts load it on import (see README); its paths aren't used by these tests.
+"""
+
+from pathlib import Path
+
+import pytest
+
+if not (Path(__file__).parents[2] / "scripts/config.toml").is_file():
+    pytest.skip("needs `scripts/config.toml`", allow_module_level=True)
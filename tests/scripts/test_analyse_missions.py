@@ -0,0 +1,266 @@
+"""Test analysing missions in worker processes."""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import threading
+import time
+from logging.handlers import QueueHandler
+from typing import TYPE_CHECKING
+
+import attrs
+import pytest
+
+from scripts import analyse_missions
+from scripts._manifest import RENDER_MANIFEST_FILENAME, Manifest
+from scripts.analyse_mission import RenderOutcome
+from scripts.analyse_missions import (
+    RenderSettings,
+    _analyse_mission_in_worker,
+    _finish_renders,
+    _PooledRenderStage,
+    _raising_worker_error,
+    _RenderCache,
+    _RenderResult,
+    _replaying_worker_error,
+    _SerialRenderStage,
+    _WorkerError,
+)
+from tests.mission.fixtures import MISSION
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from modules.mission.mission import Mission
+
+_LOGGER = logging.getLogger(__name__)
+_RENDER_SECONDS = 0.5
+_TIMEOUT_SECONDS = 30
+
+
+def test_analyse_mission_in_worker_failure(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """If analysis fails, log records emitted meanwhile are attached to the error."""
+
+    # arrange
+    def analyse_mission(*_: object, **__: object) -> None:
+        _LOGGER.warning("'altis': about to fail.")
+        raise OSError
+
+    monkeypatch.setattr(analyse_missions, "analyse_mission", analyse_mission)
+    handler = QueueHandler(analyse_missions._worker_log_queue)
+    _LOGGER.addHandler(handler)
+    # act
+    try:
+        with pytest.raises(_WorkerError) as exc_info:
+            _analyse_mission_in_worker(
+                tmp_path, profile=False, cprofile_dir=None, memory=False
+            )
+    finally:
+        _LOGGER.removeHandler(handler)
+
+    # assert
+    # As returned from a worker process
+    err = pickle.loads(pickle.dumps(exc_info.value))  # noqa: S301
+    assert [r.getMessage() for r in err.records] == ["'altis': about to fail."]
+    assert str(err) == f"Analysis of `{tmp_path}` failed."
+    assert isinstance(exc_info.value.__cause__, OSError)
+    assert analyse_missions._worker_log_queue.empty()
+
+
+def test_replaying_worker_error(caplog: pytest.LogCaptureFixture) -> None:
+    """Worker log records are replayed before the error is re-raised."""
+    # arrange
+    record = _LOGGER.makeRecord(
+        _LOGGER.name, logging.WARNING, __file__, 0, "'altis': failed.", (), None
+    )
+    err_msg = "failed"
+    # act, assert
+    with pytest.raises(_WorkerError), _replaying_worker_error():
+        raise _WorkerError(err_msg, [record])
+
+    assert caplog.messages == ["'altis': failed."]
+
+
+def _render_in_worker(mission: Mission, **_: object) -> _RenderResult:
+    """
+    Pretend to render `mission`, failing if its map name starts with `fail`.
+
+    Digest is the start and end times of the render.
+    """
+    start = time.monotonic()
+    time.sleep(_RENDER_SECONDS)
+    with _raising_worker_error(f"'{mission.map_name}': rendering failed."):
+        if mission.map_name.startswith("fail"):
+            raise OSError
+
+    return _RenderResult(
+        map_name=mission.map_name,
+        outcome=RenderOutcome(digest=f"{start} {time.monotonic()}", cached=False),
+        measurements=[],
+        records=[],
+    )
+
+
+def _missions(*map_names: str) -> list[Mission]:
+    return [attrs.evolve(MISSION, map_name=map_name) for map_name in map_names]
+
+
+def _pooled_stage(*, jobs: int, queue_size: int = 64) -> _PooledRenderStage:
+    return _PooledRenderStage(
+        settings=RenderSettings(jobs=jobs, queue_size=queue_size),
+        cache=_RenderCache(manifest=Manifest()),
+        profiler=None,
+        log_queue_=None,
+        render_in_worker=_render_in_worker,
+    )
+
+
+def _in_thread(target: Callable[[], object]) -> threading.Thread:
+    """Run `target` in a daemon thread, so a test that hangs can still fail."""
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def _close(stage: _PooledRenderStage) -> BaseException | None:
+    """Close `stage`, failing if it hangs; return error raised, if any."""
+    errors: list[BaseException] = []
+
+    def close() -> None:
+        try:
+            stage.close()
+        except BaseException as err:  # noqa: BLE001
+            errors.append(err)
+
+    thread = _in_thread(close)
+    thread.join(_TIMEOUT_SECONDS)
+    assert not thread.is_alive(), "`close()` hung"
+    return errors[0] if errors else None
+
+
+def test_serial_render_stage(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Queued missions are rendered on close, and their outcomes recorded."""
+    # arrange
+    cached_digests = []
+
+    def render_mission(mission: Mission, **kwargs: object) -> RenderOutcome:
+        cached_digests.append(kwargs["cached_digest"])
+        return RenderOutcome(digest=mission.map_name, cached=False)
+
+    monkeypatch.setattr(analyse_missions, "render_mission", render_mission)
+    cache = _RenderCache(manifest=Manifest(digests={"altis": "old"}))
+    stage = _SerialRenderStage(settings=RenderSettings(), cache=cache, profiler=None)
+    # act
+    for mission in _missions("altis", "stratis"):
+        stage.put(mission)
+
+    stage.close()
+    # assert
+    assert cached_digests == ["old", None]
+    assert cache.manifest.digests == {"altis": "altis", "stratis": "stratis"}
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_pooled_render_stage(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Queued missions are rendered in worker processes, and outcomes recorded."""
+    # arrange
+    monkeypatch.setattr(analyse_missions, "_available_memory_bytes", lambda: None)
+    stage = _pooled_stage(jobs=2)
+    # act
+    for mission in _missions("altis", "stratis", "tanoa"):
+        stage.put(mission)
+
+    error = _close(stage)
+    # assert
+    assert error is None
+    assert sorted(stage._cache.manifest.digests) == ["altis", "stratis", "tanoa"]
+    assert stage._cache.misses == 3
+
+
+@pytest.mark.parametrize("fails", ["before_close", "after_close"])
+def test_pooled_render_stage_failure(
+    monkeypatch: pytest.MonkeyPatch, fails: str
+) -> None:
+    """If a render fails, before or after the stage is closed, `close()` raises."""
+    # arrange
+    monkeypatch.setattr(analyse_missions, "_available_memory_bytes", lambda: None)
+    stage = _pooled_stage(jobs=1, queue_size=1)
+    stage.put(*_missions("fail"))
+    if fails == "before_close":
+        # One waits to start, one is queued, and the last can only be queued once
+        # the dispatcher finds the failure and drains the queue
+        def put() -> None:
+            for mission in _missions("a", "b", "c"):
+                stage.put(mission)
+
+        thread = _in_thread(put)
+        thread.join(_TIMEOUT_SECONDS)
+        assert not thread.is_alive(), "`put()` hung"
+        assert stage._error is not None
+    # act
+    error = _close(stage)
+    # assert
+    assert isinstance(error, RuntimeError)
+    assert isinstance(error.__cause__, _WorkerError)
+    assert str(error.__cause__) == "'fail': rendering failed."
+
+
+def test_pooled_render_stage_memory_gated(monkeypatch: pytest.MonkeyPatch) -> None:
+    """While too little memory is available, a render waits for another to end."""
+    # arrange
+    monkeypatch.setattr(analyse_missions, "_available_memory_bytes", lambda: 0)
+    stage = _pooled_stage(jobs=2)
+    # act
+    for mission in _missions("altis", "stratis"):
+        stage.put(mission)
+
+    error = _close(stage)
+    # assert
+    assert error is None
+    (_, first_end), (second_start, _) = sorted(
+        tuple(map(float, digest.split()))
+        for digest in stage._cache.manifest.digests.values()
+    )
+    assert second_start >= first_end
+
+
+def test_pooled_render_stage_put_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """`put()` blocks while the queue is full."""
+    # arrange
+    monkeypatch.setattr(analyse_missions, "_available_memory_bytes", lambda: None)
+    stage = _pooled_stage(jobs=1, queue_size=1)
+    # Rendering first, waiting to start, and queued
+    for mission in _missions("altis", "stratis", "tanoa"):
+        stage.put(mission)
+    # act
+    thread = _in_thread(lambda: stage.put(*_missions("malden")))
+    thread.join(_RENDER_SECONDS / 2)
+    blocked = thread.is_alive()
+    error = _close(stage)
+    # assert
+    assert blocked
+    assert error is None
+    assert not thread.is_alive()
+    assert len(stage._cache.manifest.digests) == 4
+
+
+def test_finish_renders_failure(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """If a render fails, digests of renders that completed are still saved."""
+    # arrange
+    monkeypatch.setattr(analyse_missions, "DATA_DIRPATH", tmp_path)
+    monkeypatch.setattr(analyse_missions, "_available_memory_bytes", lambda: None)
+    stage = _pooled_stage(jobs=1)
+    # act
+    with pytest.raises(RuntimeError, match="Map rendering failed"):
+        _finish_renders(
+            stage, reused_missions=_missions("altis", "fail"), cache=stage._cache
+        )
+    # assert
+    manifest = Manifest.load(tmp_path, filename=RENDER_MANIFEST_FILENAME)
+    assert manifest.digests == {"altis": stage._cache.manifest.digests["altis"]}
@@ -0,0 +1,65 @@
+"""Test loading War Level points weightings from file."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from modules.mission.war_level_points import COUNT_COLUMNS
+from scripts.evaluate_weightings import _load_weights
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_load_weights_csv(tmp_path: Path) -> None:
+    """CSV columns are ordered as `COUNT_COLUMNS`, whatever their order in file."""
+    # arrange
+    filepath = tmp_path / "weights.csv"
+    columns = list(reversed(COUNT_COLUMNS))
+    filepath.write_text(
+        ",".join(columns) + "\n" + ",".join(str(i) for i in range(len(columns))),
+        encoding="utf-8",
+    )
+    # act
+    weights = _load_weights(filepath)
+    # assert
+    assert weights.tolist() == [list(reversed(range(len(columns))))]
+
+
+def test_load_weights_csv_missing_columns(tmp_path: Path) -> None:
+    """CSV without all `COUNT_COLUMNS` raises `ValueError`."""
+    # arrange
+    filepath = tmp_path / "weights.csv"
+    filepath.write_text(",".join(COUNT_COLUMNS[1:]) + "\n", encoding="utf-8")
+    # act, assert
+    with pytest.raises(ValueError, match="missing columns"):
+        _load_weights(filepath)
+
+
+def test_load_weights_npy(tmp_path: Path) -> None:
+    """`.npy` matrix is loaded as is."""
+    # arrange
+    filepath = tmp_path / "weights.npy"
+    matrix = np.arange(3 * len(COUNT_COLUMNS)).reshape(3, -1)
+    np.save(filepath, matrix)
+    # act
+    weights = _load_weights(filepath)
+    # assert
+    assert weights.tolist() == matrix.tolist()
+
+
+@pytest.mark.parametrize(
+    "shape",
+    [(len(COUNT_COLUMNS), 2), (2 * len(COUNT_COLUMNS),), (1, 2, len(COUNT_COLUMNS))],
+)
+def test_load_weights_npy_bad_shape(tmp_path: Path, shape: tuple[int, ...]) -> None:
+    """`.npy` array that isn't a `(weightings, columns)` matrix raises `ValueError`."""
+    # arrange
+    filepath = tmp_path / "weights.npy"
+    np.save(filepath, np.ones(shape))
+    # act, assert
+    with pytest.raises(ValueError, match="expected"):
+        _load_weights(filepath)
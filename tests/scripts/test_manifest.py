@@ -0,0 +1,39 @@
+"""Test digests of mission analysis inputs."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from scripts._manifest import mission_inputs_digest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_mission_inputs_digest(tmp_path: Path) -> None:
+    """Digest changes with mission sources and towns, but not the DEM."""
+    # arrange
+    mission_dir = tmp_path / "Antistasi_Altis.Altis"
+    mission_dir.mkdir()
+    (mission_dir / "mission.sqm").write_text("version=54;", encoding="utf-8")
+    grad_meh_dir = tmp_path / "grad_meh"
+    locations_dir = grad_meh_dir / "altis/geojson/locations"
+    locations_dir.mkdir(parents=True)
+    dem_filepath = grad_meh_dir / "altis/dem.asc.gz"
+
+    def digest() -> str:
+        return mission_inputs_digest(
+            mission_dir=mission_dir, grad_meh_dir=grad_meh_dir, project_version="1.0"
+        )
+
+    # act
+    original = digest()
+    dem_filepath.write_bytes(b"DEM")
+    with_dem = digest()
+    (locations_dir / "namevillage.geojson.gz").write_bytes(b"towns")
+    with_towns = digest()
+    (mission_dir / "mission.sqm").write_text("version=53;", encoding="utf-8")
+    with_sqm = digest()
+    # assert
+    assert with_dem == original
+    assert len({original, with_towns, with_sqm}) == 3
@@ -0,0 +1,94 @@
+"""Test caching data derived from DEMs."""
+
+from __future__ import annotations
+
+import gzip
+import shutil
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from modules.dem_cache import dem_content_hash, load_dem_derivatives
+from modules.raster import block_mean
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def _write_dem(filepath: Path, elevation: np.ndarray) -> None:
+    with gzip.open(filepath, "wt") as fp:
+        fp.write(
+            f"ncols {elevation.shape[1]}\nnrows {elevation.shape[0]}\n"
+            "xllcorner 0\nyllcorner 0\ncellsize 5\nNODATA_value -9999\n"
+        )
+        np.savetxt(fp, elevation, fmt="%g")
+
+
+def test_load_dem_derivatives_cached(tmp_path: Path) -> None:
+    """Cached derivatives match those derived directly, and are memory-mapped."""
+    # arrange
+    rng = np.random.default_rng(0)
+    elevation = rng.integers(-50, 50, size=(700, 300)).astype(np.float32)
+    dem_filepath = tmp_path / "dem.asc.gz"
+    _write_dem(dem_filepath, elevation)
+    cache_dir = tmp_path / "cache"
+    # act
+    derivatives = load_dem_derivatives(dem_filepath, elevation_size_px=100)
+    cached = load_dem_derivatives(
+        dem_filepath, cache_dir=cache_dir, elevation_size_px=100
+    )
+    # assert
+    assert isinstance(cached.land, np.memmap)
+    assert {p.name for p in cache_dir.iterdir()} == {
+        f"{dem_content_hash(dem_filepath)}-v2",
+        "hashes",
+    }
+    assert cached.extents == derivatives.extents == (1500, 3500)
+    assert np.array_equal(cached.land, elevation > 0)
+    assert np.array_equal(derivatives.land, elevation > 0)
+    assert cached.elevation is not None
+    assert np.allclose(cached.elevation, block_mean(elevation, 7))
+
+
+def test_load_dem_derivatives_incomplete_entry_not_removable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """If an incomplete entry can't be replaced, derivatives are derived uncached."""
+    # arrange
+    elevation = np.arange(-50, 50, dtype=np.float32).reshape(10, 10)
+    dem_filepath = tmp_path / "dem.asc.gz"
+    _write_dem(dem_filepath, elevation)
+    cache_dir = tmp_path / "cache"
+    load_dem_derivatives(dem_filepath, cache_dir=cache_dir)  # without elevation
+    monkeypatch.setattr(shutil, "rmtree", lambda *_, **__: None)
+    # act
+    derivatives = load_dem_derivatives(
+        dem_filepath, cache_dir=cache_dir, elevation_size_px=5
+    )
+    # assert
+    assert derivatives.elevation is not None
+    assert np.allclose(derivatives.elevation, block_mean(elevation, 2))
+    assert np.array_equal(derivatives.land, elevation > 0)
+
+
+def test_dem_content_hash_memoized(tmp_path: Path) -> None:
+    """Memoized hash is reused while the DEM is unchanged, and recomputed after."""
+    # arrange
+    dem_filepath = tmp_path / "dem.asc.gz"
+    _write_dem(dem_filepath, np.zeros((2, 2), dtype=np.float32))
+    cache_dir = tmp_path / "cache"
+    expected_digest = dem_content_hash(dem_filepath)
+    # act
+    digest = dem_content_hash(dem_filepath, cache_dir=cache_dir)
+    (memo_filepath,) = (cache_dir / "hashes").iterdir()
+    memo_filepath.write_bytes(memo_filepath.read_bytes().replace(digest.encode(), b"x"))
+    memoized_digest = dem_content_hash(dem_filepath, cache_dir=cache_dir)
+    _write_dem(dem_filepath, np.ones((3, 3), dtype=np.float32))
+    changed_digest = dem_content_hash(dem_filepath, cache_dir=cache_dir)
+    # assert
+    assert digest == expected_digest
+    assert memoized_digest == "x"
+    assert changed_digest == dem_content_hash(dem_filepath)
+    assert changed_digest not in {digest, "x"}
@@ -0,0 +1,85 @@
+"""Test diagnostics collector."""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from modules.diagnostics import Diagnostics, Severity
+from tests.mission.fixtures import MISSION
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_validate_military_zones() -> None:
+    """Mismatched in-game count is recorded as an error with expected/actual."""
+    # arrange
+    diagnostics = Diagnostics(log=False)
+    # act
+    MISSION.validate_military_zones(
+        {MISSION.map_name: {"airports_count": 2, "outposts_count": 1}},
+        diagnostics=diagnostics,
+    )
+    # assert
+    assert diagnostics.count(Severity.ERROR) == 1
+    assert diagnostics.count(Severity.DEBUG) == 1
+    [finding] = [f for f in diagnostics.findings if f.severity == Severity.ERROR]
+    assert finding.map_name == MISSION.map_name
+    assert finding.check == "military_zones"
+    assert finding.field == "airports_count"
+    assert (finding.expected, finding.actual) == (2, 1)
+
+
+def test_validate_military_zones_no_data() -> None:
+    """Missing in-game data is recorded, not only logged."""
+    # arrange
+    diagnostics = Diagnostics(log=False)
+    # act
+    MISSION.validate_military_zones({}, diagnostics=diagnostics)
+    # assert
+    assert diagnostics.count(Severity.ERROR) == 2
+
+
+def test_record_logs(caplog: pytest.LogCaptureFixture) -> None:
+    """Findings are logged at their severity, unless logging is disabled."""
+    # act
+    for log in True, False:
+        Diagnostics(log=log).record(
+            map_name="a", check="c", severity=Severity.WARNING, message=f"{log}"
+        )
+    # assert
+    assert [(r.levelname, r.message) for r in caplog.records] == [("WARNING", "True")]
+
+
+@pytest.mark.parametrize("suffix", [".json", ".csv"])
+def test_export(tmp_path: Path, suffix: str) -> None:
+    """Findings are exported as one row/object each, with all fields."""
+    # arrange
+    diagnostics = Diagnostics(log=False)
+    diagnostics.record(
+        map_name="a",
+        check="towns",
+        severity=Severity.INFO,
+        message="m",
+        field="towns_count",
+        expected=2,
+        actual=3,
+    )
+    diagnostics.record(
+        map_name="b", check="towns", severity=Severity.ERROR, message="n"
+    )
+    filepath = tmp_path / f"report{suffix}"
+    # act
+    diagnostics.export(filepath)
+    # assert
+    with filepath.open(newline="", encoding="utf-8") as fp:
+        rows = list(csv.DictReader(fp)) if suffix == ".csv" else json.load(fp)
+
+    assert [row["map_name"] for row in rows] == ["a", "b"]
+    assert rows[0]["severity"] == "info"
+    assert str(rows[0]["actual"]) == "3"
+    assert rows[1]["field"] in {None, ""}
@@ -0,0 +1,73 @@
+"""Test streaming an ESRI ASCII grid."""
+
+import io
+
+import numpy as np
+import pytest
+
+from modules.esri_ascii_grid import EsriAsciiGridError, EsriAsciiGridReader
+
+GRID = """ncols 3
+nrows 4
+xllcorner 0
+yllcorner 0
+cellsize 10
+NODATA_value -9999
+1 2 3
+-4 5 -6
+7 -9999 9
+10 11 12
+"""
+
+
+def test_row_blocks() -> None:
+    """Rows are yielded in blocks, with a smaller last block."""
+    # arrange
+    grid = EsriAsciiGridReader(io.StringIO(GRID))
+    # act
+    blocks = list(grid.row_blocks(3))
+    # assert
+    assert grid.header.shape == (4, 3)
+    assert grid.header.extents == (30, 40)
+    assert grid.header.nodata_value == -9999
+    assert [b.shape for b in blocks] == [(3, 3), (1, 3)]
+    assert (
+        np.concatenate(blocks).tolist()
+        == np.loadtxt(io.StringIO(GRID), skiprows=6).tolist()
+    )
+
+
+def test_header_without_nodata() -> None:
+    """`NODATA_value` is optional; first data line isn't lost."""
+    # arrange
+    data = "\n".join(GRID.splitlines()[:5] + GRID.splitlines()[6:])
+    grid = EsriAsciiGridReader(io.StringIO(data))
+    # act
+    blocks = list(grid.row_blocks(10))
+    # assert
+    assert grid.header.nodata_value is None
+    assert blocks[0][0].tolist() == [1, 2, 3]
+
+
+def test_header_whitespace_separated() -> None:
+    """Header keys and values may be separated by tabs or several spaces."""
+    # arrange
+    header, _, data = GRID.partition("1 2 3")
+    header = header.replace(" ", "\t").replace("cellsize\t", "cellsize    ")
+    grid = EsriAsciiGridReader(io.StringIO(header + "1 2 3" + data))
+    # act
+    blocks = list(grid.row_blocks(10))
+    # assert
+    assert grid.header.shape == (4, 3)
+    assert grid.header.extents == (30, 40)
+    assert grid.header.nodata_value == -9999
+    assert blocks[0][0].tolist() == [1, 2, 3]
+
+
+def test_row_blocks_too_few_rows() -> None:
+    """Missing rows raise `EsriAsciiGridError`."""
+    # arrange
+    grid = EsriAsciiGridReader(io.StringIO(GRID.replace("nrows 4", "nrows 5")))
+    # act, assert
+    with pytest.raises(EsriAsciiGridError):
+        list(grid.row_blocks(2))
@@ -0,0 +1,77 @@
+"""Test digests of map render inputs."""
+
+from __future__ import annotations
+
+import gzip
+from typing import TYPE_CHECKING
+
+import attrs
+
+from modules.map_render import Renderer, render_inputs_digest
+from modules.mission.marker import Marker
+from modules.mission.marker_table import MarkerTable
+from modules.mission.position_2d import Position2D
+from tests.mission.fixtures import MISSION
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _write_dem(filepath: Path, elevation: str) -> None:
+    with gzip.open(filepath, "wt") as fp:
+        fp.write(
+            "ncols 2\nnrows 1\nxllcorner 0\nyllcorner 0\ncellsize 5\n"
+            f"NODATA_value -9999\n{elevation}\n"
+        )
+
+
+def test_render_inputs_digest(tmp_path: Path) -> None:
+    """Digest is stable, and changes with markers, DEM content and renderer."""
+    # arrange
+    dem_filepath = tmp_path / "dem.asc.gz"
+    _write_dem(dem_filepath, "1 2")
+    moved = attrs.evolve(
+        MISSION,
+        markers=MarkerTable.from_markers(
+            {
+                "airports": [
+                    Marker(name="airport_1", position=Position2D(x=14623.5, y=16764))
+                ],
+                "outposts": [
+                    Marker(name="outpost_2", position=Position2D(x=1200, y=8000))
+                ],
+            }
+        ),
+    )
+    # act
+    digest = render_inputs_digest(
+        mission=MISSION, grad_meh_dem_filepath=dem_filepath, renderer=Renderer.NUMPY
+    )
+    again = render_inputs_digest(
+        mission=MISSION, grad_meh_dem_filepath=dem_filepath, renderer=Renderer.NUMPY
+    )
+    moved_digest = render_inputs_digest(
+        mission=moved, grad_meh_dem_filepath=dem_filepath, renderer=Renderer.NUMPY
+    )
+    matplotlib_digest = render_inputs_digest(
+        mission=MISSION,
+        grad_meh_dem_filepath=dem_filepath,
+        renderer=Renderer.MATPLOTLIB,
+    )
+    no_dem_digest = render_inputs_digest(
+        mission=MISSION,
+        grad_meh_dem_filepath=tmp_path / "missing.asc.gz",
+        renderer=Renderer.NUMPY,
+    )
+    _write_dem(dem_filepath, "1 3")
+    changed_dem_digest = render_inputs_digest(
+        mission=MISSION, grad_meh_dem_filepath=dem_filepath, renderer=Renderer.NUMPY
+    )
+    # assert
+    assert digest == again
+    assert (
+        len(
+            {digest, moved_digest, matplotlib_digest, no_dem_digest, changed_dem_digest}
+        )
+        == 5
+    )
@@ -0,0 +1,34 @@
+"""Test PNG encoding."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from matplotlib.image import imread
+
+from modules.png import encode_png, write_png
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_write_png_round_trip(tmp_path: Path) -> None:
+    """Image decoded by a standard reader matches that encoded."""
+    # arrange
+    rng = np.random.default_rng(0)
+    rgba = rng.integers(0, 256, size=(37, 53, 4), dtype=np.uint8)
+    filepath = tmp_path / "image.png"
+    # act
+    write_png(filepath, rgba)
+    # assert
+    assert filepath.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
+    np.testing.assert_array_equal(np.rint(imread(filepath) * 255), rgba)
+
+
+def test_encode_png_not_rgba() -> None:
+    """Image without 4 channels is rejected."""
+    # act, assert
+    with pytest.raises(ValueError, match="Expected"):
+        encode_png(np.zeros((4, 4, 3), dtype=np.uint8))
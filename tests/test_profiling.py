@@ -0,0 +1,142 @@
+"""Test stage timing and profiling."""
+
+from __future__ import annotations
+
+import json
+import pstats
+from typing import TYPE_CHECKING
+
+from modules.profiling import Profiler, _current_frame, profiled, stage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _run_stages() -> None:
+    with stage("render"):
+        with stage("dem_load"):
+            sum(range(1000))
+
+        sum(range(1000))
+
+
+def test_stage_inactive() -> None:
+    """Stages outside an active profiler aren't measured."""
+    # arrange
+    frames = []
+    # act
+    with profiled(None, "altis"), stage("render"):
+        frames.append(_current_frame.get())
+        _run_stages()
+    # assert
+    assert frames == [None]
+    assert _current_frame.get() is None
+
+
+def test_nested_stages() -> None:
+    """Nested stages are recorded by path, with self time excluding nested time."""
+    # arrange
+    profiler = Profiler()
+    # act
+    with profiler.mission("altis"):
+        _run_stages()
+    # assert
+    dem_load, render = profiler.measurements
+    assert (dem_load.map_name, dem_load.stage) == ("altis", "render/dem_load")
+    assert render.stage == "render"
+    assert render.seconds >= dem_load.seconds
+    assert render.self_seconds == render.seconds - dem_load.seconds
+    assert dem_load.self_seconds == dem_load.seconds
+
+
+def test_stage_as_decorator() -> None:
+    """`stage()` can decorate a function."""
+    # arrange
+    profiler = Profiler()
+
+    @stage("render")
+    def render() -> None:
+        pass
+
+    # act
+    with profiler.mission("altis"):
+        render()
+        render()
+    # assert
+    assert [m.stage for m in profiler.measurements] == ["render", "render"]
+
+
+def test_export(tmp_path: Path) -> None:
+    """Measurements are exported as JSON with summaries, or collapsed stacks."""
+    # arrange
+    profiler = Profiler()
+    for map_name in "altis", "stratis":
+        with profiler.mission(map_name):
+            _run_stages()
+    # act
+    profiler.export(tmp_path / "profile.json")
+    profiler.export(tmp_path / "profile.folded")
+    # assert
+    report = json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))
+    assert len(report["measurements"]) == 4
+    assert report["stages"][0]["stage"] == "render"
+    assert report["stages"][0]["count"] == 2
+    lines = (tmp_path / "profile.folded").read_text(encoding="utf-8").splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == [
+        "altis;render;dem_load",
+        "altis;render",
+        "stratis;render;dem_load",
+        "stratis;render",
+    ]
+
+
+def test_cprofile_dumps(tmp_path: Path) -> None:
+    """Each stage is profiled separately, if cProfile folder is given."""
+    # arrange
+    profiler = Profiler(cprofile_dir=tmp_path)
+    # act
+    with profiler.mission("altis"):
+        _run_stages()
+    # assert
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "altis.render.dem_load.prof",
+        "altis.render.prof",
+    ]
+    pstats.Stats(str(tmp_path / "altis.render.prof"))
+
+
+def test_memory() -> None:
+    """Peak memory of each stage includes nested stages; missions ranked by peak."""
+    # arrange
+    profiler = Profiler(memory=True)
+    # act
+    for map_name, size in ("small", 2**20), ("big", 2**22):
+        with profiler.mission(map_name), stage("render"):
+            with stage("dem_load"):
+                data = bytearray(size)
+
+            del data
+    # assert
+    dem_load, render = profiler.measurements[2:]
+    assert dem_load.peak_traced_bytes is not None
+    assert dem_load.peak_traced_bytes >= 2**22
+    assert render.peak_traced_bytes is not None
+    assert render.peak_traced_bytes >= dem_load.peak_traced_bytes
+    assert render.peak_stage == "render/dem_load"
+    assert [(m.map_name, m.peak_stage) for m in profiler.missions_by_memory()] == [
+        ("big", "render/dem_load"),
+        ("small", "render/dem_load"),
+    ]
+
+
+def test_max_rss() -> None:
+    """Maximum RSS is that of the process, not of a stage or mission."""
+    # arrange
+    profiler = Profiler(memory=True)
+    # act
+    for map_name in "altis", "stratis":
+        with profiler.mission(map_name):
+            _run_stages()
+    # assert
+    max_rss_bytes = [m.max_rss_bytes for m in profiler.measurements]
+    assert profiler.max_rss_bytes() == max(max_rss_bytes, key=lambda b: b or 0)
@@ -0,0 +1,35 @@
+"""Test raster operations."""
+
+import numpy as np
+
+from modules.raster import block_mean, block_reduce, reduction_factor
+
+
+def test_reduction_factor() -> None:
+    """Factor reduces the largest dimension to at most the target size."""
+    # act, assert
+    assert reduction_factor((8192, 4096), 1000) == 9
+    assert reduction_factor((500, 500), 1000) == 1
+
+
+def test_block_reduce_ragged_edges() -> None:
+    """Edge blocks are reduced over the remaining cells."""
+    # arrange
+    array = np.arange(35).reshape(5, 7)
+    # act
+    value = block_reduce(array, 3, ufunc=np.maximum)
+    # assert
+    assert value.tolist() == [[16, 19, 20], [30, 33, 34]]
+
+
+def test_block_mean_mask() -> None:
+    """Mean of a boolean mask is the fraction of each block that is `True`."""
+    # arrange
+    mask = np.zeros((4, 4), dtype=bool)
+    mask[:2, :1] = True
+    mask[2:, 2:] = True
+    # act
+    value = block_mean(mask, 2)
+    # assert
+    assert value.dtype == np.float32
+    assert value.tolist() == [[0.5, 0.0], [0.0, 1.0]]
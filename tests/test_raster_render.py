@@ -0,0 +1,61 @@
+"""Test rendering map images with NumPy."""
+
+import numpy as np
+from matplotlib import pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from modules.raster_render import render_map
+
+_SIZE_PX = 400
+
+
+def test_render_map_matches_matplotlib() -> None:
+    """Render is close to the equivalent matplotlib figure, pixel for pixel."""
+    # arrange
+    rng = np.random.default_rng(0)
+    extents = (4000.0, 3000.0)
+    water = np.ones((60, 80), dtype=np.float32)
+    water[15:45, 20:60] = 0
+    markers = {
+        "A": rng.uniform(0, 3000, size=(10, 2)),
+        "B": rng.uniform(0, 3000, size=(10, 2)),
+    }
+    figure, axes = plt.subplots(figsize=(_SIZE_PX / 100, _SIZE_PX / 100))
+    axes.imshow(
+        np.zeros(water.shape),
+        cmap="terrain",
+        extent=(0, extents[0], 0, extents[1]),
+        alpha=water,
+    )
+    for marker_char, positions in markers.items():
+        axes.scatter(positions[:, 0], positions[:, 1], marker=f"${marker_char}$")
+
+    axes.set_aspect("equal")
+    canvas = FigureCanvasAgg(figure)
+    canvas.draw()  # type: ignore[no-untyped-call]
+    expected = np.asarray(
+        canvas.buffer_rgba(),  # type: ignore[no-untyped-call]
+        dtype=np.float32,
+    )
+    plt.close(figure)
+    # act
+    rgba = render_map(size_px=_SIZE_PX, markers=markers, water=water, extents=extents)
+    # assert
+    assert rgba.shape == (_SIZE_PX, _SIZE_PX, 4)
+    assert (rgba[..., 3] == 255).all()
+    difference = np.abs(rgba.astype(np.float32) - expected).max(axis=2)
+    assert (difference > 50).mean() < 0.02
+
+
+def test_render_map_markers_outside_map_clipped() -> None:
+    """Limits extend to markers outside the map, which aren't drawn outside axes."""
+    # arrange
+    markers = {"A": np.array([[-500.0, 500.0], [1500.0, 500.0]])}
+    # act
+    rgba = render_map(size_px=_SIZE_PX, markers=markers, extents=(1000.0, 1000.0))
+    # assert
+    coloured = np.flatnonzero(
+        (rgba[..., :3].max(axis=2) - rgba[..., :3].min(axis=2)).any(axis=0)
+    )
+    assert coloured.min() > 0.125 * _SIZE_PX  # within default subplot area
+    assert coloured.max() < 0.9 * _SIZE_PX